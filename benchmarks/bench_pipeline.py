@@ -0,0 +1,245 @@
+"""
+End-to-end pipeline benchmark — offline, no API key needed.
+
+Measures each stage of ingestion → retrieval → risk → answer on the
+samples/ corpus plus a synthetic large contract:
+
+  loader      MB/s per format (TXT, DOCX, PDF)
+  splitter    clauses/s
+  rules       rule-engine evaluations/s
+  ingestion   clauses/s into a fresh Chroma collection
+  end_to_end  create_workflow().ainvoke latency p50/p95/p99 and queries/s
+
+Gemini is replaced by deterministic stub chat and embedding models with a
+configurable latency (benchmarks/stubs.py). Results are written as JSON;
+pass --baseline with an earlier result file to fail on regressions.
+
+Run: python benchmarks/bench_pipeline.py [--sections 200] [--llm-latency-ms 300]
+         [--output bench_pipeline.json] [--baseline previous.json]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.corpus import sample_texts, synthetic_contract, to_docx, to_pdf
+from benchmarks.stubs import StubChatModel, StubEmbeddings, unlimited_rate_limiter
+from src.utils.project_config import Config
+from src.ingestion.ingestion_loader import DocumentLoader
+from src.ingestion.legal_splitter import LegalClauseSplitter
+from src.retrieval.vector_storage import VectorStoreManager
+from src.risk_engine.risk_rules import RiskRuleEngine
+from src.risk_engine.risk_scorer import RiskScorer
+from src.workflows.workflow_graph import create_workflow
+from src.workflows.workflow_nodes import LegalNodes
+
+FAKE_KEY = "bench-" + "x" * 32
+
+QUERIES = [
+    "What are the termination rights?",
+    "Is liability capped?",
+    "Who must indemnify whom, and for what?",
+    "What happens to confidential information after termination?",
+    "When are fees due and can they increase?",
+    "Which law governs this agreement?",
+    "What does Section 4.2 say?",
+    "Are there any automatic renewal terms?",
+]
+
+
+def rate(fn, units: float, min_seconds: float) -> float:
+    """Units processed per second, repeating ``fn`` for at least ``min_seconds``."""
+    runs, start = 0, time.perf_counter()
+    while True:
+        fn()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return runs * units / elapsed
+
+
+def bench_loader(text: str, min_seconds: float) -> dict:
+    results = {}
+    for fmt, content in (("txt", text.encode("utf-8")), ("docx", to_docx(text)), ("pdf", to_pdf(text))):
+        mb = len(content) / 1e6
+        results[fmt] = {
+            "bytes": len(content),
+            "mb_per_s": rate(lambda: DocumentLoader.load(content, f"bench.{fmt}"), mb, min_seconds),
+        }
+    return results
+
+
+def bench_splitter(text: str, min_seconds: float) -> dict:
+    splitter = LegalClauseSplitter()
+    clauses = len(splitter.split_text(text))
+    return {
+        "clauses": clauses,
+        "clauses_per_s": rate(lambda: splitter.split_text(text), clauses, min_seconds),
+    }
+
+
+def bench_rules(clauses, min_seconds: float) -> dict:
+    engine = RiskRuleEngine()
+    return {
+        "rules": len(engine.rules),
+        "evals_per_s": rate(lambda: engine.evaluate_many(clauses), len(clauses), min_seconds),
+    }
+
+
+def build_store(persist_dir: str, embed_latency: float) -> VectorStoreManager:
+    with mock.patch.multiple(
+        Config,
+        GOOGLE_API_KEY=FAKE_KEY,
+        CHROMA_PERSIST_DIRECTORY=persist_dir,
+        EMBEDDING_BACKEND="local",
+    ):
+        vs = VectorStoreManager()
+    vs.embeddings = StubEmbeddings(latency=embed_latency)
+    vs.vector_store = vs._make_store()
+    return vs
+
+
+def bench_ingestion(vs: VectorStoreManager, documents: dict) -> dict:
+    splitter = LegalClauseSplitter()
+    total, start = 0, time.perf_counter()
+    for doc_id, text in documents.items():
+        stats = vs.upsert_document_stream(doc_id, splitter.iter_documents([text], {"source": doc_id}))
+        total += stats["total"]
+    elapsed = time.perf_counter() - start
+    return {"clauses": total, "seconds": elapsed, "clauses_per_s": total / elapsed}
+
+
+async def bench_end_to_end(vs: VectorStoreManager, llm_latency: float, requests: int, concurrency: int) -> dict:
+    stub = StubChatModel(latency=llm_latency)
+    with mock.patch.multiple(Config, GOOGLE_API_KEY=FAKE_KEY, RISK_CACHE_ENABLED=False):
+        scorer = RiskScorer()
+    scorer.llm = stub
+    scorer.limiter = unlimited_rate_limiter()
+    # Queries repeat, so the answer cache would turn every request after the first into a hit
+    with mock.patch.object(Config, "ANSWER_CACHE_ENABLED", False):
+        nodes = LegalNodes(vector_store=vs, risk_scorer=scorer, reasoning_llm=stub)
+    nodes.limiter = unlimited_rate_limiter()
+    workflow = create_workflow(nodes)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        state = {"query": QUERIES[i % len(QUERIES)], "doc_id": None, "documents": [],
+                 "risk_analysis": [], "final_answer": "", "overall_report": {}}
+        async with semaphore:
+            start = time.perf_counter()
+            await workflow.ainvoke(state)
+            latencies.append(time.perf_counter() - start)
+
+    await one(0)  # warm-up: builds the lexical index and compiles lazily-initialised paths
+    latencies.clear()
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "queries_per_s": requests / elapsed,
+    }
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """Metrics that got worse than the baseline by more than ``tolerance``."""
+    regressions = []
+    base = flatten(baseline.get("results", {}))
+    for key, value in flatten(current["results"]).items():
+        if key not in base or not base[key]:
+            continue
+        change = (value - base[key]) / base[key]
+        if (key.endswith("_per_s") and change < -tolerance) or (key.endswith("_ms") and change > tolerance):
+            regressions.append(f"{key}: {base[key]:.2f} → {value:.2f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", type=int, default=200, help="Sections in the synthetic contract (6 clauses each)")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0, help="Simulated chat model latency")
+    parser.add_argument("--embed-latency-ms", type=float, default=60.0, help="Simulated embedding latency per call")
+    parser.add_argument("--requests", type=int, default=40, help="End-to-end queries")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent end-to-end queries")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="Minimum time per throughput measurement")
+    parser.add_argument("--output", default="bench_pipeline.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression vs baseline")
+    args = parser.parse_args()
+
+    samples = sample_texts()
+    large = synthetic_contract(args.sections)
+    corpus_clauses = [c for text in list(samples.values()) + [large] for c in LegalClauseSplitter().split_text(text)]
+
+    results = {}
+    print("loader…")
+    results["loader"] = bench_loader(large, args.min_seconds)
+    print("splitter…")
+    results["splitter"] = bench_splitter(large, args.min_seconds)
+    print("rules…")
+    results["rules"] = bench_rules(corpus_clauses, args.min_seconds)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vs = build_store(tmp, args.embed_latency_ms / 1000)
+        print("ingestion…")
+        results["ingestion"] = bench_ingestion(vs, {**samples, "synthetic_msa": large})
+        print("end to end…")
+        results["end_to_end"] = asyncio.run(
+            bench_end_to_end(vs, args.llm_latency_ms / 1000, args.requests, args.concurrency)
+        )
+        vs.clear_all()
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print()
+    for key, value in flatten(results).items():
+        print(f"{key:<32} {value:>14,.2f}")
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print("\nRegressions vs baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions vs baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Retrieval concurrency benchmark — runs offline, no API key needed.
+
+Compares the blocking ``VectorStoreManager.search`` called from a coroutine
+(the old ``LegalNodes.retrieve`` behaviour) against ``asearch`` at several
+concurrency levels. Query embedding is simulated with a fixed network
+latency so throughput differences come from event-loop blocking alone.
+
+Run: python benchmarks/bench_retrieval_concurrency.py [--latency-ms 80]
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.utils.project_config import Config
+from src.retrieval.vector_storage import VectorStoreManager
+
+
+class LatencyEmbedding(DeterministicFakeEmbedding):
+    """Deterministic vectors with a simulated network round trip per call."""
+    latency: float = 0.08
+
+    def embed_query(self, text):
+        time.sleep(self.latency)
+        return super().embed_query(text)
+
+    async def aembed_query(self, text):
+        await asyncio.sleep(self.latency)
+        return super().embed_query(text)
+
+
+def build_store(persist_dir: str, latency: float, num_clauses: int) -> VectorStoreManager:
+    with mock.patch.multiple(
+        Config,
+        GOOGLE_API_KEY="bench-" + "x" * 32,
+        CHROMA_PERSIST_DIRECTORY=persist_dir,
+        EMBEDDING_CACHE_ENABLED=False,
+    ):
+        vs = VectorStoreManager()
+    vs.embeddings = LatencyEmbedding(size=256, latency=0.0)
+    vs.vector_store = vs._make_store()
+    docs = [
+        Document(page_content=f"{i}.1 Clause {i}: obligations regarding term, fees and liability {i}.",
+                 metadata={"clause_id": f"{i}.1"})
+        for i in range(num_clauses)
+    ]
+    vs.upsert_document("bench", docs)
+    vs.embeddings.latency = latency
+    return vs
+
+
+async def run_level(vs: VectorStoreManager, concurrency: int, total: int, use_async: bool) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            if use_async:
+                await vs.asearch(f"liability question {i}", k=5)
+            else:
+                vs.search(f"liability question {i}", k=5)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="Simulated embedding latency")
+    parser.add_argument("--clauses", type=int, default=2000, help="Clauses in the benchmark collection")
+    parser.add_argument("--requests", type=int, default=64, help="Queries per concurrency level")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vs = build_store(tmp, args.latency_ms / 1000, args.clauses)
+        print(f"{'concurrency':>11} | {'search q/s':>10} | {'asearch q/s':>11} | speedup")
+        print("-" * 50)
+        for concurrency in (1, 2, 4, 8, 16):
+            blocking = await run_level(vs, concurrency, args.requests, use_async=False)
+            non_blocking = await run_level(vs, concurrency, args.requests, use_async=True)
+            print(f"{concurrency:>11} | {blocking:>10.1f} | {non_blocking:>11.1f} | {non_blocking / blocking:>6.2f}x")
+        vs.clear_all()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""
+Rule engine micro-benchmark — offline, no API key needed.
+
+Measures clause evaluations per second as the rule count grows, for the
+compiled RiskRuleEngine and for the previous per-rule substring scan.
+Clauses come from the samples/ corpus; extra rules are synthetic
+two-keyword rules drawn from a fixed vocabulary.
+
+Run: python benchmarks/bench_rule_engine.py [--rules 10 100 1000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ingestion.legal_splitter import LegalClauseSplitter
+from src.risk_engine.risk_rules import RiskRuleEngine
+
+SAMPLES_DIR = Path(__file__).parent.parent / "samples"
+
+
+def substring_evaluate(rules, text):
+    """Reference implementation: lowercase + `in` scan for every keyword of every rule."""
+    score, triggered = 0, []
+    text_lower = text.lower()
+    for keywords, modifier, label in rules:
+        if all(kw in text_lower for kw in keywords):
+            score += modifier
+            triggered.append(label)
+    return score, triggered
+
+
+def load_clauses():
+    splitter = LegalClauseSplitter()
+    clauses = []
+    for path in sorted(SAMPLES_DIR.glob("*.txt")):
+        clauses.extend(splitter.split_text(path.read_text(encoding="utf-8")))
+    return clauses
+
+
+def synthetic_rules(count, vocabulary, seed=7):
+    rng = random.Random(seed)
+    return [(rng.sample(vocabulary, 2), rng.randint(-3, 3), f"rule {i}") for i in range(count)]
+
+
+def rate(fn, clauses, min_seconds=0.5):
+    runs, start = 0, time.perf_counter()
+    while True:
+        fn(clauses)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return runs * len(clauses) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    args = parser.parse_args()
+
+    clauses = load_clauses()
+    vocabulary = sorted({w for c in clauses for w in c.lower().split() if w.isalpha() and len(w) > 3})
+    print(f"{len(clauses)} clauses, vocabulary {len(vocabulary)} words\n")
+    print(f"{'rules':>6} | {'substring evals/s':>17} | {'compiled evals/s':>16} | speedup")
+    print("-" * 60)
+    for count in args.rules:
+        rules = synthetic_rules(count, vocabulary)
+        engine = RiskRuleEngine(rules=rules)
+        baseline = rate(lambda cs: [substring_evaluate(rules, c) for c in cs], clauses)
+        compiled = rate(engine.evaluate_many, clauses)
+        print(f"{count:>6} | {baseline:>17,.0f} | {compiled:>16,.0f} | {compiled / baseline:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
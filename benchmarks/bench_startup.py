@@ -0,0 +1,149 @@
+"""
+Startup-time benchmark — offline, no API key needed.
+
+Runs short-lived entry points in fresh interpreters under
+``python -X importtime`` and reports, per scenario, the median wall time,
+the total import time and the heaviest top-level imports:
+
+  cli_help      python main.py --help
+  splitter      from src.ingestion import LegalClauseSplitter
+  rule_engine   from src.risk_engine import RiskRuleEngine
+  workflow      from src.workflows import create_workflow
+  server        import web_server
+
+Scenarios are checked against benchmarks/startup_budget.json, which holds
+an import-time budget (ms) and modules that must not be imported at all.
+The command exits non-zero when a scenario is over budget or loads a
+forbidden module. After an intended change, record new budgets with
+--write-budget. They are the measured times multiplied by --headroom.
+
+Run: python benchmarks/bench_startup.py [--runs 5] [--scenarios cli_help splitter]
+         [--budget benchmarks/startup_budget.json] [--write-budget]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_BUDGET = Path(__file__).parent / "startup_budget.json"
+
+SCENARIOS = {
+    "cli_help": ["main.py", "--help"],
+    "splitter": ["-c", "from src.ingestion import LegalClauseSplitter"],
+    "rule_engine": ["-c", "from src.risk_engine import RiskRuleEngine"],
+    "workflow": ["-c", "from src.workflows import create_workflow"],
+    "server": ["-c", "import web_server"],
+}
+
+
+def parse_importtime(stderr: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """(cumulative µs of each top-level import, self µs of every module imported)."""
+    top, every = {}, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        module = name.strip()
+        every[module] = int(self_us)
+        # Nested imports are indented by two spaces per level
+        if name[1:2] != " ":
+            top[module] = int(cumulative_us)
+    return top, every
+
+
+def run_once(args: List[str]) -> Tuple[float, Dict[str, int], Dict[str, int]]:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        tail = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+        raise RuntimeError(f"{' '.join(args)} exited with {proc.returncode}:\n{tail[-2000:]}")
+    top, every = parse_importtime(proc.stderr)
+    return wall, top, every
+
+
+def bench_scenario(args: List[str], runs: int) -> dict:
+    walls, totals, tops, modules = [], [], [], set()
+    for _ in range(runs):
+        wall, top, every = run_once(args)
+        walls.append(wall * 1000)
+        totals.append(sum(top.values()) / 1000)
+        tops.append(top)
+        modules.update(every)
+    median = statistics.median(totals)
+    # Heaviest top-level imports of the run closest to the median
+    typical = min(range(runs), key=lambda i: abs(totals[i] - median))
+    heaviest = sorted(tops[typical].items(), key=lambda kv: kv[1], reverse=True)[:5]
+    return {
+        "wall_ms": statistics.median(walls),
+        "import_ms": median,
+        "modules": len(modules),
+        "heaviest": [(name, us / 1000) for name, us in heaviest],
+        "_loaded": modules,
+    }
+
+
+def check(name: str, result: dict, budget: dict) -> List[str]:
+    problems = []
+    limit = budget.get("import_ms")
+    if limit is not None and result["import_ms"] > limit:
+        problems.append(f"{name}: imports took {result['import_ms']:.0f} ms, budget {limit:.0f} ms")
+    for module in budget.get("must_not_import", []):
+        loaded = sorted(m for m in result["_loaded"] if m == module or m.startswith(module + "."))
+        if loaded:
+            problems.append(f"{name}: imported {module} ({len(loaded)} modules)")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per scenario")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--budget", default=str(DEFAULT_BUDGET), help="Budget file to check against")
+    parser.add_argument("--write-budget", action="store_true", help="Record the measured times as the new budget")
+    parser.add_argument("--headroom", type=float, default=2.0, help="Budget = measured import time × headroom")
+    args = parser.parse_args()
+
+    budget_path = Path(args.budget)
+    budgets = json.loads(budget_path.read_text(encoding="utf-8")) if budget_path.exists() else {}
+
+    results = {}
+    for name in args.scenarios:
+        print(f"{name}…")
+        results[name] = bench_scenario(SCENARIOS[name], args.runs)
+
+    print(f"\n{'scenario':<14} {'wall ms':>9} {'import ms':>10} {'budget':>8} {'modules':>8}  heaviest imports (ms)")
+    for name, result in results.items():
+        limit = budgets.get(name, {}).get("import_ms")
+        heaviest = ", ".join(f"{module} {ms:.0f}" for module, ms in result["heaviest"][:3])
+        print(f"{name:<14} {result['wall_ms']:>9.0f} {result['import_ms']:>10.0f} "
+              f"{limit if limit is not None else '-':>8} {result['modules']:>8}  {heaviest}")
+
+    if args.write_budget:
+        for name, result in results.items():
+            entry = budgets.get(name, {})
+            entry.pop("import_ms", None)
+            budgets[name] = {"import_ms": round(result["import_ms"] * args.headroom), **entry}
+        budget_path.write_text(json.dumps(budgets, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBudget written to {budget_path}")
+        return
+
+    problems = [p for name, result in results.items() for p in check(name, result, budgets.get(name, {}))]
+    if problems:
+        print("\nStartup budget exceeded:")
+        for line in problems:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nAll scenarios within budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark corpus: the samples/ contracts plus deterministic synthetic
+contracts of any size, rendered as TXT, DOCX or PDF bytes.
+"""
+import io
+import random
+from pathlib import Path
+from typing import Dict, List
+
+SAMPLES_DIR = Path(__file__).parent.parent / "samples"
+
+_HEADINGS = [
+    "DEFINITIONS", "FEES AND PAYMENT", "TERM AND TERMINATION", "CONFIDENTIALITY",
+    "INDEMNIFICATION", "LIMITATION OF LIABILITY", "WARRANTIES", "DATA PROTECTION",
+    "INTELLECTUAL PROPERTY", "GOVERNING LAW", "ASSIGNMENT", "FORCE MAJEURE",
+]
+
+
+def sample_texts() -> Dict[str, str]:
+    return {path.name: path.read_text(encoding="utf-8") for path in sorted(SAMPLES_DIR.glob("*.txt"))}
+
+
+def _sentences() -> List[str]:
+    sentences = []
+    for text in sample_texts().values():
+        for line in text.splitlines():
+            line = line.strip()
+            # Body lines of numbered clauses, without their numbers
+            if line and line[0].isdigit() and "." in line[:6] and len(line) > 40:
+                sentences.append(line.split(" ", 1)[1])
+    return sentences
+
+
+def synthetic_contract(num_sections: int, clauses_per_section: int = 6, seed: int = 13) -> str:
+    """A contract with numbered sections/clauses whose bodies are drawn from the samples."""
+    rng = random.Random(seed)
+    sentences = _sentences()
+    lines = ["MASTER SERVICES AGREEMENT", ""]
+    for section in range(1, num_sections + 1):
+        lines += [f"{section}. {_HEADINGS[(section - 1) % len(_HEADINGS)]}", ""]
+        for clause in range(1, clauses_per_section + 1):
+            body = " ".join(rng.sample(sentences, 2))
+            lines += [f"{section}.{clause} {body}", ""]
+    return "\n".join(lines)
+
+
+def to_docx(text: str) -> bytes:
+    import docx
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def _pdf_escape(line: str) -> str:
+    line = line.encode("latin-1", "replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def to_pdf(text: str, lines_per_page: int = 50) -> bytes:
+    """Minimal text PDF (Helvetica, one text block per page) that pypdf can extract."""
+    all_lines = text.splitlines()
+    pages = [all_lines[i:i + lines_per_page] for i in range(0, len(all_lines), lines_per_page)] or [[]]
+    n = len(pages)
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(n))
+    objs = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {n} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, page in enumerate(pages):
+        objs.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        )
+        ops = "BT /F1 10 Tf 12 TL 36 756 Td " + " ".join(f"({_pdf_escape(l)}) Tj T*" for l in page) + " ET"
+        objs.append(f"<< /Length {len(ops.encode('latin-1'))} >>\nstream\n{ops}\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objs):
+        offsets.append(out.tell())
+        out.write(f"{i + 1} 0 obj\n{obj}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode())
+    for off in offsets:
+        out.write(f"{off:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
@@ -0,0 +1,101 @@
+"""
+Deterministic stand-ins for the Gemini chat and embedding models, with a
+configurable per-call latency so benchmarks measure our own overhead plus
+a realistic network wait, offline and without quota.
+"""
+import asyncio
+import json
+import re
+import time
+import zlib
+from typing import AsyncIterator, Iterator, List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.retrieval.embedding_backends import HashedNgramEmbeddings
+from src.utils.rate_limiter import RateLimiter
+
+_BATCH_ID = re.compile(r"^ID: (.+)$", re.MULTILINE)
+_SINGLE_ID = re.compile(r"^segment_id: (.+)$", re.MULTILINE)
+
+
+def _assessment(clause_id: str) -> dict:
+    score = zlib.crc32(clause_id.encode("utf-8")) % 10 + 1
+    return {
+        "clause_id": clause_id,
+        "clause_type": "General",
+        "risk_level": "High" if score >= 8 else ("Medium" if score >= 5 else "Low"),
+        "risk_score": score,
+        "reason": f"Stub assessment of {clause_id}.",
+        "recommendation": "None.",
+    }
+
+
+class StubChatModel(BaseChatModel):
+    """Answers risk prompts with well-formed JSON and everything else with a fixed answer."""
+
+    latency: float = 0.0
+    answer_words: int = 120
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat"
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        prompt = str(messages[-1].content)
+        batch_ids = _BATCH_ID.findall(prompt)
+        if batch_ids:
+            return json.dumps([_assessment(cid) for cid in batch_ids])
+        single = _SINGLE_ID.search(prompt)
+        if single:
+            return json.dumps(_assessment(single.group(1)))
+        return " ".join(f"word{i}" for i in range(self.answer_words))
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._respond(messages)))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._respond(messages)))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        for word in self._respond(messages).split(" "):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word + " "))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency)
+        for word in self._respond(messages).split(" "):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word + " "))
+
+
+class StubEmbeddings(HashedNgramEmbeddings):
+    """Local hashed n-gram vectors plus a simulated round trip per API call."""
+
+    def __init__(self, latency: float = 0.0, dimensions: int = 256):
+        super().__init__(dimensions=dimensions)
+        self.latency = latency
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency)
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency)
+        return super().embed_query(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.latency)
+        return HashedNgramEmbeddings.embed_documents(self, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(self.latency)
+        return HashedNgramEmbeddings.embed_query(self, text)
+
+
+def unlimited_rate_limiter(name: str = "bench") -> RateLimiter:
+    """Stubs have no quota, so keep free-tier pacing out of the measurements."""
+    return RateLimiter(name, requests_per_minute=1e9, max_concurrency=1024)
@@ -1,45 +1,96 @@
 import argparse
 import sys
 import os
-import asyncio
 
 # Ensure project root is in path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.utils.project_config import Config
-from src.ingestion.legal_splitter import LegalClauseSplitter
-from src.retrieval.vector_storage import VectorStoreManager
-from src.workflows.workflow_graph import create_workflow
 
+# Commands import what they use: chromadb, langchain, langgraph and the
+# Gemini SDK take seconds to load, and `--help` needs none of them.
+
+
+async def ingest_file(file_path: str, doc_id: str = None, score_risk: bool = False):
+    """Ingest (or incrementally update) a legal document in the vector store."""
+    from src.ingestion.ingestion_loader import DocumentLoader
+    from src.ingestion.legal_splitter import LegalClauseSplitter
+    from src.retrieval.vector_storage import VectorStoreManager
 
-async def ingest_file(file_path: str):
-    """Ingest a legal document into the vector store."""
     print(f"[INFO] Reading file: {file_path}")
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            text = f.read()
+        DocumentLoader.check_supported(file_path)
+        with open(file_path, 'rb') as f:
+            segments = DocumentLoader.iter_text(f.read(), os.path.basename(file_path))
     except Exception as e:
         print(f"[ERROR] Failed to read file: {e}")
         return
 
-    print("[INFO] Splitting into clauses…")
-    splitter = LegalClauseSplitter()
-    docs = splitter.create_documents([text], metadatas=[{"source": file_path}])
-    print(f"[INFO] Generated {len(docs)} clauses.")
-
-    print("[INFO] Storing in Vector DB…")
+    doc_id = doc_id or os.path.basename(file_path)
+    print(f"[INFO] Splitting and storing in Vector DB as '{doc_id}'…")
+    docs = LegalClauseSplitter().iter_documents(segments, metadata={"source": file_path})
     vs_manager = VectorStoreManager()
-    ids = vs_manager.add_documents(docs)
-    print(f"[INFO] Successfully stored {len(ids)} clauses. Done!")
+    stats = vs_manager.upsert_document_stream(doc_id, docs)
+    print(
+        f"[INFO] Stored {stats['total']} clauses "
+        f"({stats['added']} new, {stats['deleted']} removed, {stats['unchanged']} unchanged). Done!"
+    )
 
+    if score_risk:
+        from src.risk_engine.risk_scorer import RiskScorer
+        print("[INFO] Precomputing clause risk scores…")
+        scorer = RiskScorer()
+        scored = 0
+        for page in vs_manager.iter_document(doc_id, batch_size=Config.RISK_PRECOMPUTE_CHUNK):
+            scored += await scorer.precompute(
+                [{"id": d.metadata.get("clause_id", "Intro"), "text": d.page_content} for d in page]
+            )
+        print(f"[INFO] {scored}/{stats['total']} clauses scored and cached.")
+
+
+def ingest_directory(root: str, workers: int = None, batch_size: int = None,
+                     manifest_path: str = None, retry_failed: bool = False):
+    """Ingest every TXT/PDF/DOCX file under ``root``, resuming from the manifest."""
+    if not os.path.isdir(root):
+        print(f"[ERROR] Not a directory: {root}")
+        return
+    from src.ingestion.bulk_ingest import BulkIngestor, IngestManifest
+    from src.retrieval.vector_storage import VectorStoreManager
+
+    manifest = IngestManifest(manifest_path or Config.INGEST_MANIFEST_PATH)
+    ingestor = BulkIngestor(VectorStoreManager(), manifest, workers=workers,
+                            batch_size=batch_size, retry_failed=retry_failed)
+    print(f"[INFO] Ingesting {root} with {ingestor.workers} parser processes…")
+    try:
+        stats = ingestor.run(root)
+    finally:
+        manifest.close()
 
-async def run_analysis(query: str):
+    print("\n" + "=" * 60)
+    print("  BULK INGESTION")
+    print("=" * 60)
+    print(f"Files found:       {stats['files']}")
+    print(f"Parsed and stored: {stats['parsed']}")
+    print(f"Unchanged/skipped: {stats['unchanged']}")
+    print(f"Failed:            {stats['failed']}")
+    print(f"Clauses:           {stats['clauses']} ({stats['clauses_added']} embedded, "
+          f"{stats['clauses_deleted']} removed)")
+    print(f"Elapsed:           {stats['seconds']:.1f}s")
+    print(f"Throughput:        {stats['files_per_s']:.1f} files/s, {stats['mb_per_s']:.2f} MB/s, "
+          f"{stats['clauses_per_s']:.0f} clauses/s")
+    print("=" * 60 + "\n")
+
+
+async def run_analysis(query: str, doc_id: str = None):
     """Run the full RAG analysis workflow."""
+    from src.workflows.workflow_graph import create_workflow
+
     print(f"[INFO] Analyzing query: '{query}'")
     workflow = create_workflow()
 
     initial_state = {
         "query": query,
+        "doc_id": doc_id,
         "documents": [],
         "risk_analysis": [],
         "final_answer": "",
@@ -55,13 +106,14 @@ async def run_analysis(query: str):
     print("=" * 60 + "\n")
 
 
-async def main():
+def main():
     parser = argparse.ArgumentParser(
         description="AI Legal Document Analyzer — CLI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
   python main.py ingest samples/saas_contract.txt
+  python main.py ingest-dir contracts/ --workers 8
   python main.py analyze "What are the termination conditions?"
   python main.py analyze "What is the liability cap?"
         """
@@ -70,19 +122,35 @@ Examples:
 
     ingest_parser = subparsers.add_parser("ingest", help="Ingest a legal document")
     ingest_parser.add_argument("file", help="Path to TXT/PDF/DOCX file")
+    ingest_parser.add_argument("--doc-id", help="Stable document ID (defaults to the file name)")
+    ingest_parser.add_argument("--score-risk", action="store_true",
+                               default=Config.RISK_PRECOMPUTE_ON_INGEST,
+                               help="Risk-score every clause now so queries skip the scoring LLM call")
+
+    dir_parser = subparsers.add_parser("ingest-dir", help="Ingest every TXT/PDF/DOCX file under a directory")
+    dir_parser.add_argument("directory", help="Root of the document tree; doc IDs are paths relative to it")
+    dir_parser.add_argument("--workers", type=int, help="Parser processes (default: BULK_INGEST_WORKERS)")
+    dir_parser.add_argument("--batch-size", type=int, help="Clauses embedded and stored per batch")
+    dir_parser.add_argument("--manifest", help="Manifest file used to skip unchanged files and resume")
+    dir_parser.add_argument("--retry-failed", action="store_true", help="Re-parse unchanged files that failed before")
 
     analyze_parser = subparsers.add_parser("analyze", help="Analyze a query against ingested documents")
     analyze_parser.add_argument("query", help="Legal question or analysis request")
+    analyze_parser.add_argument("--doc-id", help="Restrict retrieval to one ingested document")
 
     args = parser.parse_args()
 
     if args.command == "ingest":
-        await ingest_file(args.file)
+        import asyncio
+        asyncio.run(ingest_file(args.file, args.doc_id, args.score_risk))
+    elif args.command == "ingest-dir":
+        ingest_directory(args.directory, args.workers, args.batch_size, args.manifest, args.retry_failed)
     elif args.command == "analyze":
-        await run_analysis(args.query)
+        import asyncio
+        asyncio.run(run_analysis(args.query, args.doc_id))
     else:
         parser.print_help()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
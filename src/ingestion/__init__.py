@@ -1,3 +1,14 @@
 # ingestion module
-from .ingestion_loader import DocumentLoader
-from .legal_splitter import LegalClauseSplitter
+# Re-exports are resolved on first access, so splitter-only code never
+# loads the PDF/DOCX parsers or pydantic (see src/utils/lazy_imports.py)
+from src.utils.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "DocumentLoader": ".ingestion_loader",
+    "LegalClauseSplitter": ".legal_splitter",
+    "IngestionJobManager": ".ingestion_jobs",
+    "IngestionJob": ".ingestion_jobs",
+    "JobQueueFull": ".ingestion_jobs",
+    "BulkIngestor": ".bulk_ingest",
+    "IngestManifest": ".bulk_ingest",
+})
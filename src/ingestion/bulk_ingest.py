@@ -0,0 +1,219 @@
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from src.utils.project_config import Config
+from .ingestion_loader import DocumentLoader
+from .legal_splitter import LegalClauseSplitter
+
+logger = logging.getLogger("bulk_ingest")
+
+
+class IngestManifest:
+    """
+    SQLite record of every file a bulk ingestion has seen: path, size,
+    mtime, content hash, doc_id, clause count and status (``done`` or
+    ``failed``). Rows are written only after a file's clauses are stored,
+    so a run interrupted between parsing and storing redoes those files.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " mtime REAL NOT NULL,"
+            " sha256 TEXT,"
+            " doc_id TEXT,"
+            " status TEXT NOT NULL,"
+            " clauses INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def entries(self) -> Dict[str, dict]:
+        rows = self._conn.execute(
+            "SELECT path, size, mtime, sha256, doc_id, status, clauses, error FROM files"
+        ).fetchall()
+        keys = ("path", "size", "mtime", "sha256", "doc_id", "status", "clauses", "error")
+        return {row[0]: dict(zip(keys, row)) for row in rows}
+
+    def record(self, entries: List[dict]):
+        """Insert or replace rows in one transaction."""
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files (path, size, mtime, sha256, doc_id, status, clauses, error, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (e["path"], e["size"], e["mtime"], e.get("sha256"), e.get("doc_id"),
+                     e["status"], e.get("clauses", 0), e.get("error"), now)
+                    for e in entries
+                ],
+            )
+
+    def close(self):
+        self._conn.close()
+
+
+def _init_worker():
+    # Files are already spread across processes; don't fan PDFs out again
+    Config.PDF_EXTRACT_WORKERS = 1
+
+
+def _parse_file(path: str, known_hash: Optional[str]) -> Tuple[str, Optional[List[Tuple[str, dict]]]]:
+    """
+    Worker entry point: hash a file and, unless its content matches
+    ``known_hash``, split it into (text, metadata) clause pairs.
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if digest == known_hash:
+        return digest, None
+    segments = DocumentLoader.iter_text(content, os.path.basename(path))
+    docs = LegalClauseSplitter().iter_documents(segments, metadata={"source": path})
+    return digest, [(d.page_content, d.metadata) for d in docs]
+
+
+class BulkIngestor:
+    """
+    Ingests every supported file under a directory tree. Files are parsed
+    on a process pool while the parent embeds and upserts the results in
+    batches of about ``batch_size`` clauses across documents. The manifest
+    lets an interrupted run resume: files already stored with the same size
+    and mtime are skipped without being read, and touched files whose
+    content hash is unchanged are skipped after hashing. Files that failed
+    to parse are only retried when they change or ``retry_failed`` is set.
+    Document IDs are paths relative to the root.
+    """
+
+    def __init__(
+        self,
+        vector_store,
+        manifest: IngestManifest,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        retry_failed: bool = False,
+    ):
+        self.vector_store = vector_store
+        self.manifest = manifest
+        self.workers = workers or Config.BULK_INGEST_WORKERS
+        self.batch_size = batch_size or Config.BULK_INGEST_BATCH_SIZE
+        self.retry_failed = retry_failed
+
+    @staticmethod
+    def iter_files(root: str) -> Iterator[str]:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.lower().endswith(DocumentLoader.SUPPORTED_EXTENSIONS):
+                    yield os.path.join(dirpath, name)
+
+    def run(self, root: str) -> Dict[str, float]:
+        root = os.path.abspath(root)
+        known = self.manifest.entries()
+        stats = {
+            "files": 0, "unchanged": 0, "parsed": 0, "failed": 0, "bytes": 0,
+            "clauses": 0, "clauses_added": 0, "clauses_deleted": 0,
+        }
+        batch: Dict[str, dict] = {}      # path → manifest entry awaiting storage
+        batch_docs: Dict[str, List[Document]] = {}
+        batch_clauses = 0
+        start = time.perf_counter()
+
+        def flush():
+            nonlocal batch_clauses
+            if not batch:
+                return
+            results = self.vector_store.upsert_documents(batch_docs, batch_size=self.batch_size)
+            for entry in batch.values():
+                result = results[entry["doc_id"]]
+                stats["clauses_added"] += result["added"]
+                stats["clauses_deleted"] += result["deleted"]
+                entry["status"] = "done"
+            self.manifest.record(list(batch.values()))
+            batch.clear()
+            batch_docs.clear()
+            batch_clauses = 0
+
+        def collect(future: Future, entry: dict):
+            nonlocal batch_clauses
+            try:
+                digest, clauses = future.result()
+            except Exception as e:
+                logger.warning(f"Failed to parse {entry['path']}: {e}")
+                stats["failed"] += 1
+                self.manifest.record([{**entry, "status": "failed", "error": str(e)}])
+                return
+            entry["sha256"] = digest
+            if clauses is None:
+                # Touched but identical; refresh size/mtime so the next run skips it unread
+                stats["unchanged"] += 1
+                self.manifest.record([{**entry, "status": "done", "clauses": known[entry["path"]]["clauses"]}])
+                return
+            stats["parsed"] += 1
+            stats["bytes"] += entry["size"]
+            stats["clauses"] += len(clauses)
+            entry["clauses"] = len(clauses)
+            batch[entry["path"]] = entry
+            batch_docs[entry["doc_id"]] = [Document(page_content=text, metadata=meta) for text, meta in clauses]
+            batch_clauses += len(clauses)
+
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        in_flight: Dict[Future, dict] = {}
+        try:
+            for path in self.iter_files(root):
+                stats["files"] += 1
+                st = os.stat(path)
+                entry = {
+                    "path": path, "size": st.st_size, "mtime": st.st_mtime,
+                    "doc_id": os.path.relpath(path, root).replace(os.sep, "/"),
+                }
+                previous = known.get(path)
+                if previous and previous["size"] == st.st_size and previous["mtime"] == st.st_mtime:
+                    if previous["status"] == "done" or (previous["status"] == "failed" and not self.retry_failed):
+                        stats["unchanged"] += 1
+                        continue
+                known_hash = previous["sha256"] if previous and previous["status"] == "done" else None
+                in_flight[pool.submit(_parse_file, path, known_hash)] = entry
+
+                # Keep a couple of files per worker queued so memory stays bounded
+                while len(in_flight) >= self.workers * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future, in_flight.pop(future))
+                    if batch_clauses >= self.batch_size:
+                        flush()
+
+            for future in list(in_flight):
+                collect(future, in_flight.pop(future))
+                if batch_clauses >= self.batch_size:
+                    flush()
+            flush()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        elapsed = time.perf_counter() - start
+        stats["seconds"] = elapsed
+        stats["files_per_s"] = stats["parsed"] / elapsed if elapsed else 0.0
+        stats["mb_per_s"] = stats["bytes"] / 1e6 / elapsed if elapsed else 0.0
+        stats["clauses_per_s"] = stats["clauses"] / elapsed if elapsed else 0.0
+        return stats
@@ -0,0 +1,162 @@
+import time
+import uuid
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from pydantic import BaseModel
+
+from src.utils.project_config import Config
+from .ingestion_loader import DocumentLoader
+from .legal_splitter import LegalClauseSplitter
+
+logger = logging.getLogger("ingest_jobs")
+
+# How often a running tenant job re-opens its store, which keeps the tenant's
+# last-use time fresh so CollectionRegistry.evict_idle never drops it midway
+_TENANT_KEEPALIVE_SECONDS = 30.0
+
+
+class IngestionJob(BaseModel):
+    """Progress snapshot of one background ingestion."""
+    job_id: str
+    doc_id: str
+    filename: str
+    tenant: Optional[str] = None
+    stage: str = "queued"  # queued → parsing → indexing → [scoring →] done | failed
+    clauses_processed: int = 0
+    clauses_scored: int = 0
+    error: Optional[str] = None
+    result: Optional[Dict[str, int]] = None
+    created_at: float
+    finished_at: Optional[float] = None
+
+
+class JobQueueFull(Exception):
+    """Raised when too many ingestion jobs are already waiting."""
+
+
+class IngestionJobManager:
+    """
+    Runs document ingestion on a bounded worker pool so parsing, embedding
+    and Chroma writes never block the web server's event loop.
+    ``vector_store`` is a callable returning the VectorStoreManager to use;
+    for jobs submitted with a tenant it is called with the tenant, and again
+    periodically while the job runs so the tenant stays marked as in use.
+
+    When ``risk_scorer`` (a callable returning the RiskScorer) is given and
+    Config.RISK_PRECOMPUTE_ON_INGEST is on, every clause is also risk-scored
+    after indexing so queries read scores from the risk cache. The scoring
+    coroutines run on ``loop`` when given (the server's loop, where the
+    shared scorer lives), otherwise on a private loop per job.
+    """
+
+    def __init__(
+        self,
+        vector_store: Callable,
+        max_concurrent: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        history: Optional[int] = None,
+        risk_scorer: Optional[Callable] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        self._vector_store = vector_store
+        self._risk_scorer = risk_scorer
+        self._loop = loop
+        self._max_queued = max_queued or Config.INGEST_MAX_QUEUED_JOBS
+        self._history = history or Config.INGEST_JOB_HISTORY
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent or Config.INGEST_MAX_CONCURRENT_JOBS,
+            thread_name_prefix="ingest",
+        )
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, content: bytes, filename: str, doc_id: str, tenant: Optional[str] = None) -> IngestionJob:
+        DocumentLoader.check_supported(filename)
+        job = IngestionJob(
+            job_id=uuid.uuid4().hex, doc_id=doc_id, filename=filename, tenant=tenant, created_at=time.time()
+        )
+        with self._lock:
+            queued = sum(1 for j in self._jobs.values() if j.stage == "queued")
+            if queued >= self._max_queued:
+                raise JobQueueFull(f"{queued} ingestion jobs are already queued; try again later.")
+            self._jobs[job.job_id] = job
+            self._prune()
+        self._executor.submit(self._run, job, content)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy() if job else None
+
+    def _prune(self):
+        # Drop the oldest finished jobs beyond the retention limit
+        finished = [jid for jid, j in self._jobs.items() if j.stage in ("done", "failed")]
+        for jid in finished[:max(0, len(self._jobs) - self._history)]:
+            del self._jobs[jid]
+
+    def _run(self, job: IngestionJob, content: bytes):
+        stop = threading.Event()
+        if job.tenant:
+            threading.Thread(
+                target=self._keep_alive, args=(job.tenant, stop), name="ingest-keepalive", daemon=True
+            ).start()
+        try:
+            job.stage = "parsing"
+            segments = DocumentLoader.iter_text(content, job.filename)
+            docs = LegalClauseSplitter().iter_documents(segments, metadata={"source": job.filename})
+
+            job.stage = "indexing"
+
+            def on_progress(count: int):
+                job.clauses_processed = count
+
+            store = self._vector_store(job.tenant) if job.tenant else self._vector_store()
+            job.result = store.upsert_document_stream(job.doc_id, docs, on_progress=on_progress)
+            job.clauses_processed = job.result["total"]
+
+            if self._risk_scorer is not None and Config.RISK_PRECOMPUTE_ON_INGEST:
+                job.stage = "scoring"
+                job.result["risk_scored"] = self._score(job, store)
+            job.stage = "done"
+        except Exception as e:
+            logger.exception(f"Ingestion job {job.job_id} ({job.filename}) failed")
+            job.error = str(e)
+            job.stage = "failed"
+        finally:
+            stop.set()
+            job.finished_at = time.time()
+
+    def _keep_alive(self, tenant: str, stop: threading.Event):
+        while not stop.wait(_TENANT_KEEPALIVE_SECONDS):
+            try:
+                self._vector_store(tenant)
+            except Exception as e:
+                logger.warning(f"Could not refresh tenant '{tenant}': {e}")
+
+    def _score(self, job: IngestionJob, store) -> int:
+        """Risk-score the stored clauses of ``job.doc_id`` in pages; failures are left for query time."""
+        try:
+            scorer = self._risk_scorer()
+            for page in store.iter_document(job.doc_id, batch_size=Config.RISK_PRECOMPUTE_CHUNK):
+                clauses = [
+                    {"id": d.metadata.get("clause_id", f"clause_{i}"), "text": d.page_content}
+                    for i, d in enumerate(page)
+                ]
+                job.clauses_scored += self._run_coroutine(scorer.precompute(clauses))
+        except Exception as e:
+            logger.warning(f"Risk precomputation for '{job.doc_id}' stopped early: {e}")
+        return job.clauses_scored
+
+    def _run_coroutine(self, coro):
+        if self._loop is not None:
+            return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+        return asyncio.run(coro)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
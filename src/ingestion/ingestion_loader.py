@@ -1,24 +1,81 @@
 import io
+import os
 import logging
-from typing import Union, BinaryIO
+import tempfile
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Union, BinaryIO
+
+from src.utils.project_config import Config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("loader")
 
-try:
-    import pypdf
-except ImportError:
-    pypdf = None
 
-try:
-    import docx
-except ImportError:
-    docx = None
+# pypdf and python-docx are imported on first use: plain-text ingestion
+# never needs them
+def _pypdf():
+    try:
+        import pypdf
+    except ImportError:
+        raise ImportError("pypdf is not installed. Run: pip install pypdf")
+    return pypdf
+
+
+def _docx():
+    try:
+        import docx
+    except ImportError:
+        raise ImportError("python-docx is not installed. Run: pip install python-docx")
+    return docx
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Shared extraction pool, created on first use and reused afterwards."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded server process is not safe
+            _pool = ProcessPoolExecutor(
+                max_workers=Config.PDF_EXTRACT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next caller gets a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page_range(path: str, start: int, end: int) -> List[str]:
+    """Worker entry point: extract text for pages [start, end) of a PDF on disk."""
+    reader = _pypdf().PdfReader(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
 
 
 class DocumentLoader:
     """Handles loading of TXT, PDF, and DOCX files into plain text."""
 
+    SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+    @staticmethod
+    def check_supported(filename: str):
+        """Raise ValueError for file types the loader cannot parse."""
+        if not filename.lower().endswith(DocumentLoader.SUPPORTED_EXTENSIONS):
+            raise ValueError(f"Unsupported file format: {filename}. Supported: TXT, PDF, DOCX")
+
     @staticmethod
     def load(file_obj: Union[BinaryIO, bytes], filename: str) -> str:
         filename_lower = filename.lower()
@@ -35,6 +92,133 @@ class DocumentLoader:
         else:
             raise ValueError(f"Unsupported file format: {filename}. Supported: TXT, PDF, DOCX")
 
+    @staticmethod
+    def iter_text(file_obj: Union[BinaryIO, bytes], filename: str) -> Iterator[str]:
+        """
+        Lazily yield text segments whose concatenation equals ``load()``.
+        PDFs are extracted one page at a time so large documents never
+        need their full text in memory. Format and open errors are raised
+        immediately rather than on first iteration.
+        """
+        filename_lower = filename.lower()
+
+        if isinstance(file_obj, bytes):
+            file_obj = io.BytesIO(file_obj)
+
+        if filename_lower.endswith('.pdf'):
+            return DocumentLoader._iter_pdf(file_obj)
+        elif filename_lower.endswith('.docx'):
+            return DocumentLoader._iter_docx(file_obj)
+        elif filename_lower.endswith('.txt'):
+            return iter([DocumentLoader._parse_txt(file_obj)])
+        else:
+            raise ValueError(f"Unsupported file format: {filename}. Supported: TXT, PDF, DOCX")
+
+    @staticmethod
+    def _iter_pdf(file_obj: BinaryIO) -> Iterator[str]:
+        pypdf = _pypdf()
+        try:
+            reader = pypdf.PdfReader(file_obj)
+            num_pages = len(reader.pages)
+        except Exception as e:
+            raise ValueError(f"Failed to parse PDF: {e}")
+
+        if Config.PDF_EXTRACT_WORKERS > 1 and num_pages >= Config.PDF_PARALLEL_MIN_PAGES:
+            pages = DocumentLoader._extract_parallel(file_obj, num_pages)
+        else:
+            pages = DocumentLoader._extract_serial(reader, num_pages)
+
+        def segments() -> Iterator[str]:
+            for i, text in enumerate(pages):
+                yield text if i == 0 else "\n" + text
+
+        return segments()
+
+    @staticmethod
+    def _extract_serial(reader, num_pages: int) -> Iterator[str]:
+        for i in range(num_pages):
+            try:
+                yield reader.pages[i].extract_text() or ""
+            except Exception as e:
+                raise ValueError(f"Failed to parse PDF page {i + 1}: {e}")
+
+    @staticmethod
+    def _extract_parallel(file_obj: BinaryIO, num_pages: int) -> Iterator[str]:
+        """
+        Split the page range across the shared process pool. Workers re-open
+        the PDF from a temp file; page ranges are yielded back in order, with
+        at most two ranges per worker in flight to keep memory bounded.
+        If a worker dies the pool is discarded (the next document gets a new
+        one) and the rest of this document is extracted in-process.
+        """
+        workers = Config.PDF_EXTRACT_WORKERS
+        range_size = max(Config.PDF_PAGES_PER_TASK, -(-num_pages // (workers * 4)))
+        ranges = [(s, min(s + range_size, num_pages)) for s in range(0, num_pages, range_size)]
+
+        path = getattr(file_obj, "name", None)
+        owns_file = not (isinstance(path, str) and os.path.isfile(path))
+        if owns_file:
+            file_obj.seek(0)
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                while chunk := file_obj.read(1 << 20):
+                    tmp.write(chunk)
+                path = tmp.name
+
+        pool = _get_pool()
+        in_flight = deque()
+        extracted = 0  # pages already yielded
+        try:
+            try:
+                pending = iter(ranges)
+                for start, end in pending:
+                    in_flight.append((start, end, pool.submit(_extract_page_range, path, start, end)))
+                    if len(in_flight) >= workers * 2:
+                        break
+                while in_flight:
+                    start, end, future = in_flight.popleft()
+                    try:
+                        texts = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        raise ValueError(f"Failed to parse PDF pages from {start + 1}: {e}")
+                    for next_start, next_end in pending:
+                        in_flight.append(
+                            (next_start, next_end, pool.submit(_extract_page_range, path, next_start, next_end))
+                        )
+                        break
+                    yield from texts
+                    extracted = end
+            except BrokenProcessPool as e:
+                logger.warning(f"PDF extraction pool broke ({e}); extracting pages from {extracted + 1} in-process")
+                _discard_pool(pool)
+                in_flight.clear()
+                for start, end in ranges:
+                    if start < extracted:
+                        continue
+                    try:
+                        texts = _extract_page_range(path, start, end)
+                    except Exception as e:
+                        raise ValueError(f"Failed to parse PDF pages from {start + 1}: {e}")
+                    yield from texts
+        finally:
+            for _start, _end, future in in_flight:
+                future.cancel()
+            if owns_file:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _iter_docx(file_obj: BinaryIO) -> Iterator[str]:
+        docx = _docx()
+        try:
+            doc = docx.Document(file_obj)
+        except Exception as e:
+            raise ValueError(f"Failed to parse DOCX: {e}")
+        return (p.text if i == 0 else "\n" + p.text for i, p in enumerate(doc.paragraphs))
+
     @staticmethod
     def _parse_txt(file_obj: BinaryIO) -> str:
         try:
@@ -48,19 +232,11 @@ class DocumentLoader:
 
     @staticmethod
     def _parse_pdf(file_obj: BinaryIO) -> str:
-        if not pypdf:
-            raise ImportError("pypdf is not installed. Run: pip install pypdf")
-        try:
-            reader = pypdf.PdfReader(file_obj)
-            pages = [p.extract_text() or "" for p in reader.pages]
-            return "\n".join(pages)
-        except Exception as e:
-            raise ValueError(f"Failed to parse PDF: {e}")
+        return "".join(DocumentLoader._iter_pdf(file_obj))
 
     @staticmethod
     def _parse_docx(file_obj: BinaryIO) -> str:
-        if not docx:
-            raise ImportError("python-docx is not installed. Run: pip install python-docx")
+        docx = _docx()
         try:
             doc = docx.Document(file_obj)
             return "\n".join([p.text for p in doc.paragraphs])
@@ -1,59 +1,238 @@
 import re
 import logging
-from typing import List, Optional
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from langchain_text_splitters import TextSplitter
 from langchain_core.documents import Document
 
+from src.utils.project_config import Config
+from src.utils.token_counter import count_tokens
+
 logger = logging.getLogger("splitter")
 
+# Every line break str.splitlines() recognises; they are folded to "\n" so
+# clause text and offsets match a line-by-line split of the same document.
+_LINE_BREAK_CHARS = "\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_BREAKS = re.compile(r"\r\n?|[\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+# Where oversized clauses are cut, coarsest first: blank lines, sentence
+# ends (including ";" between list items), then any whitespace
+_BOUNDARIES = (
+    re.compile(r"\n[^\S\n]*\n\s*"),
+    re.compile(r"(?<=[.!?;])\s+"),
+    re.compile(r"\s+"),
+)
+
+
+class ClauseSpan(NamedTuple):
+    """One clause as a [start, end) range of the line-normalised text."""
+    start: int
+    end: int
+    heading: Optional[re.Match]  # None for text before the first heading
+    # clause_id and number are derived on access, so plain split_text() never pays for them
+    text: str
+
+    @property
+    def clause_id(self) -> str:
+        return self.heading.group(0).strip() if self.heading else "Intro"
+
+    @property
+    def number(self) -> Optional[str]:
+        """The clause number ("SECTION 1.1.2" → "1.1.2"); None for articles and the intro."""
+        if not self.heading:
+            return None
+        return self.heading.group("section") or self.heading.group("dotted") or self.heading.group("top")
+
 
 class LegalClauseSplitter(TextSplitter):
     """
     Splits legal documents on clause/article/section boundaries.
     Recognises patterns like: 1.1, 2.3.1, ARTICLE I, SECTION 5, 3. TITLE
+
+    Headings are found with a single ``finditer`` pass over the text and
+    each clause is sliced out once. Documents carry their character range
+    (``start_index``/``end_index``, into the text with line breaks folded to
+    "\\n"), their depth in the numbering hierarchy (``level``) and, below the
+    top level, the ``parent_clause_id`` they are nested in (1 → 1.1 → 1.1.2).
+
+    Clauses longer than ``max_tokens`` are cut into parts at paragraph or
+    sentence boundaries, each repeating up to ``overlap_tokens`` from the end
+    of the previous part. Parts keep the clause ID with a suffix ("5.1#2")
+    and record their ``part`` number.
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, max_tokens: Optional[int] = None, overlap_tokens: Optional[int] = None, **kwargs):
         super().__init__(**kwargs)
+        self.max_tokens = Config.CLAUSE_MAX_TOKENS if max_tokens is None else max_tokens
+        overlap = Config.CLAUSE_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+        # Larger overlaps would leave little room for new text in each part
+        self.overlap_tokens = min(overlap, self.max_tokens // 2)
+        # [^\S\n] is \s without the newline, so a heading never spans lines
         patterns = [
-            r"^\s*ARTICLE\s+[IVX0-9]+",
-            r"^\s*SECTION\s+[0-9]+(\.[0-9]+)*",
-            r"^\s*[0-9]+\.[0-9]+(\.[0-9]+)*",
-            r"^\s*[0-9]+\.\s+[A-Z]",
+            r"ARTICLE[^\S\n]+(?P<article>[IVX0-9]+)",
+            r"SECTION[^\S\n]+(?P<section>[0-9]+(?:\.[0-9]+)*)",
+            r"(?P<dotted>[0-9]+\.[0-9]+(?:\.[0-9]+)*)",
+            r"(?P<top>[0-9]+)\.[^\S\n]+[A-Z]",
         ]
-        self._pattern = re.compile("|".join(patterns), re.IGNORECASE | re.MULTILINE)
+        headings = "(?:" + "|".join(patterns) + ")"
+        self._pattern = re.compile(r"^[^\S\n]*" + headings, re.IGNORECASE | re.MULTILINE)
+        # Same headings introduced by their line break: a literal first character
+        # lets the regex engine skip straight from one line start to the next
+        self._next_heading = re.compile(r"\n(?=[^\S\n]*[0-9AS])[^\S\n]*" + headings, re.IGNORECASE)
 
     def split_text(self, text: str) -> List[str]:
         if not text:
             return []
-        lines = text.splitlines()
-        chunks: List[str] = []
-        current: List[str] = []
-
-        for line in lines:
-            if self._pattern.match(line):
-                if current:
-                    chunks.append("\n".join(current))
-                current = [line]
+        return [span.text for span in self.iter_spans([text])]
+
+    def iter_spans(self, segments: Iterable[str]) -> Iterator[ClauseSpan]:
+        """
+        Clause spans of the concatenated segments, emitted as soon as the
+        next heading is seen, so a document that arrives page by page is
+        never held in memory as a whole. Only the open clause is buffered.
+        """
+        buffer = ""
+        base = 0          # offset of buffer[0] in the whole text
+        scanned = 0       # buffer index up to which headings were searched
+        clause_start = 0  # buffer index where the open clause begins
+        heading: Optional[re.Match] = None
+        carry = ""
+
+        def scan(endpos: int) -> Iterator[ClauseSpan]:
+            nonlocal clause_start, heading
+            if not base and not scanned:
+                heading = self._pattern.match(buffer, 0, endpos)
+            for match in self._next_heading.finditer(buffer, max(scanned - 1, 0), endpos):
+                end = match.start()
+                # The "\n" before the heading ends the previous clause
+                yield ClauseSpan(base + clause_start, base + end, heading, buffer[clause_start:end])
+                clause_start, heading = end + 1, match
+
+        for segment in segments:
+            if not segment:
+                continue
+            # A trailing "\r" may be the first half of a "\r\n" split across segments
+            segment, carry = carry + segment, ""
+            if segment.endswith("\r"):
+                segment, carry = segment[:-1], "\r"
+            if any(ch in segment for ch in _LINE_BREAK_CHARS):
+                segment = _LINE_BREAKS.sub("\n", segment)
+            buffer += segment
+
+            # Headings are only matched on complete lines; the "\n" that
+            # starts the unfinished last line is left for the next scan
+            limit = buffer.rfind("\n") + 1
+            if limit > scanned:
+                yield from scan(limit - 1)
+                scanned = limit
+
+            # Drop text that belongs to clauses already emitted
+            if clause_start:
+                buffer = buffer[clause_start:]
+                base += clause_start
+                scanned -= clause_start
+                clause_start = 0
+
+        buffer += "\n" if carry else ""
+        if not buffer and not base:
+            return
+        yield from scan(len(buffer))
+        end = len(buffer) - 1 if buffer.endswith("\n") else len(buffer)
+        yield ClauseSpan(base + clause_start, base + end, heading, buffer[clause_start:end])
+
+    def iter_clauses(self, segments: Iterable[str]) -> Iterator[str]:
+        """Incremental equivalent of ``split_text("".join(segments))``."""
+        for span in self.iter_spans(segments):
+            yield span.text
+
+    def iter_documents(self, segments: Iterable[str], metadata: Optional[dict] = None) -> Iterator[Document]:
+        """Streaming counterpart of ``create_documents`` for a single document."""
+        base_meta = metadata or {}
+        # Open ancestors of the next clause: ("<number>." or None for an article, clause_id)
+        stack: List[Tuple[Optional[str], str]] = []
+        for span in self.iter_spans(segments):
+            parent = None
+            if span.heading is None:
+                clause_id, level = "Intro", 0
             else:
-                current.append(line)
+                clause_id, number = span.clause_id, span.number
+                if number is None:
+                    stack.clear()
+                else:
+                    # Pop siblings and their children until the top is an ancestor (1.1 of 1.1.2)
+                    while stack and stack[-1][0] is not None and not number.startswith(stack[-1][0]):
+                        stack.pop()
+                level = len(stack)
+                parent = stack[-1][1] if stack else None
+                stack.append((number + "." if number else None, clause_id))
+            if not span.text or span.text.isspace():
+                continue
+            meta = {**base_meta, "clause_id": clause_id, "start_index": span.start,
+                    "end_index": span.end, "level": level}
+            if parent is not None:
+                meta["parent_clause_id"] = parent
+            parts = self._parts(span.text)
+            if len(parts) == 1:
+                yield Document(page_content=span.text, metadata=meta)
+                continue
+            for n, (start, end) in enumerate(parts, start=1):
+                yield Document(page_content=span.text[start:end], metadata={
+                    **meta, "clause_id": f"{clause_id}#{n}", "part": n,
+                    "start_index": span.start + start, "end_index": span.start + end,
+                })
+
+    def _parts(self, text: str) -> List[Tuple[int, int]]:
+        """[start, end) ranges of ``text`` holding about ``max_tokens`` or fewer each."""
+        # Tokens are at least one character long, so short ASCII text needs no count
+        if not self.max_tokens or (len(text) <= self.max_tokens and text.isascii()):
+            return [(0, len(text))]
+        if count_tokens(text) <= self.max_tokens:
+            return [(0, len(text))]
 
-        if current:
-            chunks.append("\n".join(current))
+        units = list(self._units(text, 0, len(text), 0))
+        parts: List[Tuple[int, int]] = []
+        i = 0
+        while i < len(units):
+            j, total = i, 0
+            while j < len(units) and (j == i or total + units[j][2] <= self.max_tokens):
+                total += units[j][2]
+                j += 1
+            parts.append((units[i][0], units[j - 1][1]))
+            if j == len(units):
+                break
+            # Step back over trailing units for the overlap, as long as the
+            # next part still has room for at least one new unit
+            k, overlap = j, 0
+            while k - 1 > i and overlap + units[k - 1][2] <= self.overlap_tokens:
+                k -= 1
+                overlap += units[k][2]
+            i = k if overlap + units[j][2] <= self.max_tokens else j
+        return parts
 
-        return chunks
+    def _units(self, text: str, start: int, end: int, depth: int) -> Iterator[Tuple[int, int, int]]:
+        """(start, end, tokens) of the pieces of text[start:end], each within ``max_tokens`` where possible."""
+        tokens = count_tokens(text[start:end])
+        if tokens <= self.max_tokens:
+            yield start, end, tokens
+            return
+        if depth == len(_BOUNDARIES):
+            # No whitespace left to cut at (a long URL, a table dump): cut by length
+            step = max(1, (end - start) * self.max_tokens // tokens)
+            for cut in range(start, end, step):
+                yield cut, min(cut + step, end), count_tokens(text[cut:min(cut + step, end)])
+            return
+        position = start
+        for match in _BOUNDARIES[depth].finditer(text, start, end):
+            if match.start() > position:
+                yield from self._units(text, position, match.start(), depth + 1)
+            position = match.end()
+        if position < end:
+            yield from self._units(text, position, end, depth + 1)
 
     def create_documents(self, texts: List[str], metadatas: Optional[List[dict]] = None) -> List[Document]:
         documents: List[Document] = []
         for i, text in enumerate(texts):
-            clauses = self.split_text(text)
+            if not text:
+                continue
             base_meta = metadatas[i] if metadatas else {}
-            for clause in clauses:
-                if not clause.strip():
-                    continue
-                match = self._pattern.match(clause)
-                clause_id = match.group(0).strip() if match else "Intro"
-                meta = base_meta.copy()
-                meta["clause_id"] = clause_id
-                documents.append(Document(page_content=clause, metadata=meta))
+            documents.extend(self.iter_documents([text], base_meta))
         return documents
@@ -1,2 +1,16 @@
 # retrieval module
-from .vector_storage import VectorStoreManager
+# Re-exports are resolved on first access, so chromadb is only loaded by
+# code that uses the vector store (see src/utils/lazy_imports.py)
+from src.utils.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "VectorStoreManager": ".vector_storage",
+    "EmbeddingCache": ".embedding_cache",
+    "CachedEmbeddings": ".embedding_cache",
+    "RateLimitedEmbeddings": ".limited_embeddings",
+    "LexicalIndex": ".lexical_index",
+    "HashedNgramEmbeddings": ".embedding_backends",
+    "create_embeddings": ".embedding_backends",
+    "SemanticAnswerCache": ".answer_cache",
+    "CollectionRegistry": ".collection_registry",
+})
@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from src.utils.metrics import CACHE_LOOKUPS
+
+
+class _Scope:
+    """Cached answers for one document scope, valid for a single clause-set fingerprint."""
+
+    def __init__(self, fingerprint: str, dimensions: int):
+        self.fingerprint = fingerprint
+        self.vectors = np.empty((0, dimensions), dtype=np.float32)
+        self.payloads: List[Dict[str, Any]] = []
+
+
+class SemanticAnswerCache:
+    """
+    In-memory nearest-neighbour cache of final answers. Entries are grouped
+    by scope (the queried documents plus any clause numbers named in the
+    query) and matched by cosine similarity of the query embedding; a hit
+    needs similarity >= ``threshold``. Each scope remembers the clause-set
+    fingerprint it was filled under and is emptied as soon as a lookup or
+    store sees a different one, so re-ingested documents never serve stale
+    answers. Scopes are evicted least recently used first.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_per_scope: int = 256, max_scopes: int = 1024):
+        self.threshold = threshold
+        self.max_per_scope = max_per_scope
+        self.max_scopes = max_scopes
+        self._scopes: "OrderedDict[Hashable, _Scope]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _scope(self, scope: Hashable, fingerprint: str, dimensions: int, create: bool) -> Optional[_Scope]:
+        entry = self._scopes.get(scope)
+        if entry is not None and (entry.fingerprint != fingerprint or entry.vectors.shape[1] != dimensions):
+            del self._scopes[scope]
+            entry = None
+        if entry is None and create:
+            entry = self._scopes[scope] = _Scope(fingerprint, dimensions)
+            while len(self._scopes) > self.max_scopes:
+                self._scopes.popitem(last=False)
+        if entry is not None:
+            self._scopes.move_to_end(scope)
+        return entry
+
+    def lookup(self, scope: Hashable, fingerprint: str, embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """The payload of the most similar cached query in ``scope``, or None below the threshold."""
+        query = self._normalize(embedding)
+        with self._lock:
+            entry = self._scope(scope, fingerprint, len(query), create=False)
+            payload = None
+            if entry is not None and entry.payloads:
+                similarities = entry.vectors @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    payload = entry.payloads[best]
+        CACHE_LOOKUPS.inc(cache="answers", result="hit" if payload is not None else "miss")
+        return dict(payload) if payload is not None else None
+
+    def store(self, scope: Hashable, fingerprint: str, embedding: List[float], payload: Dict[str, Any]):
+        query = self._normalize(embedding)
+        with self._lock:
+            entry = self._scope(scope, fingerprint, len(query), create=True)
+            entry.vectors = np.vstack([entry.vectors, query[None, :]])[-self.max_per_scope:]
+            entry.payloads = (entry.payloads + [dict(payload)])[-self.max_per_scope:]
+
+    def clear(self):
+        with self._lock:
+            self._scopes.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entry.payloads) for entry in self._scopes.values())
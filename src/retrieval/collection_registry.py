@@ -0,0 +1,149 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+from src.utils.project_config import Config
+from .vector_storage import VectorStoreManager
+
+logger = logging.getLogger("collections")
+
+# Last-use times are written at most this often per tenant and process
+_TOUCH_INTERVAL = 60.0
+_MAX_TENANT_LENGTH = 128
+
+
+class CollectionRegistry:
+    """
+    Maps tenants (or sessions) to their own Chroma collection.
+
+    ``get(tenant)`` returns the tenant's VectorStoreManager, opened on first
+    use from ``root`` so every tenant shares one Chroma client, embeddings
+    backend and query pool; no tenant means the root's own collection. At
+    most ``max_open`` tenants stay open per process, least recently used
+    first out; closing one frees its lexical index but keeps its data.
+    Each tenant's manager tracks its own collection's version, so writes
+    by other workers reach its lexical index and answer-cache fingerprint.
+
+    Last-use times live in a SQLite table shared by all worker processes.
+    ``evict_idle`` deletes the collections of tenants idle for longer than
+    ``idle_ttl`` seconds and, beyond ``max_collections``, the least
+    recently used ones, bounding disk use.
+    """
+
+    def __init__(
+        self,
+        root: VectorStoreManager,
+        path: Optional[str] = None,
+        max_open: Optional[int] = None,
+        max_collections: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+    ):
+        self.root = root
+        self.max_open = max_open or Config.TENANT_MAX_OPEN
+        self.max_collections = Config.TENANT_MAX_COLLECTIONS if max_collections is None else max_collections
+        self.idle_ttl = Config.TENANT_IDLE_TTL_SECONDS if idle_ttl is None else idle_ttl
+        self._open: "OrderedDict[str, VectorStoreManager]" = OrderedDict()
+        self._touched: dict = {}
+        self._lock = threading.Lock()
+
+        path = path or Config.TENANT_REGISTRY_PATH
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tenants ("
+            " tenant TEXT PRIMARY KEY,"
+            " collection TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def check_tenant(tenant: Optional[str]):
+        if tenant and len(tenant) > _MAX_TENANT_LENGTH:
+            raise ValueError(f"Tenant IDs are limited to {_MAX_TENANT_LENGTH} characters.")
+
+    def get(self, tenant: Optional[str] = None) -> VectorStoreManager:
+        if not tenant:
+            return self.root
+        self.check_tenant(tenant)
+        now = time.time()
+        with self._lock:
+            manager = self._open.get(tenant)
+            if manager is None:
+                manager = self.root.scoped(tenant)
+                self._open[tenant] = manager
+                while len(self._open) > self.max_open:
+                    closed, _ = self._open.popitem(last=False)
+                    self._touched.pop(closed, None)
+                    logger.info(f"Closed idle collection of tenant '{closed}'")
+            else:
+                self._open.move_to_end(tenant)
+            if now - self._touched.get(tenant, 0.0) >= _TOUCH_INTERVAL:
+                self._touch(tenant, manager.collection_name, now)
+        return manager
+
+    def _touch(self, tenant: str, collection: str, now: float):
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO tenants (tenant, collection, created_at, last_used) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(tenant) DO UPDATE SET last_used = excluded.last_used",
+                (tenant, collection, now, now),
+            )
+        self._touched[tenant] = now
+
+    def tenants(self) -> List[str]:
+        """Known tenants, most recently used first."""
+        with self._lock:
+            rows = self._conn.execute("SELECT tenant FROM tenants ORDER BY last_used DESC").fetchall()
+        return [row[0] for row in rows]
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        """Delete the collections of expired or surplus idle tenants; returns the tenants removed."""
+        now = time.time() if now is None else now
+        # A tenant in use is touched every _TOUCH_INTERVAL, so anything idle for
+        # twice that long is not in use by any process
+        idle_before = now - 2 * _TOUCH_INTERVAL
+        candidates: List[str] = []
+        with self._lock:
+            if self.idle_ttl:
+                cutoff = min(now - self.idle_ttl, idle_before)
+                candidates += [row[0] for row in self._conn.execute(
+                    "SELECT tenant FROM tenants WHERE last_used < ?", (cutoff,)
+                )]
+            if self.max_collections:
+                candidates += [row[0] for row in self._conn.execute(
+                    "SELECT tenant FROM (SELECT tenant, last_used FROM tenants"
+                    " ORDER BY last_used DESC LIMIT -1 OFFSET ?) WHERE last_used < ?",
+                    (self.max_collections, idle_before),
+                )]
+            evicted: List[VectorStoreManager] = []
+            for tenant in dict.fromkeys(candidates):
+                # Another process may have used the tenant since the SELECT
+                with self._conn:
+                    deleted = self._conn.execute(
+                        "DELETE FROM tenants WHERE tenant = ? AND last_used < ?", (tenant, idle_before)
+                    ).rowcount
+                if deleted:
+                    self._touched.pop(tenant, None)
+                    evicted.append(self._open.pop(tenant, None) or self.root.scoped(tenant))
+
+        # Outside the registry lock: drop() waits for searches on the collection to finish
+        for manager in evicted:
+            try:
+                manager.drop()
+                logger.info(f"Deleted idle collection of tenant '{manager.tenant}'")
+            except Exception as e:
+                logger.warning(f"Could not delete collection of tenant '{manager.tenant}': {e}")
+        return [manager.tenant for manager in evicted]
+
+    def close(self):
+        with self._lock:
+            self._open.clear()
+            self._conn.close()
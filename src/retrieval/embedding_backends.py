@@ -0,0 +1,113 @@
+import re
+import zlib
+import functools
+import logging
+from typing import List, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.utils.project_config import Config
+from src.utils.rate_limiter import get_rate_limiter
+from .limited_embeddings import RateLimitedEmbeddings
+
+logger = logging.getLogger("embeddings")
+
+EMBEDDING_BACKENDS = ("gemini", "local")
+
+_WORD = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+
+class HashedNgramEmbeddings(Embeddings):
+    """
+    Offline embeddings computed on the local CPU.
+
+    Word unigrams, word bigrams and character trigrams are feature-hashed
+    (signed, crc32) into a sparse count vector, damped with log1p and
+    reduced to ``dimensions`` by a fixed Gaussian random projection.
+    Hashing and the seeded projection make vectors identical across
+    processes, and each batch is projected with a single matrix product.
+    """
+
+    # Rows projected per matrix product; bounds the dense feature matrix
+    CHUNK_ROWS = 256
+
+    def __init__(self, dimensions: int = 256, hash_buckets: int = 2 ** 14, seed: int = 0):
+        self.dimensions = dimensions
+        self.hash_buckets = hash_buckets
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._projection = (
+            rng.standard_normal((hash_buckets, dimensions), dtype=np.float32) / np.sqrt(dimensions)
+        ).astype(np.float32)
+        self._word_features = functools.lru_cache(maxsize=200_000)(self._hash_word)
+
+    @property
+    def model_name(self) -> str:
+        return f"local-hashed-ngram-{self.dimensions}d-{self.hash_buckets}b-s{self.seed}"
+
+    def _hash(self, feature: str) -> Tuple[int, float]:
+        h = zlib.crc32(feature.encode("utf-8"))
+        return h % self.hash_buckets, (1.0 if h & 0x80000000 else -1.0)
+
+    def _hash_word(self, word: str) -> Tuple[Tuple[int, float], ...]:
+        padded = f"#{word}#"
+        grams = [padded[i:i + 3] for i in range(len(padded) - 2)]
+        return tuple(self._hash(f) for f in [word] + ["\x00" + g for g in grams])
+
+    def _features(self, text: str) -> List[Tuple[int, float]]:
+        words = _WORD.findall(text.lower())
+        features: List[Tuple[int, float]] = []
+        for word in words:
+            features.extend(self._word_features(word))
+        features.extend(self._hash(f"{a} {b}") for a, b in zip(words, words[1:]))
+        return features
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for start in range(0, len(texts), self.CHUNK_ROWS):
+            chunk = texts[start:start + self.CHUNK_ROWS]
+            rows: List[int] = []
+            cols: List[int] = []
+            signs: List[float] = []
+            for row, text in enumerate(chunk):
+                for col, sign in self._features(text):
+                    rows.append(row)
+                    cols.append(col)
+                    signs.append(sign)
+            counts = np.zeros((len(chunk), self.hash_buckets), dtype=np.float32)
+            np.add.at(counts, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)),
+                      np.asarray(signs, dtype=np.float32))
+            counts = np.sign(counts) * np.log1p(np.abs(counts))
+            out[start:start + len(chunk)] = counts @ self._projection
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.where(norms == 0, 1.0, norms)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(list(texts)).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text])[0].tolist()
+
+
+def create_embeddings(backend: str = None) -> Tuple[Embeddings, str]:
+    """
+    Build the embeddings backend named by Config.EMBEDDING_BACKEND.
+    Returns the embeddings and a model identifier for cache keys.
+    """
+    backend = backend or Config.EMBEDDING_BACKEND
+    if backend == "gemini":
+        # Imported here so the offline backend works without the Gemini client
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        embeddings = RateLimitedEmbeddings(
+            GoogleGenerativeAIEmbeddings(
+                model=Config.EMBEDDING_MODEL,
+                google_api_key=Config.GOOGLE_API_KEY
+            ),
+            get_rate_limiter("embedding"),
+        )
+        return embeddings, Config.EMBEDDING_MODEL
+    if backend == "local":
+        embeddings = HashedNgramEmbeddings(dimensions=Config.LOCAL_EMBEDDING_DIMENSIONS)
+        return embeddings, embeddings.model_name
+    raise ValueError(f"Unknown embedding backend '{backend}'; expected one of {EMBEDDING_BACKENDS}")
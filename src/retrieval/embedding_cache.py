@@ -0,0 +1,102 @@
+import re
+import hashlib
+import logging
+from array import array
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from src.utils.sqlite_store import SQLiteLRUStore
+
+logger = logging.getLogger("embedding_cache")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class EmbeddingCache(SQLiteLRUStore):
+    """
+    Size-bounded SQLite store of embedding vectors keyed by
+    (model, kind, normalized text hash). Least recently used rows are
+    evicted once the store grows past ``max_entries``.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        super().__init__(path, table="embeddings", max_entries=max_entries)
+
+    @staticmethod
+    def make_key(model: str, kind: str, text: str) -> str:
+        digest = hashlib.sha256(_normalize(text).encode("utf-8")).hexdigest()
+        return f"{model}:{kind}:{digest}"
+
+    def get_vectors(self, keys: List[str]) -> Dict[str, List[float]]:
+        return {key: array("f", blob).tolist() for key, blob in self.get_many(keys).items()}
+
+    def put_vectors(self, items: Dict[str, List[float]]):
+        self.put_many({key: array("f", vec).tobytes() for key, vec in items.items()})
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves repeated texts from an EmbeddingCache
+    and only forwards cache misses to the underlying model.
+    """
+
+    def __init__(self, underlying: Embeddings, cache: EmbeddingCache, model_name: Optional[str] = None):
+        self.underlying = underlying
+        self.cache = cache
+        self.model_name = model_name or getattr(underlying, "model", type(underlying).__name__)
+
+    def _keys(self, texts: List[str], kind: str) -> List[str]:
+        return [EmbeddingCache.make_key(self.model_name, kind, t) for t in texts]
+
+    def _missing(self, texts: List[str], keys: List[str], found: Dict[str, List[float]]):
+        # De-duplicate misses so repeated boilerplate is embedded only once
+        missing: Dict[str, str] = {}
+        for text, key in zip(texts, keys):
+            if key not in found and key not in missing:
+                missing[key] = text
+        return missing
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = self._keys(texts, "doc")
+        found = self.cache.get_vectors(keys)
+        missing = self._missing(texts, keys, found)
+        if missing:
+            vectors = self.underlying.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            self.cache.put_vectors(fresh)
+            found.update(fresh)
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._keys([text], "query")[0]
+        found = self.cache.get_vectors([key])
+        if key in found:
+            return found[key]
+        vector = self.underlying.embed_query(text)
+        self.cache.put_vectors({key: vector})
+        return vector
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = self._keys(texts, "doc")
+        found = self.cache.get_vectors(keys)
+        missing = self._missing(texts, keys, found)
+        if missing:
+            vectors = await self.underlying.aembed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            self.cache.put_vectors(fresh)
+            found.update(fresh)
+        return [found[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = self._keys([text], "query")[0]
+        found = self.cache.get_vectors([key])
+        if key in found:
+            return found[key]
+        vector = await self.underlying.aembed_query(text)
+        self.cache.put_vectors({key: vector})
+        return vector
@@ -0,0 +1,190 @@
+import re
+import heapq
+import hashlib
+import math
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Dotted clause numbers ("7.2.1") stay one token so they can be matched exactly
+_TOKEN = re.compile(r"\d+(?:\.\d+)+|[a-z0-9]+(?:[-'][a-z0-9]+)*")
+_NUMBER = r"[0-9]+(?:\.[0-9]+)*"
+_HEADING = re.compile(rf"^\s*(?:(article)\s+([ivxlc]+|{_NUMBER})|(?:section\s+)?({_NUMBER}))\b", re.IGNORECASE)
+_REFERENCE = re.compile(
+    rf"\b(article)\s+([ivxlc]+|{_NUMBER})\b|(?:\b(?:section|clause)\s*|§\s*)({_NUMBER})\b(?!\.\d)",
+    re.IGNORECASE,
+)
+
+
+def _key(article: str, article_number: str, number: str) -> str:
+    return f"article {article_number.lower()}" if article else number
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def clause_key(clause_id: str) -> Optional[str]:
+    """
+    Normalise a splitter heading ("SECTION 5.1", "5.1", "3. T", "ARTICLE IV")
+    to a lookup key. Articles keep their prefix since they are often numbered
+    in a separate series from sections.
+    """
+    match = _HEADING.match(clause_id or "")
+    if not match:
+        return None
+    return _key(*match.groups())
+
+
+def clause_references(query: str) -> List[str]:
+    """Lookup keys for explicit references such as "Section 7.2" or "Article IV" in a query."""
+    keys: List[str] = []
+    for groups in _REFERENCE.findall(query):
+        key = _key(*groups)
+        if key not in keys:
+            keys.append(key)
+    return keys
+
+
+class LexicalIndex:
+    """
+    In-memory BM25 inverted index over stored clauses, plus an exact
+    clause-number lookup table. Entries are keyed by the Chroma record ID
+    and carry their ``doc_id`` so searches can be limited to documents.
+    Adding an ID that is already indexed replaces it.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, Tuple[str, ...]] = {}
+        self._doc_of: Dict[str, str] = {}
+        self._clause_key_of: Dict[str, Optional[str]] = {}
+        self._by_clause: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+        self._ids_of_doc: Dict[str, Set[str]] = defaultdict(set)
+        self._digests: Dict[str, str] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def ids(self) -> Set[str]:
+        """Record IDs currently indexed."""
+        with self._lock:
+            return set(self._lengths)
+
+    def doc_counts(self) -> Dict[str, int]:
+        """Number of records indexed per doc_id; records without one are left out."""
+        with self._lock:
+            return {doc_id: len(ids) for doc_id, ids in self._ids_of_doc.items() if doc_id}
+
+    def add(self, ids: Sequence[str], texts: Sequence[str], metadatas: Sequence[Optional[dict]]):
+        with self._lock:
+            for record_id, text, meta in zip(ids, texts, metadatas):
+                self._remove(record_id)
+                meta = meta or {}
+                counts = Counter(tokenize(text or ""))
+                for term, tf in counts.items():
+                    self._postings[term][record_id] = tf
+                length = sum(counts.values())
+                self._lengths[record_id] = length
+                self._terms[record_id] = tuple(counts)
+                self._total_length += length
+                doc_id = meta.get("doc_id", "")
+                key = clause_key(meta.get("clause_id", ""))
+                self._doc_of[record_id] = doc_id
+                self._clause_key_of[record_id] = key
+                self._ids_of_doc[doc_id].add(record_id)
+                self._digests.pop(doc_id, None)
+                if key:
+                    self._by_clause[(doc_id, key)].append(record_id)
+
+    def remove(self, ids: Iterable[str]):
+        with self._lock:
+            for record_id in ids:
+                self._remove(record_id)
+
+    def _remove(self, record_id: str):
+        if record_id not in self._lengths:
+            return
+        for term in self._terms.pop(record_id):
+            postings = self._postings[term]
+            postings.pop(record_id, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(record_id)
+        doc_id = self._doc_of.pop(record_id)
+        key = self._clause_key_of.pop(record_id)
+        self._ids_of_doc[doc_id].discard(record_id)
+        if not self._ids_of_doc[doc_id]:
+            del self._ids_of_doc[doc_id]
+        self._digests.pop(doc_id, None)
+        if key:
+            entries = self._by_clause[(doc_id, key)]
+            entries.remove(record_id)
+            if not entries:
+                del self._by_clause[(doc_id, key)]
+
+    def lookup(self, key: str, doc_ids: Optional[Set[str]] = None) -> List[str]:
+        """Record IDs of clauses numbered ``key``, in ingestion order."""
+        with self._lock:
+            if doc_ids is None:
+                doc_ids = set(self._doc_of.values())
+            return [rid for doc_id in sorted(doc_ids) for rid in self._by_clause.get((doc_id, key), ())]
+
+    def fingerprint(self, doc_ids: Optional[Set[str]] = None) -> str:
+        """
+        Digest of the record IDs indexed for ``doc_ids`` (all documents when
+        None). Record IDs are content hashes, so the digest changes whenever
+        a clause is added, edited or removed.
+        """
+        with self._lock:
+            if doc_ids is None:
+                doc_ids = set(self._ids_of_doc)
+            parts = []
+            for doc_id in sorted(doc_ids):
+                ids = self._ids_of_doc.get(doc_id)
+                if not ids:
+                    continue
+                digest = self._digests.get(doc_id)
+                if digest is None:
+                    digest = hashlib.sha1("\n".join(sorted(ids)).encode("utf-8")).hexdigest()
+                    self._digests[doc_id] = digest
+                parts.append(f"{doc_id}={digest}")
+        return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def search(self, query: str, k: int, doc_ids: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """Top-k (record_id, BM25 score) pairs, optionally limited to ``doc_ids``."""
+        terms = set(tokenize(query))
+        with self._lock:
+            n = len(self._lengths)
+            if not n or not terms:
+                return []
+            avg_length = self._total_length / n or 1.0
+            scores: Dict[str, float] = defaultdict(float)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for record_id, tf in postings.items():
+                    if doc_ids is not None and self._doc_of[record_id] not in doc_ids:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[record_id] / avg_length)
+                    scores[record_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked ID lists: each ID scores sum(1 / (k + rank)) over the lists it appears in."""
+    scores: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, record_id in enumerate(ranking, start=1):
+            scores[record_id] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
@@ -0,0 +1,42 @@
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from src.utils.rate_limiter import RateLimiter
+from src.utils.token_counter import count_tokens
+
+
+class RateLimitedEmbeddings(Embeddings):
+    """
+    Routes every embedding request through a shared RateLimiter. Document
+    batches are split into request-sized chunks so each API call is
+    accounted for (and retried) individually.
+    """
+
+    def __init__(self, underlying: Embeddings, limiter: RateLimiter, request_batch_size: int = 100):
+        self.underlying = underlying
+        self.limiter = limiter
+        self.request_batch_size = request_batch_size
+
+    def _chunks(self, texts: List[str]):
+        for start in range(0, len(texts), self.request_batch_size):
+            chunk = texts[start:start + self.request_batch_size]
+            yield chunk, sum(count_tokens(t) for t in chunk)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for chunk, tokens in self._chunks(texts):
+            vectors.extend(self.limiter.run_sync(lambda: self.underlying.embed_documents(chunk), tokens=tokens))
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.limiter.run_sync(lambda: self.underlying.embed_query(text), tokens=count_tokens(text))
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for chunk, tokens in self._chunks(texts):
+            vectors.extend(await self.limiter.run(lambda: self.underlying.aembed_documents(chunk), tokens=tokens))
+        return vectors
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.limiter.run(lambda: self.underlying.aembed_query(text), tokens=count_tokens(text))
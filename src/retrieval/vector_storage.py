@@ -1,27 +1,80 @@
 import os
 import shutil
+import asyncio
+import functools
+import hashlib
 import logging
+import re
+import threading
+import time
+import uuid
 import chromadb
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 from chromadb.config import Settings
 from langchain_chroma import Chroma
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_core.documents import Document
 from src.utils.project_config import Config
+from src.utils.metrics import RETRIEVAL_SECONDS
+from src.utils.rw_lock import ReadWriteLock
+from .embedding_cache import EmbeddingCache, CachedEmbeddings
+from .embedding_backends import create_embeddings
+from .lexical_index import LexicalIndex, clause_references, reciprocal_rank_fusion
 
 logger = logging.getLogger("vector_store")
 
+# Collection metadata key holding a token that every write replaces
+_VERSION_KEY = "corpus_version"
+
+
+def _reading(method):
+    """Hold the collection's read lock for the call, so a reset cannot drop it midway."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._rw.read():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class VectorStoreManager:
-    """Manages the ChromaDB vector store with Google Gemini embeddings."""
+    """
+    Manages the ChromaDB vector store with the configured embeddings backend.
+
+    Searches and upserts hold a read lock on the collection; ``clear_all``
+    and ``add_documents`` take the write lock, so a reset waits for them
+    instead of deleting the collection underneath. ``scoped(tenant)``
+    returns a manager for a tenant's own collection.
+
+    Every write also replaces a version token in the collection's metadata,
+    which lives in Chroma and is therefore shared with other processes
+    (CLI ingestion, other workers). The in-memory lexical index, and with
+    it ``corpus_fingerprint``, is reconciled with the stored clauses
+    whenever that version differs from the one it was last synced to. It is
+    built by the first read that needs it; writes never build it.
+    """
 
     COLLECTION_NAME = "legal_clauses"
 
     def __init__(self):
-        self.embeddings = GoogleGenerativeAIEmbeddings(
-            model=Config.EMBEDDING_MODEL,
-            google_api_key=Config.GOOGLE_API_KEY
+        self._rw = ReadWriteLock()
+        self.tenant: Optional[str] = None
+        self._query_executor = ThreadPoolExecutor(
+            max_workers=Config.RETRIEVAL_MAX_WORKERS, thread_name_prefix="chroma-query"
         )
+        backend = Config.EMBEDDING_BACKEND
+        embeddings, model_name = create_embeddings(backend)
+        # Vectors from different backends have different dimensions, so each gets its own collection
+        self.collection_name = self.COLLECTION_NAME if backend == "gemini" else f"{self.COLLECTION_NAME}_{backend}"
+        self._base_collection = self.collection_name
+        self.embedding_cache = None
+        # Local vectors are cheaper to recompute than to look up
+        if Config.EMBEDDING_CACHE_ENABLED and backend != "local":
+            self.embedding_cache = EmbeddingCache(
+                Config.EMBEDDING_CACHE_PATH,
+                max_entries=Config.EMBEDDING_CACHE_MAX_ENTRIES,
+            )
+            embeddings = CachedEmbeddings(embeddings, self.embedding_cache, model_name=model_name)
+        self.embeddings = embeddings
         persist_dir = Config.CHROMA_PERSIST_DIRECTORY
         os.makedirs(persist_dir, exist_ok=True)
 
@@ -34,38 +87,530 @@ class VectorStoreManager:
             self._chroma_client = self._make_client(persist_dir)
 
         self.vector_store = self._make_store()
+        # BM25 + clause-number index over the collection, synced on use
+        self.lexical_index = LexicalIndex()
+        self._lexical_version: Optional[str] = None
+        self._lexical_lock = threading.Lock()
 
-    def _make_client(self, path: str) -> chromadb.PersistentClient:
+    def _make_client(self, path: str):
+        settings = Settings(anonymized_telemetry=False, allow_reset=True)
+        if Config.CHROMA_HOST:
+            # A Chroma server is the only safe backend for several worker processes
+            return chromadb.HttpClient(host=Config.CHROMA_HOST, port=Config.CHROMA_PORT, settings=settings)
         return chromadb.PersistentClient(
             path=path,
-            settings=Settings(anonymized_telemetry=False, allow_reset=True)
+            settings=settings,
         )
 
     def _make_store(self) -> Chroma:
         return Chroma(
             client=self._chroma_client,
             embedding_function=self.embeddings,
-            collection_name=self.COLLECTION_NAME,
+            collection_name=self.collection_name,
+        )
+
+    @staticmethod
+    def tenant_collection(base: str, tenant: str) -> str:
+        """Collection name for ``tenant``: readable, within Chroma's character rules and collision-free."""
+        slug = re.sub(r"[^A-Za-z0-9_-]+", "-", tenant).strip("-_")[:48]
+        digest = hashlib.sha1(tenant.encode("utf-8")).hexdigest()[:10]
+        return f"{base}--{slug}-{digest}" if slug else f"{base}--{digest}"
+
+    def scoped(self, tenant: str) -> "VectorStoreManager":
+        """
+        A manager for ``tenant``'s own collection that shares this manager's
+        Chroma client, embeddings and query pool. Its lexical index is synced
+        on first use.
+        """
+        scoped = object.__new__(type(self))
+        scoped.__dict__.update(self.__dict__)
+        scoped._rw = ReadWriteLock()
+        scoped.tenant = tenant
+        scoped.collection_name = self.tenant_collection(self._base_collection, tenant)
+        scoped.lexical_index = LexicalIndex()
+        scoped._lexical_version = None
+        scoped._lexical_lock = threading.Lock()
+        scoped.vector_store = scoped._make_store()
+        return scoped
+
+    def close(self):
+        """Stop the query pool and close the embedding cache; managers from ``scoped`` share both."""
+        self._query_executor.shutdown(wait=False)
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
+
+    def drop(self):
+        """Delete this manager's collection for good; the manager must not be used afterwards."""
+        with self._rw.write():
+            self.vector_store.delete_collection()
+            with self._lexical_lock:
+                self.lexical_index.clear()
+
+    @staticmethod
+    def clause_ids(doc_id: str, documents: List[Document], seen: Optional[Dict[str, int]] = None) -> List[str]:
+        """
+        Content-hash IDs, suffixed when the same text repeats within a document.
+        Pass the same ``seen`` dict across calls when IDs are assigned batch by batch.
+        """
+        ids: List[str] = []
+        seen = {} if seen is None else seen
+        for doc in documents:
+            digest = hashlib.sha256(doc.page_content.encode("utf-8")).hexdigest()[:20]
+            n = seen.get(digest, 0)
+            seen[digest] = n + 1
+            ids.append(f"{doc_id}:{digest}" if n == 0 else f"{doc_id}:{digest}-{n}")
+        return ids
+
+    def upsert_document(self, doc_id: str, documents: List[Document]) -> Dict[str, int]:
+        """
+        Store a document's clauses under ``doc_id``, embedding only clauses
+        that are new or changed and deleting clauses no longer present.
+        Unchanged clauses keep their vectors, but their metadata is rewritten
+        when it differs (offsets shift when an earlier clause is edited).
+        Other documents in the collection are left untouched.
+        """
+        return self.upsert_document_stream(doc_id, documents)
+
+    @_reading
+    def upsert_document_stream(
+        self,
+        doc_id: str,
+        documents: Iterable[Document],
+        batch_size: Optional[int] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, int]:
+        """
+        Streaming form of ``upsert_document``: clauses are consumed lazily
+        and embedded/upserted in fixed-size batches, so peak memory depends
+        on the batch size rather than the document size. ``on_progress`` is
+        called with the running clause count after each batch.
+        """
+        batch_size = batch_size or Config.INGEST_BATCH_SIZE
+        seen: Dict[str, int] = {}
+        kept: set = set()
+        total = added = updated = 0
+
+        store = self._current_store()
+        index, before = self._writer_index()
+        data = store.get(where={"doc_id": doc_id}, include=["metadatas"])
+        existing = dict(zip(data["ids"], data["metadatas"]))
+
+        def flush(batch: List[Document]):
+            nonlocal total, added, updated
+            ids = self.clause_ids(doc_id, batch, seen)
+            kept.update(ids)
+            new_ids, new_docs, moved_ids, moved_docs = [], [], [], []
+            for clause_id, doc in zip(ids, batch):
+                meta = dict(doc.metadata)
+                meta["doc_id"] = doc_id
+                if clause_id not in existing:
+                    new_ids.append(clause_id)
+                    new_docs.append(Document(page_content=doc.page_content, metadata=meta))
+                elif (existing[clause_id] or {}) != meta:
+                    moved_ids.append(clause_id)
+                    moved_docs.append(Document(page_content=doc.page_content, metadata=meta))
+            if new_docs:
+                store.add_documents(new_docs, ids=new_ids)
+                if index is not None:
+                    index.add(new_ids, [d.page_content for d in new_docs], [d.metadata for d in new_docs])
+            self._update_metadata(index, moved_ids, moved_docs, existing)
+            total += len(batch)
+            added += len(new_docs)
+            updated += len(moved_docs)
+            if on_progress:
+                on_progress(total)
+
+        batch: List[Document] = []
+        for doc in documents:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+        to_delete = [i for i in existing if i not in kept]
+        if to_delete:
+            store.delete(ids=to_delete)
+            if index is not None:
+                index.remove(to_delete)
+        if added or updated or to_delete:
+            self._bump_version(before)
+
+        logger.info(
+            f"Document '{doc_id}': {added} added, {len(to_delete)} removed, "
+            f"{total - added} unchanged ({updated} with new positions)"
         )
+        return {
+            "total": total,
+            "added": added,
+            "deleted": len(to_delete),
+            "unchanged": total - added,
+        }
+
+    @_reading
+    def upsert_documents(
+        self, documents: Dict[str, List[Document]], batch_size: Optional[int] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        ``upsert_document`` for many documents at once: existing clause IDs
+        are read with one query, new clauses from all documents are embedded
+        and added together in batches of ``batch_size``, and stale clauses are
+        deleted with one call. Returns per-document stats.
+        """
+        if not documents:
+            return {}
+        batch_size = batch_size or Config.INGEST_BATCH_SIZE
+        store = self._current_store()
+        index, before = self._writer_index()
+        data = store.get(where={"doc_id": {"$in": list(documents)}}, include=["metadatas"])
+        existing: Dict[str, Dict[str, dict]] = {doc_id: {} for doc_id in documents}
+        for record_id, meta in zip(data["ids"], data["metadatas"]):
+            existing[(meta or {}).get("doc_id")][record_id] = meta or {}
+
+        stats: Dict[str, Dict[str, int]] = {}
+        new_ids: List[str] = []
+        new_docs: List[Document] = []
+        moved_ids: List[str] = []
+        moved_docs: List[Document] = []
+        stored_meta: Dict[str, dict] = {}
+        to_delete: List[str] = []
+        for doc_id, docs in documents.items():
+            ids = self.clause_ids(doc_id, docs)
+            kept = set(ids)
+            added = 0
+            for clause_id, doc in zip(ids, docs):
+                meta = {**doc.metadata, "doc_id": doc_id}
+                if clause_id not in existing[doc_id]:
+                    new_ids.append(clause_id)
+                    new_docs.append(Document(page_content=doc.page_content, metadata=meta))
+                    added += 1
+                elif existing[doc_id][clause_id] != meta:
+                    moved_ids.append(clause_id)
+                    moved_docs.append(Document(page_content=doc.page_content, metadata=meta))
+                    stored_meta[clause_id] = existing[doc_id][clause_id]
+            stale = [i for i in existing[doc_id] if i not in kept]
+            to_delete.extend(stale)
+            stats[doc_id] = {"total": len(docs), "added": added, "deleted": len(stale), "unchanged": len(docs) - added}
+
+        for start in range(0, len(new_docs), batch_size):
+            chunk_ids, chunk = new_ids[start:start + batch_size], new_docs[start:start + batch_size]
+            store.add_documents(chunk, ids=chunk_ids)
+            if index is not None:
+                index.add(chunk_ids, [d.page_content for d in chunk], [d.metadata for d in chunk])
+        for start in range(0, len(moved_docs), batch_size):
+            self._update_metadata(index, moved_ids[start:start + batch_size],
+                                  moved_docs[start:start + batch_size], stored_meta)
+        if to_delete:
+            store.delete(ids=to_delete)
+            if index is not None:
+                index.remove(to_delete)
+        if new_docs or moved_docs or to_delete:
+            self._bump_version(before)
+        logger.info(f"{len(documents)} documents: {len(new_docs)} clauses added, {len(to_delete)} removed")
+        return stats
+
+    def _update_metadata(self, index: Optional[LexicalIndex], ids: List[str], docs: List[Document],
+                         stored: Dict[str, Optional[dict]]):
+        """
+        Rewrite the metadata of clauses whose text is unchanged but whose
+        position fields (offsets, level, parent, part) moved with an edit
+        elsewhere in the document. ``stored`` holds the current metadata.
+        """
+        if not ids:
+            return
+        # update() merges metadata; None removes keys the clause no longer has
+        metadatas = [
+            {**{key: None for key in (stored[rid] or {}) if key not in doc.metadata}, **doc.metadata}
+            for rid, doc in zip(ids, docs)
+        ]
+        self._chroma_client.get_collection(self.collection_name).update(ids=ids, metadatas=metadatas)
+        if index is not None:
+            index.add(ids, [d.page_content for d in docs], [d.metadata for d in docs])
+
+    @_reading
+    def delete_document(self, doc_id: str) -> int:
+        """Remove every clause stored under ``doc_id``."""
+        store = self._current_store()
+        index, before = self._writer_index()
+        ids = store.get(where={"doc_id": doc_id}, include=[])["ids"]
+        if ids:
+            store.delete(ids=ids)
+            if index is not None:
+                index.remove(ids)
+            self._bump_version(before)
+        return len(ids)
+
+    def iter_document(self, doc_id: str, batch_size: Optional[int] = None) -> Iterator[List[Document]]:
+        """Yield the stored clauses of ``doc_id`` page by page."""
+        batch_size = batch_size or Config.INGEST_BATCH_SIZE
+        offset = 0
+        while True:
+            # Locked per page: the caller may hold the generator open for a long time
+            with self._rw.read():
+                data = self.vector_store.get(where={"doc_id": doc_id}, include=["documents", "metadatas"],
+                                             limit=batch_size, offset=offset)
+            if not data["ids"]:
+                return
+            yield [
+                Document(page_content=text, metadata=meta or {}, id=rid)
+                for rid, text, meta in zip(data["ids"], data["documents"], data["metadatas"])
+            ]
+            offset += len(data["ids"])
+
+    @_reading
+    def list_documents(self) -> Dict[str, int]:
+        """Return a mapping of stored doc_id → clause count, read from the lexical index."""
+        return self._lexical(self._current_store()).doc_counts()
+
+    @_reading
+    def corpus_fingerprint(self, doc_id: Union[str, List[str], None] = None) -> str:
+        """Digest of the clause set of the given documents (all when None); see LexicalIndex.fingerprint."""
+        return self._lexical(self._current_store()).fingerprint(self._doc_id_set(doc_id))
 
     def add_documents(self, documents: List[Document], clear_existing: bool = True) -> List[str]:
         if not documents:
             return []
-        if clear_existing:
-            self.clear_all()
-        return self.vector_store.add_documents(documents)
+        with self._rw.write():
+            if clear_existing:
+                self.clear_all()
+            index, before = self._writer_index()
+            ids = self.vector_store.add_documents(documents)
+            if index is not None:
+                index.add(ids, [d.page_content for d in documents], [d.metadata for d in documents])
+            self._bump_version(before)
+            return ids
+
+    def _current_store(self) -> Chroma:
+        # Callers hold the read lock, so the collection cannot be swapped meanwhile
+        return self.vector_store
+
+    def _with_store(self, fn: Callable, *args):
+        """Run ``fn(store, *args)`` under the read lock; used for work handed to the query pool."""
+        with self._rw.read():
+            return fn(self.vector_store, *args)
 
     def clear_all(self):
         """Drop and recreate the collection for a fresh start."""
+        with self._rw.write():
+            try:
+                self.vector_store.delete_collection()
+            except Exception as e:
+                logger.warning(f"Could not delete collection: {e}")
+            self.vector_store = self._make_store()
+            with self._lexical_lock:
+                self.lexical_index.clear()
+                self._lexical_version = None
+
+    @staticmethod
+    def _version_of(collection, token: Optional[str] = None) -> str:
+        # The ID changes when another process drops and recreates the collection
+        if token is None:
+            token = (collection.metadata or {}).get(_VERSION_KEY, "")
+        return f"{collection.id}:{token}"
+
+    def _shared_version(self) -> Optional[str]:
+        """The collection's current version as stored in Chroma; None when it does not exist."""
         try:
-            self.vector_store.delete_collection()
+            collection = self._chroma_client.get_collection(self.collection_name)
+        except Exception:
+            return None
+        return self._version_of(collection)
+
+    def _bump_version(self, before: Optional[str]):
+        """
+        Tell every process sharing the collection that its clauses changed.
+        ``before`` is the version read when the write began. If the index was
+        synced to it and nobody else has written since, the index (which the
+        write kept up to date) adopts the new version instead of re-syncing.
+        """
+        try:
+            collection = self._chroma_client.get_collection(self.collection_name)
+            current = self._version_of(collection)
+            token = uuid.uuid4().hex
+            # modify() replaces the metadata; index settings cannot be passed back in
+            metadata = {k: v for k, v in (collection.metadata or {}).items() if not k.startswith("hnsw:")}
+            collection.modify(metadata={**metadata, _VERSION_KEY: token})
         except Exception as e:
-            logger.warning(f"Could not delete collection: {e}")
-        self.vector_store = self._make_store()
+            logger.warning(f"Could not record a new version of '{self.collection_name}': {e}")
+            return
+        with self._lexical_lock:
+            if self._lexical_version is not None and self._lexical_version == before == current:
+                self._lexical_version = self._version_of(collection, token)
+
+    def _writer_index(self) -> Tuple[Optional[LexicalIndex], Optional[str]]:
+        """
+        ``(index, version)`` for a write that is about to start. Writers keep
+        the lexical index current only once a search has built it, so
+        ingestion (e.g. a short-lived CLI run) never loads the whole corpus
+        into memory; readers catch up through the version token. ``version``
+        is None when there is no index to keep current.
+        """
+        if self._lexical_version is None:
+            return None, None
+        return self.lexical_index, self._shared_version()
+
+    def _lexical(self, store: Chroma) -> LexicalIndex:
+        """The lexical index, first synced with the stored clauses if the collection changed since."""
+        version = self._shared_version()
+        if version != self._lexical_version:
+            with self._lexical_lock:
+                # Read before listing the clauses: a write after this bumps the version again
+                version = self._shared_version()
+                if version != self._lexical_version:
+                    self._sync_lexical(store)
+                    self._lexical_version = version
+        return self.lexical_index
+
+    def _sync_lexical(self, store: Chroma):
+        index = self.lexical_index
+        if not len(index):
+            data = store.get(include=["documents", "metadatas"])
+            index.add(data["ids"], data["documents"], data["metadatas"])
+            logger.info(f"Lexical index built over {len(index)} clauses")
+            return
+        known = index.ids()
+        stored = set(store.get(include=[])["ids"])
+        stale = known - stored
+        missing = sorted(stored - known)
+        index.remove(stale)
+        batch_size = Config.INGEST_BATCH_SIZE
+        for start in range(0, len(missing), batch_size):
+            data = store.get(ids=missing[start:start + batch_size], include=["documents", "metadatas"])
+            index.add(data["ids"], data["documents"], data["metadatas"])
+        if stale or missing:
+            logger.info(f"Lexical index synced: {len(missing)} clauses added, {len(stale)} removed")
 
-    def search(self, query: str, k: int = 5):
-        """Return top-k similar (Document, score) pairs."""
-        return self.vector_store.similarity_search_with_score(query, k=k)
+    @staticmethod
+    def _doc_filter(doc_id: Union[str, List[str], None]) -> Optional[dict]:
+        if not doc_id:
+            return None
+        if isinstance(doc_id, str):
+            return {"doc_id": doc_id}
+        return {"doc_id": {"$in": list(doc_id)}}
+
+    @staticmethod
+    def _doc_id_set(doc_id: Union[str, List[str], None]) -> Optional[Set[str]]:
+        if not doc_id:
+            return None
+        return {doc_id} if isinstance(doc_id, str) else set(doc_id)
+
+    @staticmethod
+    def _fetch(store: Chroma, ids: List[str]) -> List[Document]:
+        """Load stored clauses by record ID, in the order given."""
+        if not ids:
+            return []
+        data = store.get(ids=ids, include=["documents", "metadatas"])
+        found = {
+            rid: Document(page_content=text, metadata=meta or {}, id=rid)
+            for rid, text, meta in zip(data["ids"], data["documents"], data["metadatas"])
+        }
+        return [found[rid] for rid in ids if rid in found]
+
+    def _exact_ids(self, store: Chroma, query: str, doc_id) -> Optional[List[str]]:
+        """
+        Record IDs of the clauses named in the query ("Section 7.2", "Article IV"),
+        or None when the query references no clause or one that is not in the index.
+        """
+        keys = clause_references(query)
+        if not keys:
+            return None
+        index = self._lexical(store)
+        doc_ids = self._doc_id_set(doc_id)
+        ids: List[str] = []
+        for key in keys:
+            found = index.lookup(key, doc_ids)
+            if not found:
+                return None
+            ids.extend(found)
+        return ids
+
+    def _exact_matches(self, store: Chroma, query: str, k: int, doc_id) -> Optional[List[Tuple[Document, float]]]:
+        ids = self._exact_ids(store, query, doc_id)
+        if ids is None:
+            return None
+        return [(doc, 1.0) for doc in self._fetch(store, ids[:k])]
+
+    @_reading
+    def answers_exactly(self, query: str, doc_id: Union[str, List[str], None] = None) -> bool:
+        """True when ``search`` would answer ``query`` from the clause lookup, without an embedding."""
+        return self._exact_ids(self._current_store(), query, doc_id) is not None
+
+    def _hybrid(self, store: Chroma, query: str, embedding: List[float], k: int, doc_id):
+        """Fuse vector and BM25 candidates with reciprocal rank fusion."""
+        candidates = max(k, Config.HYBRID_CANDIDATES)
+        vector = store.similarity_search_by_vector_with_relevance_scores(
+            embedding, k=candidates, filter=self._doc_filter(doc_id)
+        )
+        lexical = self._lexical(store).search(query, candidates, self._doc_id_set(doc_id))
+        by_id = {doc.id: doc for doc, _score in vector}
+        fused = reciprocal_rank_fusion(
+            [[doc.id for doc, _score in vector], [rid for rid, _score in lexical]], k=Config.RRF_K
+        )[:k]
+        missing = [rid for rid, _score in fused if rid not in by_id]
+        by_id.update((doc.id, doc) for doc in self._fetch(store, missing))
+        return [(by_id[rid], score) for rid, score in fused if rid in by_id]
+
+    @staticmethod
+    def _timed(start: float, path: str, results):
+        RETRIEVAL_SECONDS.observe(time.perf_counter() - start, path=path)
+        return results
+
+    @_reading
+    def search(self, query: str, k: int = 5, doc_id: Union[str, List[str], None] = None):
+        """
+        Return the top-k (Document, score) pairs, optionally limited to given
+        documents. Explicit clause references are answered from the clause
+        lookup without embedding the query; otherwise vector and BM25 results
+        are fused (scores are then RRF scores, higher is better).
+        """
+        start = time.perf_counter()
+        store = self._current_store()
+        exact = self._exact_matches(store, query, k, doc_id)
+        if exact is not None:
+            return self._timed(start, "exact", exact)
+        if not Config.HYBRID_RETRIEVAL_ENABLED:
+            results = store.similarity_search_with_score(query, k=k, filter=self._doc_filter(doc_id))
+            return self._timed(start, "vector", results)
+        results = self._hybrid(store, query, self.embeddings.embed_query(query), k, doc_id)
+        return self._timed(start, "hybrid", results)
+
+    async def asearch(
+        self,
+        query: str,
+        k: int = 5,
+        doc_id: Union[str, List[str], None] = None,
+        embedding: Optional[List[float]] = None,
+    ):
+        """
+        Non-blocking ``search``: the query is embedded with the async client
+        and the Chroma lookup runs on a bounded thread pool, so concurrent
+        requests are not serialised on the event loop. Pass ``embedding``
+        when the query has already been embedded.
+        """
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        exact = await loop.run_in_executor(
+            self._query_executor, self._with_store, self._exact_matches, query, k, doc_id
+        )
+        if exact is not None:
+            return self._timed(start, "exact", exact)
+        if embedding is None:
+            embedding = await self.embeddings.aembed_query(query)
+        if not Config.HYBRID_RETRIEVAL_ENABLED:
+            results = await loop.run_in_executor(
+                self._query_executor,
+                self._with_store,
+                lambda store: store.similarity_search_by_vector_with_relevance_scores(
+                    embedding, k=k, filter=self._doc_filter(doc_id)
+                ),
+            )
+            return self._timed(start, "vector", results)
+        results = await loop.run_in_executor(
+            self._query_executor, self._with_store, self._hybrid, query, embedding, k, doc_id
+        )
+        return self._timed(start, "hybrid", results)
 
     def get_retriever(self, k: int = 5):
-        return self.vector_store.as_retriever(search_kwargs={"k": k})
+        with self._rw.read():
+            return self.vector_store.as_retriever(search_kwargs={"k": k})
@@ -1,4 +1,11 @@
 # risk engine module
-from .risk_scorer import RiskScorer
-from .risk_rules import RiskRuleEngine
-from .risk_models import RiskClause
+# Re-exports are resolved on first access, so rule-engine-only code never
+# loads langchain or the Gemini SDK (see src/utils/lazy_imports.py)
+from src.utils.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "RiskScorer": ".risk_scorer",
+    "RiskRuleEngine": ".risk_rules",
+    "RiskClause": ".risk_models",
+    "RiskResultCache": ".risk_cache",
+})
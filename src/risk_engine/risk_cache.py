@@ -0,0 +1,36 @@
+import hashlib
+import logging
+from typing import Dict, List
+
+from src.utils.sqlite_store import SQLiteLRUStore
+from .risk_models import RiskClause
+
+logger = logging.getLogger("risk_cache")
+
+
+class RiskResultCache(SQLiteLRUStore):
+    """
+    Persistent store of scored RiskClause results keyed by clause text
+    hash, model name, prompt version and rule-set version, so repeated
+    queries over the same document skip the LLM for clauses already scored.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        super().__init__(path, table="risk_results", max_entries=max_entries)
+
+    @staticmethod
+    def make_key(text: str, model: str, prompt_version: str, ruleset_version: str) -> str:
+        digest = hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+        return f"{model}:{prompt_version}:{ruleset_version}:{digest}"
+
+    def get_results(self, keys: List[str]) -> Dict[str, RiskClause]:
+        results: Dict[str, RiskClause] = {}
+        for key, blob in self.get_many(keys).items():
+            try:
+                results[key] = RiskClause.model_validate_json(blob)
+            except Exception as e:
+                logger.warning(f"Discarding unreadable cached result ({e})")
+        return results
+
+    def put_results(self, items: Dict[str, RiskClause]):
+        self.put_many({key: rc.model_dump_json().encode("utf-8") for key, rc in items.items()})
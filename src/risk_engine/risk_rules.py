@@ -1,28 +1,158 @@
-from typing import List, Tuple
+import re
+import json
+import hashlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from src.utils.project_config import Config
+
+# A keyword entry is a term or a list of alternative terms
+Keyword = Union[str, Sequence[str]]
+Rule = Tuple[List[Keyword], int, str]
+
+# Words may contain inner hyphens/apostrophes ("auto-renewal", "party's")
+_TOKEN = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
 
 
 class RiskRuleEngine:
-    """Keyword-based deterministic risk scoring as a safety net alongside LLM analysis."""
-
-    def __init__(self):
-        # Each rule: (required_keywords, score_modifier, label)
-        self.rules: List[Tuple[List[str], int, str]] = [
-            (["indemnify", "unlimited"], 7, "unlimited indemnity"),
-            (["liability", "cap"], -2, "liability cap present"),
-            (["termination", "convenience"], 3, "termination for convenience"),
-            (["auto-renew"], 2, "auto-renewal clause"),
-            (["confidential", "survival"], 1, "confidentiality survival"),
-            (["no warranty", "as is"], 2, "warranty disclaimer"),
-            (["governing law"], -1, "governing law defined"),
-        ]
+    """
+    Keyword-based deterministic risk scoring as a safety net alongside LLM analysis.
+
+    Rules are loaded from a JSON file (Config.RISK_RULES_PATH) and compiled
+    once into a token index: every keyword is matched on whole words, a
+    trailing ``*`` matches any word with that prefix and multi-word
+    keywords match phrases. A clause is tokenised once per evaluation and
+    only rules sharing a matched keyword are checked, so cost grows with
+    clause length and matches rather than with rules × clause length.
+    """
+
+    def __init__(self, rules: Optional[List[Rule]] = None, rules_path: Optional[str] = None):
+        if rules is None:
+            rules = self.load_rules(rules_path or Config.RISK_RULES_PATH)
+        self.set_rules(rules)
+
+    @staticmethod
+    def load_rules(path: str) -> List[Rule]:
+        """Read rules from a JSON file: {"rules": [{"keywords", "score", "label"}, ...]}."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        rules: List[Rule] = []
+        for entry in data.get("rules", []):
+            if not entry.get("keywords") or "label" not in entry:
+                raise ValueError(f"Invalid risk rule in {path}: {entry}")
+            rules.append((entry["keywords"], int(entry.get("score", 0)), entry["label"]))
+        return rules
+
+    def set_rules(self, rules: List[Rule]):
+        """Replace the rule set and recompile the matcher."""
+        self.rules: List[Rule] = [(list(kw), int(mod), label) for kw, mod, label in rules]
+        self._compile()
+
+    def add_rule(self, keywords: List[Keyword], modifier: int, label: str):
+        self.set_rules(self.rules + [(keywords, modifier, label)])
+
+    @property
+    def version(self) -> str:
+        """Stable fingerprint of the rule set, used to key cached results."""
+        return self._version
+
+    # ------------------------------------------------------------------ #
+    # Compilation
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _parse_term(term: str) -> Tuple[Tuple[str, bool], ...]:
+        """'Governing  law*' → (('governing', False), ('law', True))."""
+        words = []
+        for raw in term.lower().split():
+            prefix = raw.endswith("*")
+            word = raw.rstrip("*")
+            if not _TOKEN.fullmatch(word):
+                raise ValueError(f"Unsupported keyword '{term}': use plain words, phrases or a trailing '*'")
+            words.append((word, prefix))
+        if not words:
+            raise ValueError("Empty keyword in risk rule")
+        return tuple(words)
+
+    def _compile(self):
+        term_ids: Dict[Tuple[Tuple[str, bool], ...], int] = {}
+        # first word → terms starting with it; prefix terms keyed by their prefix
+        self._by_first: Dict[str, List[Tuple[int, tuple]]] = defaultdict(list)
+        self._by_prefix: Dict[str, List[Tuple[int, tuple]]] = defaultdict(list)
+        self._compiled_rules: List[List[Set[int]]] = []
+        self._rules_by_term: Dict[int, Set[int]] = defaultdict(set)
+
+        for rule_idx, (keywords, _modifier, _label) in enumerate(self.rules):
+            groups: List[Set[int]] = []
+            for entry in keywords:
+                alternatives = [entry] if isinstance(entry, str) else list(entry)
+                group: Set[int] = set()
+                for alt in alternatives:
+                    words = self._parse_term(alt)
+                    if words not in term_ids:
+                        tid = len(term_ids)
+                        term_ids[words] = tid
+                        first, first_prefix = words[0]
+                        index = self._by_prefix if first_prefix else self._by_first
+                        index[first].append((tid, words[1:]))
+                    group.add(term_ids[words])
+                    self._rules_by_term[term_ids[words]].add(rule_idx)
+                groups.append(group)
+            self._compiled_rules.append(groups)
+
+        self._prefix_lengths = sorted({len(p) for p in self._by_prefix})
+        self._needs_positions = any(rest for idx in (self._by_first, self._by_prefix)
+                                    for terms in idx.values() for _tid, rest in terms)
+        self._version = hashlib.sha256(
+            json.dumps(self.rules, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+
+    # ------------------------------------------------------------------ #
+    # Matching
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _rest_matches(tokens: List[str], start: int, rest: tuple) -> bool:
+        if start + len(rest) > len(tokens):
+            return False
+        for offset, (word, prefix) in enumerate(rest):
+            token = tokens[start + offset]
+            if not (token.startswith(word) if prefix else token == word):
+                return False
+        return True
+
+    def _matched_terms(self, text: str) -> Set[int]:
+        tokens = _TOKEN.findall(text.lower())
+        matched: Set[int] = set()
+        by_first, by_prefix, prefix_lengths = self._by_first, self._by_prefix, self._prefix_lengths
+        # Phrase keywords need token positions; otherwise each distinct token is checked once
+        positions = enumerate(tokens) if self._needs_positions else enumerate(dict.fromkeys(tokens))
+        for i, token in positions:
+            for tid, rest in by_first.get(token, ()):
+                if tid not in matched and (not rest or self._rest_matches(tokens, i + 1, rest)):
+                    matched.add(tid)
+            for length in prefix_lengths:
+                if length > len(token):
+                    break
+                for tid, rest in by_prefix.get(token[:length], ()):
+                    if tid not in matched and (not rest or self._rest_matches(tokens, i + 1, rest)):
+                        matched.add(tid)
+        return matched
 
     def evaluate(self, text: str) -> Tuple[int, List[str]]:
         """Return (total_score_modifier, list_of_triggered_rule_labels)."""
+        matched = self._matched_terms(text)
+        candidates: Set[int] = set()
+        for tid in matched:
+            candidates |= self._rules_by_term[tid]
+
         score = 0
         triggered: List[str] = []
-        text_lower = text.lower()
-        for keywords, modifier, label in self.rules:
-            if all(kw in text_lower for kw in keywords):
+        for rule_idx in sorted(candidates):
+            if all(group & matched for group in self._compiled_rules[rule_idx]):
+                _keywords, modifier, label = self.rules[rule_idx]
                 score += modifier
                 triggered.append(label)
         return score, triggered
+
+    def evaluate_many(self, texts: Sequence[str]) -> List[Tuple[int, List[str]]]:
+        """Evaluate a batch of clauses; results are in input order."""
+        return [self.evaluate(text) for text in texts]
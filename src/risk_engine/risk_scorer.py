@@ -1,30 +1,79 @@
 import json
-import re
 import logging
 import asyncio
-from typing import List
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
 
 from src.utils.project_config import Config
+from src.utils.token_counter import count_tokens
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.metrics import RISK_BATCH_CLAUSES, RISK_FALLBACKS, record_completion_tokens, time_llm_call
 from .risk_models import RiskClause
 from .risk_rules import RiskRuleEngine
+from .risk_cache import RiskResultCache
 
 logger = logging.getLogger("scorer")
 
+_JSON = json.JSONDecoder()
+
+
+def _iter_json_array(text: str) -> Iterator[Any]:
+    """
+    Yield the elements of the first JSON array in ``text`` one at a time.
+    Malformed elements are skipped by resuming at the next object, and a
+    truncated array yields everything before the cut.
+    """
+    start = text.find("[")
+    if start < 0:
+        return
+    pos, end = start + 1, len(text)
+    while True:
+        while pos < end and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= end or text[pos] == "]":
+            return
+        try:
+            item, pos = _JSON.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            pos = text.find("{", pos + 1)
+            if pos < 0:
+                return
+            continue
+        yield item
+
+
+def _completion_tokens(response) -> int:
+    usage = getattr(response, "usage_metadata", None)
+    if usage and usage.get("output_tokens"):
+        return usage["output_tokens"]
+    return count_tokens(str(getattr(response, "content", "")))
+
 
 class RiskScorer:
     """Hybrid risk scorer: LLM analysis + deterministic rule engine."""
 
-    def __init__(self):
+    # Bump whenever the prompts below change so cached results are not reused
+    PROMPT_VERSION = "1"
+
+    def __init__(self, cache: Optional[RiskResultCache] = None):
+        self.cache = cache
+        if self.cache is None and Config.RISK_CACHE_ENABLED:
+            self.cache = RiskResultCache(Config.RISK_CACHE_PATH, max_entries=Config.RISK_CACHE_MAX_ENTRIES)
+        # Imported here so importing this module does not load the Gemini SDK
+        from langchain_google_genai import ChatGoogleGenerativeAI
         self.llm = ChatGoogleGenerativeAI(
             model=Config.LLM_SCAN_MODEL,
             google_api_key=Config.GOOGLE_API_KEY,
-            temperature=0
+            temperature=0,
+            max_retries=Config.GEMINI_CLIENT_ATTEMPTS
         )
+        self.limiter = get_rate_limiter("chat")
         self.rules = RiskRuleEngine()
+        self.token_budget = Config.RISK_BATCH_TOKEN_BUDGET
+        self._batch_semaphore = asyncio.Semaphore(Config.RISK_BATCH_MAX_CONCURRENCY)
         self.parser = PydanticOutputParser(pydantic_object=RiskClause)
 
         # Single-clause prompt (fallback)
@@ -70,11 +119,54 @@ Return ONLY a valid JSON array (no markdown, no explanation) matching this schem
             input_variables=["segments_text"]
         )
 
+    def _cache_key(self, clause_text: str) -> str:
+        return RiskResultCache.make_key(
+            clause_text, Config.LLM_SCAN_MODEL, self.PROMPT_VERSION, self.rules.version
+        )
+
+    def _apply_rules(self, result: RiskClause, clause_text: str) -> RiskClause:
+        modifier, triggered = self.rules.evaluate(clause_text)
+        result.risk_score = max(1, min(10, result.risk_score + modifier))
+        result.risk_level = "High" if result.risk_score >= 8 else ("Medium" if result.risk_score >= 5 else "Low")
+        if triggered:
+            result.reason += f" | Rules triggered: {', '.join(triggered)}"
+        return result
+
+    def _lookup_cached(self, clauses: List[dict]) -> Dict[str, RiskClause]:
+        if self.cache is None:
+            return {}
+        try:
+            return self.cache.get_results([self._cache_key(c['text']) for c in clauses])
+        except Exception as e:
+            logger.warning(f"Risk cache lookup failed: {e}")
+            return {}
+
+    def _store_cached(self, items: Dict[str, RiskClause]):
+        if self.cache is None or not items:
+            return
+        try:
+            self.cache.put_results(items)
+        except Exception as e:
+            logger.warning(f"Risk cache write failed: {e}")
+
     async def analyze_clause(self, clause_id: str, clause_text: str) -> RiskClause:
         """Analyze a single clause (used as fallback)."""
+        key = self._cache_key(clause_text)
+        cached = self._lookup_cached([{"id": clause_id, "text": clause_text}])
+        if key in cached:
+            return cached[key].model_copy(update={"clause_id": clause_id})
+
         try:
-            chain = self.single_prompt | self.llm | self.parser
-            result = await chain.ainvoke({"clause_id": clause_id, "clause_text": clause_text})
+            chain = self.single_prompt | self.llm
+            prompt_tokens = count_tokens(clause_text)
+
+            async def call():
+                with time_llm_call("risk_single", prompt_tokens):
+                    return await chain.ainvoke({"clause_id": clause_id, "clause_text": clause_text})
+
+            response = await self.limiter.run(call, tokens=prompt_tokens)
+            record_completion_tokens("risk_single", _completion_tokens(response))
+            result = self.parser.invoke(response)
         except Exception as e:
             logger.warning(f"Single clause analysis failed for {clause_id}: {e}")
             result = RiskClause(
@@ -85,70 +177,167 @@ Return ONLY a valid JSON array (no markdown, no explanation) matching this schem
                 reason=f"Analysis error: {str(e)}",
                 recommendation="Manual review recommended."
             )
+            # Apply rule engine on top; error placeholders are never cached
+            return self._apply_rules(result, clause_text)
 
         # Apply rule engine on top
-        modifier, triggered = self.rules.evaluate(clause_text)
-        result.risk_score = max(1, min(10, result.risk_score + modifier))
-        result.risk_level = "High" if result.risk_score >= 8 else ("Medium" if result.risk_score >= 5 else "Low")
-        if triggered:
-            result.reason += f" | Rules triggered: {', '.join(triggered)}"
-
+        result = self._apply_rules(result, clause_text)
+        self._store_cached({key: result})
         return result
 
+    @staticmethod
+    def _segment(clause: dict) -> str:
+        return f"ID: {clause['id']}\nContent: {clause['text']}"
+
+    def _pack_batches(self, clauses: List[dict]) -> List[List[dict]]:
+        """
+        Greedily pack clauses, in order, into batches whose segment text stays
+        within the token budget. A clause larger than the budget goes alone.
+        """
+        batches: List[List[dict]] = []
+        current: List[dict] = []
+        used = 0
+        for c in clauses:
+            cost = count_tokens(self._segment(c))
+            if current and used + cost > self.token_budget:
+                batches.append(current)
+                current, used = [], 0
+            current.append(c)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _analyze_packed(self, batch: List[dict]) -> List[RiskClause]:
+        async with self._batch_semaphore:
+            return await self._analyze_uncached(batch)
+
     async def analyze_batch(self, clauses: List[dict]) -> List[RiskClause]:
         """
-        Analyze multiple clauses in a single LLM call to conserve API quota.
-        Falls back to individual calls if batch parsing fails.
+        Analyze multiple clauses with as few LLM calls as possible.
+        Clauses with a cached result are served locally; the rest are packed
+        into token-bounded batches scored concurrently, and results come back
+        in the original clause order.
         """
         if not clauses:
             return []
 
-        segments_text = "\n\n".join(
-            [f"ID: {c['id']}\nContent: {c['text']}" for c in clauses]
-        )
+        keys = [self._cache_key(c['text']) for c in clauses]
+        cached = self._lookup_cached(clauses)
+        pending = [c for c, key in zip(clauses, keys) if key not in cached]
+        if not pending:
+            logger.info(f"All {len(clauses)} clauses served from risk cache.")
+
+        batches = self._pack_batches(pending)
+        if len(batches) > 1:
+            logger.info(f"Scoring {len(pending)} clauses in {len(batches)} batches.")
+        batch_results = await asyncio.gather(*(self._analyze_packed(b) for b in batches))
+        fresh = [rc for batch in batch_results for rc in batch]
+
+        # One result per pending clause; repeated IDs are matched in order
+        fresh_by_id: Dict[str, List[RiskClause]] = defaultdict(list)
+        for rc in fresh:
+            fresh_by_id[str(rc.clause_id)].append(rc)
 
+        results: List[RiskClause] = []
+        for c, key in zip(clauses, keys):
+            if key in cached:
+                results.append(cached[key].model_copy(update={"clause_id": c['id']}))
+            elif fresh_by_id.get(str(c['id'])):
+                results.append(fresh_by_id[str(c['id'])].pop(0))
+        return results
+
+    async def precompute(self, clauses: List[dict]) -> int:
+        """
+        Score clauses ahead of any query (e.g. at ingestion) so that later
+        ``analyze_batch`` calls are served from the risk cache. Returns how
+        many of the clauses now have a cached result; the rest are retried
+        at query time.
+        """
+        if self.cache is None:
+            logger.warning("Risk cache is disabled; skipping risk precomputation.")
+            return 0
+        await self.analyze_batch(clauses)
+        cached = self._lookup_cached(clauses)
+        return sum(1 for c in clauses if self._cache_key(c['text']) in cached)
+
+    @staticmethod
+    def _parse_item(item) -> Optional[RiskClause]:
+        """Validate one element of a batch response; None marks its clause for re-request."""
+        if not isinstance(item, dict) or item.get('clause_id') is None:
+            return None
+        data = dict(item, clause_id=str(item['clause_id']))
         try:
-            response = await self.llm.ainvoke(
-                self.batch_prompt.format(segments_text=segments_text)
-            )
-            content = response.content
-
-            # Strip markdown fences if present
-            match = re.search(r'\[.*\]', content, re.DOTALL)
-            if match:
-                content = match.group(0)
-
-            data = json.loads(content)
-            results: List[RiskClause] = []
-
-            for item in data:
-                original_text = next(
-                    (c['text'] for c in clauses if str(c['id']) == str(item.get('clause_id', ''))), ""
-                )
-                try:
-                    rc = RiskClause(**item)
-                except Exception:
-                    # Try to build a minimal valid object
-                    rc = RiskClause(
-                        clause_id=item.get('clause_id', 'Unknown'),
-                        clause_type=item.get('clause_type', 'Unknown'),
-                        risk_level=item.get('risk_level', 'Medium'),
-                        risk_score=max(1, min(10, int(item.get('risk_score', 5)))),
-                        reason=item.get('reason', 'N/A'),
-                        recommendation=item.get('recommendation', 'Review manually.')
-                    )
-
-                modifier, triggered = self.rules.evaluate(original_text)
-                rc.risk_score = max(1, min(10, rc.risk_score + modifier))
-                rc.risk_level = "High" if rc.risk_score >= 8 else ("Medium" if rc.risk_score >= 5 else "Low")
-                if triggered:
-                    rc.reason += f" | Rules triggered: {', '.join(triggered)}"
-
-                results.append(rc)
-
-            return results
+            data['risk_score'] = max(1, min(10, int(data['risk_score'])))
+            return RiskClause(**data)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    async def _request_batch(self, clauses: List[dict]) -> Tuple[List[RiskClause], List[dict]]:
+        """
+        One batch LLM call. Returns the results that could be matched to a
+        clause and the clauses still missing one. Items under an ID outside
+        the batch, or repeating an ID whose clauses all have a result, are
+        dropped: there is no clause text to score them against.
+        """
+        try:
+            prompt = self.batch_prompt.format(segments_text="\n\n".join(self._segment(c) for c in clauses))
+            prompt_tokens = count_tokens(prompt)
+            RISK_BATCH_CLAUSES.observe(len(clauses))
+
+            async def call():
+                with time_llm_call("risk_batch", prompt_tokens):
+                    return await self.llm.ainvoke(prompt)
 
+            response = await self.limiter.run(call, tokens=prompt_tokens)
+            record_completion_tokens("risk_batch", _completion_tokens(response))
+            items = list(_iter_json_array(response.content))
         except Exception as e:
-            logger.error(f"Batch analysis failed ({e}), falling back to individual calls…")
-            tasks = [self.analyze_clause(c['id'], c['text']) for c in clauses]
-            return await asyncio.gather(*tasks)
+            logger.error(f"Batch analysis call failed: {e}")
+            return [], clauses
+
+        # Clause IDs may repeat across sections, so each ID maps to a queue
+        waiting: Dict[str, List[Tuple[int, dict]]] = defaultdict(list)
+        for i, c in enumerate(clauses):
+            waiting[str(c['id'])].append((i, c))
+
+        results: List[RiskClause] = []
+        to_cache: Dict[str, RiskClause] = {}
+        dropped = 0
+        for item in items:
+            rc = self._parse_item(item)
+            if rc is None:
+                continue
+            queue = waiting.get(rc.clause_id)
+            if not queue:
+                dropped += 1
+                continue
+            _i, clause = queue.pop(0)
+            rc = self._apply_rules(rc, clause['text'])
+            to_cache[self._cache_key(clause['text'])] = rc
+            results.append(rc)
+
+        if dropped:
+            logger.warning(f"Ignored {dropped} batch results with an unknown or already answered clause ID")
+        self._store_cached(to_cache)
+        missing = sorted((entry for queue in waiting.values() for entry in queue), key=lambda e: e[0])
+        return results, [c for _i, c in missing]
+
+    async def _analyze_uncached(self, clauses: List[dict]) -> List[RiskClause]:
+        """
+        Score clauses in one batch LLM call and cache the results.
+        Valid items are kept even if others are malformed or the array is cut
+        off; clauses left without a result are re-requested together in one
+        follow-up batch, and only those that fail twice go to individual calls.
+        """
+        results, missing = await self._request_batch(clauses)
+        if missing:
+            logger.warning(f"No usable result for {len(missing)} of {len(clauses)} clauses, re-requesting them…")
+            RISK_FALLBACKS.inc(len(missing), stage="follow_up")
+            retried, missing = await self._request_batch(missing)
+            results.extend(retried)
+        if missing:
+            logger.error(f"Falling back to individual calls for {len(missing)} clauses…")
+            RISK_FALLBACKS.inc(len(missing), stage="individual")
+            results.extend(await asyncio.gather(*(self.analyze_clause(c['id'], c['text']) for c in missing)))
+        return results
@@ -1,2 +1,16 @@
 # utils module
-from .project_config import Config
+# Re-exports are resolved on first access, so importing one helper does
+# not load the others (see lazy_imports.py)
+from .lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "Config": ".project_config",
+    "SQLiteLRUStore": ".sqlite_store",
+    "count_tokens": ".token_counter",
+    "RateLimiter": ".rate_limiter",
+    "get_rate_limiter": ".rate_limiter",
+    "REGISTRY": ".metrics",
+    "collect_timings": ".metrics",
+    "ReadWriteLock": ".rw_lock",
+    "SingleFlight": ".single_flight",
+})
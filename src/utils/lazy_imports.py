@@ -0,0 +1,25 @@
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """
+    Module ``__getattr__``/``__dir__`` (PEP 562) for a package that re-exports
+    names from its submodules. ``exports`` maps each name to the relative
+    module defining it; the module is imported when the name is first read,
+    so ``from src.x import Y`` only loads the dependencies of Y.
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str):
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
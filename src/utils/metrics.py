@@ -0,0 +1,226 @@
+import time
+import threading
+import contextvars
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets (seconds) spanning local lookups to slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[bisect_left(self.buckets, value)] += 1
+            total[0] += value
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series[0]) if series else 0
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _format_value(bound)
+                    labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {repr(total[0])}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide metrics rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+NODE_SECONDS = REGISTRY.histogram(
+    "legal_workflow_node_seconds", "Workflow node latency.", ["node"])
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "legal_llm_call_seconds", "Latency of individual LLM calls.", ["call"])
+LLM_TOKENS = REGISTRY.counter(
+    "legal_llm_tokens_total", "Prompt and completion tokens sent to / received from the LLM.", ["call", "kind"])
+RISK_BATCH_CLAUSES = REGISTRY.histogram(
+    "legal_risk_batch_clauses", "Clauses per batch risk request.",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200))
+RISK_FALLBACKS = REGISTRY.counter(
+    "legal_risk_fallback_clauses_total",
+    "Clauses re-requested after a batch response lacked a valid result.", ["stage"])
+RETRIEVAL_SECONDS = REGISTRY.histogram(
+    "legal_retrieval_seconds", "VectorStoreManager search latency.", ["path"])
+CACHE_LOOKUPS = REGISTRY.counter(
+    "legal_cache_lookups_total", "Cache lookups by result.", ["cache", "result"])
+RATE_LIMITED = REGISTRY.counter(
+    "legal_rate_limited_total", "Calls that hit a 429 from the Gemini API.", ["limiter"])
+COALESCED_REQUESTS = REGISTRY.counter(
+    "legal_coalesced_requests_total", "Requests answered by an identical execution already in flight.", ["endpoint"])
+
+
+# ---------------------------------------------------------------------- #
+# Per-request timing breakdown
+# ---------------------------------------------------------------------- #
+_request_timings: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def collect_timings() -> Iterator[dict]:
+    """
+    Collect the nodes and LLM calls of the current request into a dict
+    (milliseconds). Tasks spawned inside the block share the same dict.
+    """
+    timings: dict = {"nodes": {}, "llm_calls": {}}
+    token = _request_timings.set(timings)
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings["total_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        _request_timings.reset(token)
+
+
+def _record(section: str, name: str, seconds: float):
+    timings = _request_timings.get()
+    if timings is None:
+        return
+    entry = timings[section].setdefault(name, {"count": 0, "ms": 0.0})
+    entry["count"] += 1
+    entry["ms"] = round(entry["ms"] + seconds * 1000, 2)
+
+
+@contextmanager
+def time_node(node: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        NODE_SECONDS.observe(elapsed, node=node)
+        _record("nodes", node, elapsed)
+
+
+@contextmanager
+def time_llm_call(call: str, prompt_tokens: int = 0) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        LLM_CALL_SECONDS.observe(elapsed, call=call)
+        if prompt_tokens:
+            LLM_TOKENS.inc(prompt_tokens, call=call, kind="prompt")
+        _record("llm_calls", call, elapsed)
+
+
+def record_completion_tokens(call: str, tokens: int):
+    if tokens:
+        LLM_TOKENS.inc(tokens, call=call, kind="completion")
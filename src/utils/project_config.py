@@ -11,14 +11,111 @@ class Config:
     # Chroma DB stored at project root
     PROJECT_ROOT = Path(__file__).parent.parent.parent.parent.parent
     CHROMA_PERSIST_DIRECTORY = str(PROJECT_ROOT / "chroma_db")
+    # Chroma server to use instead of the embedded store above. Required when
+    # several worker processes serve the API: PersistentClient is single-process.
+    CHROMA_HOST = os.getenv("CHROMA_HOST")
+    CHROMA_PORT = int(os.getenv("CHROMA_PORT", 8000))
 
     EMBEDDING_MODEL = "models/gemini-embedding-001"
+    # "gemini" (API) or "local" (offline hashed n-gram embeddings, no key needed)
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "gemini")
+    LOCAL_EMBEDDING_DIMENSIONS = 256
+
+    # Thread pool bound for Chroma queries issued by async retrieval
+    RETRIEVAL_MAX_WORKERS = 8
+    # Hybrid retrieval: BM25 and vector candidates fused with reciprocal rank fusion
+    HYBRID_RETRIEVAL_ENABLED = True
+    HYBRID_CANDIDATES = 20
+    RRF_K = 60
+
+    # Per-tenant collections, selected with the TENANT_HEADER request header
+    # (no header → the shared default collection). Each process keeps at most
+    # TENANT_MAX_OPEN tenants in memory; on disk, collections idle for longer
+    # than TENANT_IDLE_TTL_SECONDS (0 = never) are deleted, as are the least
+    # recently used beyond TENANT_MAX_COLLECTIONS (0 = unlimited).
+    TENANT_HEADER = "X-Tenant-ID"
+    TENANT_REGISTRY_PATH = str(PROJECT_ROOT / "cache" / "tenants.sqlite3")
+    TENANT_MAX_OPEN = int(os.getenv("TENANT_MAX_OPEN", 32))
+    TENANT_MAX_COLLECTIONS = int(os.getenv("TENANT_MAX_COLLECTIONS", 0))
+    TENANT_IDLE_TTL_SECONDS = float(os.getenv("TENANT_IDLE_TTL_SECONDS", 0))
+    TENANT_SWEEP_INTERVAL_SECONDS = 300
+
+    # Clauses embedded and upserted per batch during streaming ingestion
+    INGEST_BATCH_SIZE = 64
+
+    # Clauses longer than this many tokens are sub-split at paragraph or
+    # sentence boundaries ("5.1#1", "5.1#2", …); 0 disables sub-splitting.
+    # Consecutive parts may repeat up to CLAUSE_OVERLAP_TOKENS of context.
+    CLAUSE_MAX_TOKENS = int(os.getenv("CLAUSE_MAX_TOKENS", 1000))
+    CLAUSE_OVERLAP_TOKENS = int(os.getenv("CLAUSE_OVERLAP_TOKENS", 0))
+
+    # Background ingestion jobs started through /api/ingest
+    INGEST_MAX_CONCURRENT_JOBS = 2
+    INGEST_MAX_QUEUED_JOBS = 50
+    INGEST_JOB_HISTORY = 200
+
+    # `python main.py ingest-dir`: parser processes, clauses embedded per
+    # batch, and the manifest that lets interrupted runs resume
+    BULK_INGEST_WORKERS = int(os.getenv("BULK_INGEST_WORKERS", os.cpu_count() or 1))
+    BULK_INGEST_BATCH_SIZE = 512
+    INGEST_MANIFEST_PATH = str(PROJECT_ROOT / "cache" / "ingest_manifest.sqlite3")
+
+    # Parallel PDF text extraction (1 = always serial). PDFs with fewer
+    # pages than PDF_PARALLEL_MIN_PAGES are extracted serially.
+    PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", os.cpu_count() or 1))
+    PDF_PARALLEL_MIN_PAGES = 32
+    PDF_PAGES_PER_TASK = 8
+
+    # Local SQLite cache of embedding vectors (set ENABLED to False to bypass)
+    EMBEDDING_CACHE_ENABLED = True
+    EMBEDDING_CACHE_PATH = str(PROJECT_ROOT / "cache" / "embeddings.sqlite3")
+    EMBEDDING_CACHE_MAX_ENTRIES = 200_000
 
     # gemini-2.0-flash: fast, high quota model
     LLM_SCAN_MODEL = "gemini-2.0-flash"
     LLM_REASONING_MODEL = "gemini-2.0-flash"
     LLM_MODEL = "gemini-2.0-flash"
 
+    # Shared Gemini rate limits (free tier defaults). Retries on 429 are
+    # handled by src/utils/rate_limiter.py, so client-side retries are off.
+    GEMINI_CHAT_RPM = float(os.getenv("GEMINI_CHAT_RPM", 15))
+    GEMINI_CHAT_TPM = float(os.getenv("GEMINI_CHAT_TPM", 1_000_000))
+    GEMINI_CHAT_MAX_CONCURRENCY = 4
+    GEMINI_EMBEDDING_RPM = float(os.getenv("GEMINI_EMBEDDING_RPM", 100))
+    GEMINI_EMBEDDING_TPM = float(os.getenv("GEMINI_EMBEDDING_TPM", 30_000))
+    GEMINI_EMBEDDING_MAX_CONCURRENCY = 4
+    GEMINI_MAX_RETRIES = 5
+    GEMINI_BACKOFF_BASE = 2.0
+    GEMINI_BACKOFF_MAX = 60.0
+    GEMINI_CLIENT_ATTEMPTS = 1
+
+    # Risk scoring batches: clause tokens per prompt and concurrent LLM calls
+    RISK_BATCH_TOKEN_BUDGET = 6000
+    RISK_BATCH_MAX_CONCURRENCY = 3
+
+    # Keyword rules applied on top of LLM risk scores
+    RISK_RULES_PATH = os.getenv(
+        "RISK_RULES_PATH", str(Path(__file__).parent.parent / "risk_engine" / "risk_rules.json")
+    )
+
+    # Persistent cache of clause-level risk results
+    RISK_CACHE_ENABLED = True
+    RISK_CACHE_PATH = str(PROJECT_ROOT / "cache" / "risk_results.sqlite3")
+    RISK_CACHE_MAX_ENTRIES = 100_000
+    # Score every clause once at ingestion so queries read risk from the cache
+    RISK_PRECOMPUTE_ON_INGEST = os.getenv("RISK_PRECOMPUTE_ON_INGEST", "false").lower() in ("1", "true", "yes")
+    RISK_PRECOMPUTE_CHUNK = 200
+
+    # In-memory cache of final answers, matched by query-embedding cosine
+    # similarity within the same documents; dropped when their clauses change
+    ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", 0.95))
+    ANSWER_CACHE_MAX_PER_SCOPE = 256
+    ANSWER_CACHE_MAX_SCOPES = 1024
+    # Identical /api/analyze requests (same tenant, documents, document
+    # version and normalised query) arriving together share one execution
+    REQUEST_COALESCING_ENABLED = os.getenv("REQUEST_COALESCING_ENABLED", "true").lower() in ("1", "true", "yes")
+
     @classmethod
     def validate_api_key(cls):
         if not cls.GOOGLE_API_KEY:
@@ -0,0 +1,232 @@
+import re
+import time
+import random
+import asyncio
+import logging
+import threading
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from src.utils.project_config import Config
+from src.utils.metrics import RATE_LIMITED
+
+logger = logging.getLogger("rate_limiter")
+
+T = TypeVar("T")
+
+_RETRY_AFTER = re.compile(r"retry(?:[_\s-]?(?:after|delay)\W*|\s+in\s+)(\d+(?:\.\d+)?)\s*s?", re.IGNORECASE)
+# How often a caller re-checks for a free concurrency slot
+_SLOT_POLL_SECONDS = 0.05
+
+
+def _error_chain(error: BaseException):
+    # Client wrappers re-raise SDK errors, so inspect the causes as well
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    for e in _error_chain(error):
+        code = getattr(e, "code", None) or getattr(e, "status_code", None)
+        if code == 429:
+            return True
+        message = str(e)
+        if "429" in message or "RESOURCE_EXHAUSTED" in message or "quota" in message.lower():
+            return True
+    return False
+
+
+def is_retryable(error: BaseException) -> bool:
+    """A 429 that is safe to retry: errors with ``retryable = False`` (e.g. output already streamed) are not."""
+    return getattr(error, "retryable", True) and is_rate_limit_error(error)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Server-suggested wait, from a Retry-After header or a RetryInfo delay in the message."""
+    for e in _error_chain(error):
+        headers = getattr(getattr(e, "response", None), "headers", None)
+        if headers:
+            value = headers.get("Retry-After") or headers.get("retry-after")
+            try:
+                if value is not None:
+                    return float(value)
+            except ValueError:
+                pass
+        match = _RETRY_AFTER.search(str(e))
+        if match:
+            return float(match.group(1))
+    return None
+
+
+class _TokenBucket:
+    """Reservation-style token bucket: callers may go into debt and wait it off in turn."""
+
+    def __init__(self, per_minute: float, burst_seconds: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        # Requests larger than the burst are charged in full: the debt is a finite wait
+        self.level -= amount
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+
+class RateLimiter:
+    """
+    Process-wide limiter for calls to one Gemini endpoint family.
+
+    Combines requests/min and tokens/min token buckets with an adaptive
+    concurrency cap: a 429 halves the cap and pauses every caller for the
+    server's Retry-After (or an exponential backoff with jitter), and each
+    success grows the cap back additively. State is guarded by a thread
+    lock so sync (thread pool) and async callers share the same budget.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: int = 4,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        burst_seconds: float = 10.0,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._requests = _TokenBucket(requests_per_minute, burst_seconds)
+        self._tokens = _TokenBucket(tokens_per_minute, burst_seconds) if tokens_per_minute else None
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.rate_limited_count = 0
+
+    @property
+    def concurrency_limit(self) -> int:
+        return max(1, int(self._limit))
+
+    def _try_acquire(self, tokens: int) -> Optional[float]:
+        """Take a slot and reserve budget; None means no slot is free yet."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until or self._in_flight >= self.concurrency_limit:
+                return None
+            self._in_flight += 1
+            wait = self._requests.reserve(1, now)
+            if self._tokens is not None and tokens:
+                wait = max(wait, self._tokens.reserve(tokens, now))
+            return wait
+
+    def _pause_remaining(self) -> float:
+        with self._lock:
+            return max(_SLOT_POLL_SECONDS, self._paused_until - time.monotonic())
+
+    def _release(self, rate_limited: bool = False, pause: float = 0.0):
+        with self._lock:
+            self._in_flight -= 1
+            if rate_limited:
+                RATE_LIMITED.inc(limiter=self.name)
+                self.rate_limited_count += 1
+                self._limit = max(1.0, self._limit / 2)
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            else:
+                self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        suggested = retry_after_seconds(error)
+        if suggested is not None:
+            return suggested + random.uniform(0, 1.0)
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    async def run(self, call: Callable[[], Awaitable[T]], tokens: int = 0) -> T:
+        """Await ``call()`` within the rate budget, retrying on 429s."""
+        attempt = 0
+        while True:
+            wait = self._try_acquire(tokens)
+            while wait is None:
+                await asyncio.sleep(self._pause_remaining())
+                wait = self._try_acquire(tokens)
+            try:
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                result = await call()
+            except BaseException as e:
+                if isinstance(e, Exception) and is_retryable(e) and attempt < self.max_retries:
+                    delay = self._backoff(attempt, e)
+                    self._release(rate_limited=True, pause=delay)
+                    logger.warning(f"[{self.name}] rate limited, retrying in {delay:.1f}s (attempt {attempt + 1})")
+                    attempt += 1
+                    continue
+                self._release(rate_limited=isinstance(e, Exception) and is_rate_limit_error(e))
+                raise
+            self._release()
+            return result
+
+    def run_sync(self, call: Callable[[], T], tokens: int = 0) -> T:
+        """Blocking counterpart of ``run`` for code running in worker threads."""
+        attempt = 0
+        while True:
+            wait = self._try_acquire(tokens)
+            while wait is None:
+                time.sleep(self._pause_remaining())
+                wait = self._try_acquire(tokens)
+            try:
+                if wait > 0:
+                    time.sleep(wait)
+                result = call()
+            except Exception as e:
+                if is_retryable(e) and attempt < self.max_retries:
+                    delay = self._backoff(attempt, e)
+                    self._release(rate_limited=True, pause=delay)
+                    logger.warning(f"[{self.name}] rate limited, retrying in {delay:.1f}s (attempt {attempt + 1})")
+                    attempt += 1
+                    continue
+                self._release(rate_limited=is_rate_limit_error(e))
+                raise
+            self._release()
+            return result
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str) -> RateLimiter:
+    """Shared limiter for ``"chat"`` (Gemini LLM calls) or ``"embedding"``."""
+    with _limiters_lock:
+        if name not in _limiters:
+            if name == "chat":
+                _limiters[name] = RateLimiter(
+                    "chat",
+                    requests_per_minute=Config.GEMINI_CHAT_RPM,
+                    tokens_per_minute=Config.GEMINI_CHAT_TPM,
+                    max_concurrency=Config.GEMINI_CHAT_MAX_CONCURRENCY,
+                    max_retries=Config.GEMINI_MAX_RETRIES,
+                    backoff_base=Config.GEMINI_BACKOFF_BASE,
+                    backoff_max=Config.GEMINI_BACKOFF_MAX,
+                )
+            elif name == "embedding":
+                _limiters[name] = RateLimiter(
+                    "embedding",
+                    requests_per_minute=Config.GEMINI_EMBEDDING_RPM,
+                    tokens_per_minute=Config.GEMINI_EMBEDDING_TPM,
+                    max_concurrency=Config.GEMINI_EMBEDDING_MAX_CONCURRENCY,
+                    max_retries=Config.GEMINI_MAX_RETRIES,
+                    backoff_base=Config.GEMINI_BACKOFF_BASE,
+                    backoff_max=Config.GEMINI_BACKOFF_MAX,
+                )
+            else:
+                raise ValueError(f"Unknown rate limiter: {name}")
+        return _limiters[name]
@@ -0,0 +1,124 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, List
+
+from .metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger("sqlite_store")
+
+# SQLite caps the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+
+class SQLiteLRUStore:
+    """
+    Thread-safe key → bytes store backed by a single SQLite table.
+    Least recently used rows are evicted once the table grows past
+    ``max_entries``; lookups count towards hit/miss statistics.
+    """
+
+    def __init__(self, path: str, table: str, max_entries: int = 100_000):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._last_stamp = 0.0
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_access ON {table}(last_access)"
+        )
+        self._conn.commit()
+
+    def _stamp(self) -> float:
+        # Strictly increasing so LRU order is stable within one clock tick
+        self._last_stamp = max(time.time(), self._last_stamp + 1e-6)
+        return self._last_stamp
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """Return stored values for the given keys, touching their LRU stamp."""
+        found: Dict[str, bytes] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(unique), _LOOKUP_CHUNK):
+                chunk = unique[start:start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = self._stamp()
+                self._conn.executemany(
+                    f"UPDATE {self.table} SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        CACHE_LOOKUPS.inc(hits, cache=self.table, result="hit")
+        CACHE_LOOKUPS.inc(len(keys) - hits, cache=self.table, result="miss")
+        return found
+
+    def put_many(self, items: Dict[str, bytes]):
+        if not items:
+            return
+        with self._lock:
+            now = self._stamp()
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table}(key, value, last_access) VALUES (?, ?, ?)",
+                [(key, value, now) for key, value in items.items()],
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete_many(self, keys: List[str]):
+        if not keys:
+            return
+        with self._lock:
+            self._conn.executemany(
+                f"DELETE FROM {self.table} WHERE key = ?", [(key,) for key in keys]
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f" SELECT key FROM {self.table} ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": len(self),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
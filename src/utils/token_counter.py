@@ -0,0 +1,38 @@
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger("tokens")
+
+# cl100k_base is not Gemini's tokenizer, but it tracks it closely enough
+# for sizing prompts and chunks against a budget.
+_ENCODING_NAME = "cl100k_base"
+_encoding = None
+_encoding_failed = False
+_lock = threading.Lock()
+
+
+def _get_encoding():
+    global _encoding, _encoding_failed
+    if _encoding is not None or _encoding_failed:
+        return _encoding
+    with _lock:
+        if _encoding is None and not _encoding_failed:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding(_ENCODING_NAME)
+            except Exception as e:
+                # tiktoken downloads its BPE file on first use; offline hosts fall back
+                logger.warning(f"tiktoken unavailable ({e}); estimating tokens from characters")
+                _encoding_failed = True
+    return _encoding
+
+
+def count_tokens(text: str, encoding: Optional[object] = None) -> int:
+    """Approximate LLM token count of ``text``."""
+    if not text:
+        return 0
+    enc = encoding or _get_encoding()
+    if enc is None:
+        return len(text) // 4 + 1
+    return len(enc.encode(text, disallowed_special=()))
@@ -1,3 +1,10 @@
 # workflow module
-from .workflow_graph import create_workflow
-from .workflow_nodes import LegalNodes, GraphState
+# Re-exports are resolved on first access (see src/utils/lazy_imports.py)
+from src.utils.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "create_workflow": ".workflow_graph",
+    "LegalNodes": ".workflow_nodes",
+    "GraphState": ".workflow_nodes",
+    "AppResources": ".app_resources",
+})
@@ -0,0 +1,78 @@
+import logging
+import threading
+from typing import Optional
+
+from src.retrieval.vector_storage import VectorStoreManager
+from src.retrieval.collection_registry import CollectionRegistry
+from .workflow_graph import create_workflow
+from .workflow_nodes import LegalNodes
+
+logger = logging.getLogger("resources")
+
+
+class AppResources:
+    """
+    Process-wide container for the compiled workflow and its shared clients.
+    Built once (normally from the web server lifespan hook) and reused by
+    every request instead of constructing new clients per call.
+    Tenant collections are opened through ``collections`` and share the
+    default manager's Chroma client and embeddings.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nodes: Optional[LegalNodes] = None
+        self._workflow = None
+
+    def startup(self):
+        """Eagerly build shared clients; failures are retried on first use."""
+        try:
+            self._ensure_built()
+        except Exception as e:
+            logger.warning(f"Deferred resource initialisation ({e})")
+
+    def shutdown(self):
+        """Drop the workflow and release the clients' connections and threads."""
+        with self._lock:
+            nodes, self._nodes, self._workflow = self._nodes, None, None
+        if nodes is None:
+            return
+        if nodes.collections is not None:
+            nodes.collections.close()
+        nodes.vector_store.close()
+        if nodes.risk_scorer.cache is not None:
+            nodes.risk_scorer.cache.close()
+
+    def _ensure_built(self) -> LegalNodes:
+        nodes = self._nodes
+        if nodes is not None:
+            return nodes
+        with self._lock:
+            if self._nodes is None:
+                nodes = self._build_nodes()
+                self._workflow = create_workflow(nodes)
+                self._nodes = nodes
+                logger.info("Shared workflow and clients initialised.")
+            return self._nodes
+
+    @staticmethod
+    def _build_nodes() -> LegalNodes:
+        vector_store = VectorStoreManager()
+        return LegalNodes(vector_store=vector_store, collections=CollectionRegistry(vector_store))
+
+    @property
+    def nodes(self) -> LegalNodes:
+        return self._ensure_built()
+
+    @property
+    def workflow(self):
+        self._ensure_built()
+        return self._workflow
+
+    @property
+    def vector_store(self) -> VectorStoreManager:
+        return self._ensure_built().vector_store
+
+    @property
+    def collections(self) -> CollectionRegistry:
+        return self._ensure_built().collections
@@ -1,17 +1,26 @@
+from typing import Optional
+
 from langgraph.graph import StateGraph, END
 from .workflow_nodes import LegalNodes, GraphState
 
 
-def create_workflow():
+def _after_lookup(state: GraphState) -> str:
+    # A cached answer skips retrieval, risk scoring and answer generation
+    return END if state.get("cache_hit") else "retrieve"
+
+
+def create_workflow(nodes: Optional[LegalNodes] = None):
     """Build and compile the LangGraph processing pipeline."""
-    nodes = LegalNodes()
+    nodes = nodes or LegalNodes()
     workflow = StateGraph(GraphState)
 
+    workflow.add_node("lookup_answer", nodes.lookup_answer)
     workflow.add_node("retrieve", nodes.retrieve)
     workflow.add_node("analyze_risk", nodes.analyze_risk)
     workflow.add_node("generate_answer", nodes.generate_answer)
 
-    workflow.set_entry_point("retrieve")
+    workflow.set_entry_point("lookup_answer")
+    workflow.add_conditional_edges("lookup_answer", _after_lookup, ["retrieve", END])
     workflow.add_edge("retrieve", "analyze_risk")
     workflow.add_edge("analyze_risk", "generate_answer")
     workflow.add_edge("generate_answer", END)
@@ -1,67 +1,177 @@
-from typing import List, Dict, Any, TypedDict
+import asyncio
+import logging
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, TypedDict
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langgraph.types import StreamWriter
 
 from src.utils.project_config import Config
+from src.utils.rate_limiter import get_rate_limiter, is_rate_limit_error
+from src.utils.token_counter import count_tokens
+from src.utils.metrics import record_completion_tokens, time_llm_call, time_node
 from src.retrieval.vector_storage import VectorStoreManager
+from src.retrieval.answer_cache import SemanticAnswerCache
+from src.retrieval.collection_registry import CollectionRegistry
+from src.retrieval.lexical_index import clause_references
 from src.risk_engine.risk_scorer import RiskScorer
 
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+logger = logging.getLogger("workflow")
+
+
+class _PartialAnswer(Exception):
+    """Raised when a streamed answer fails after some tokens were emitted."""
+
+    # Tokens already reached the client; the rate limiter must not replay the call
+    retryable = False
+
 
 class GraphState(TypedDict):
     query: str
+    doc_id: Optional[str]
+    # Selects the tenant's collection through LegalNodes.collections
+    tenant: Optional[str]
     documents: list
     risk_analysis: List[Any]
     final_answer: str
     overall_report: Dict[str, Any]
+    # Set by lookup_answer when the answer cache is enabled
+    cache_hit: bool
+    query_embedding: Optional[List[float]]
+    corpus_fingerprint: Optional[str]
 
 
 class LegalNodes:
     """LangGraph workflow nodes."""
 
-    def __init__(self):
-        self.vector_store = VectorStoreManager()
-        self.risk_scorer = RiskScorer()
-        self.reasoning_llm = ChatGoogleGenerativeAI(
-            model=Config.LLM_REASONING_MODEL,
-            google_api_key=Config.GOOGLE_API_KEY,
-            temperature=0
+    def __init__(
+        self,
+        vector_store: Optional[VectorStoreManager] = None,
+        risk_scorer: Optional[RiskScorer] = None,
+        reasoning_llm: Optional["ChatGoogleGenerativeAI"] = None,
+        answer_cache: Optional[SemanticAnswerCache] = None,
+        collections: Optional[CollectionRegistry] = None,
+    ):
+        # Shared clients may be injected so long-lived processes reuse them
+        self.vector_store = vector_store or VectorStoreManager()
+        self.collections = collections
+        self.risk_scorer = risk_scorer or RiskScorer()
+        self.reasoning_llm = reasoning_llm
+        if self.reasoning_llm is None:
+            # Imported here so stubbed runs never load the Gemini SDK
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            self.reasoning_llm = ChatGoogleGenerativeAI(
+                model=Config.LLM_REASONING_MODEL,
+                google_api_key=Config.GOOGLE_API_KEY,
+                temperature=0,
+                max_retries=Config.GEMINI_CLIENT_ATTEMPTS
+            )
+        self.limiter = get_rate_limiter("chat")
+        self.answer_cache = answer_cache
+        if self.answer_cache is None and Config.ANSWER_CACHE_ENABLED:
+            self.answer_cache = SemanticAnswerCache(
+                threshold=Config.ANSWER_CACHE_SIMILARITY,
+                max_per_scope=Config.ANSWER_CACHE_MAX_PER_SCOPE,
+                max_scopes=Config.ANSWER_CACHE_MAX_SCOPES,
+            )
+
+    def _store(self, state: GraphState) -> VectorStoreManager:
+        """The collection a request reads: its tenant's, or the shared one."""
+        tenant = state.get("tenant")
+        if not tenant:
+            return self.vector_store
+        if self.collections is None:
+            raise ValueError("Tenant-scoped requests need LegalNodes(collections=...)")
+        return self.collections.get(tenant)
+
+    # ------------------------------------------------------------------ #
+    # Node 0: Serve a cached answer to an equivalent earlier question
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _answer_scope(state: GraphState) -> tuple:
+        # Clause numbers are part of the scope: "Section 7.2" and "Section 7.3"
+        # questions embed almost identically but must not share answers
+        doc_id = state.get("doc_id")
+        docs = (doc_id,) if isinstance(doc_id, str) else tuple(sorted(doc_id or ()))
+        return state.get("tenant"), docs, tuple(sorted(clause_references(state["query"])))
+
+    async def lookup_answer(self, state: GraphState, writer: StreamWriter) -> dict:
+        with time_node("lookup_answer"):
+            if self.answer_cache is None:
+                return {"cache_hit": False}
+            try:
+                # Opening a tenant's collection for the first time touches Chroma
+                store = await asyncio.to_thread(self._store, state)
+                # Clause references are answered without embedding the query; keep it that way
+                if await asyncio.to_thread(store.answers_exactly, state["query"], state.get("doc_id")):
+                    return {"cache_hit": False}
+                embedding = await store.embeddings.aembed_query(state["query"])
+                fingerprint = await asyncio.to_thread(store.corpus_fingerprint, state.get("doc_id"))
+            except Exception as e:
+                # Retrieval embeds the query again and surfaces real failures
+                logger.warning(f"Answer cache lookup skipped: {e}")
+                return {"cache_hit": False}
+
+            cached = self.answer_cache.lookup(self._answer_scope(state), fingerprint, embedding)
+            if cached is None:
+                return {"cache_hit": False, "query_embedding": embedding, "corpus_fingerprint": fingerprint}
+            writer({"type": "token", "text": cached["final_answer"]})
+            return {**cached, "cache_hit": True}
+
+    def _remember_answer(self, state: GraphState, answer: dict, risks: list):
+        embedding = state.get("query_embedding")
+        if self.answer_cache is None or embedding is None:
+            return
+        self.answer_cache.store(
+            self._answer_scope(state), state["corpus_fingerprint"], embedding,
+            {**answer, "risk_analysis": list(risks)},
         )
 
     # ------------------------------------------------------------------ #
     # Node 1: Retrieve relevant clauses
     # ------------------------------------------------------------------ #
     async def retrieve(self, state: GraphState) -> dict:
-        query = state["query"]
-        results = self.vector_store.search(query, k=5)
-        documents = [doc for doc, _score in results]
-        return {"documents": documents}
+        with time_node("retrieve"):
+            query = state["query"]
+            store = await asyncio.to_thread(self._store, state)
+            results = await store.asearch(
+                query, k=5, doc_id=state.get("doc_id"), embedding=state.get("query_embedding")
+            )
+            documents = [doc for doc, _score in results]
+            return {"documents": documents}
 
     # ------------------------------------------------------------------ #
     # Node 2: Risk analysis on retrieved clauses
     # ------------------------------------------------------------------ #
     async def analyze_risk(self, state: GraphState) -> dict:
-        docs = state.get("documents", [])
-        if not docs:
-            return {"risk_analysis": []}
+        with time_node("analyze_risk"):
+            docs = state.get("documents", [])
+            if not docs:
+                return {"risk_analysis": []}
 
-        clauses = [
-            {"id": d.metadata.get("clause_id", f"clause_{i}"), "text": d.page_content}
-            for i, d in enumerate(docs)
-        ]
+            clauses = [
+                {"id": d.metadata.get("clause_id", f"clause_{i}"), "text": d.page_content}
+                for i, d in enumerate(docs)
+            ]
 
-        try:
-            reports = await self.risk_scorer.analyze_batch(clauses)
-            return {"risk_analysis": reports}
-        except Exception as e:
-            return {
-                "risk_analysis": [],
-                "final_answer": f"Risk analysis failed: {str(e)}"
-            }
+            try:
+                reports = await self.risk_scorer.analyze_batch(clauses)
+                return {"risk_analysis": reports}
+            except Exception as e:
+                return {
+                    "risk_analysis": [],
+                    "final_answer": f"Risk analysis failed: {str(e)}"
+                }
 
     # ------------------------------------------------------------------ #
     # Node 3: Generate plain-English answer
     # ------------------------------------------------------------------ #
-    async def generate_answer(self, state: GraphState) -> dict:
+    async def generate_answer(self, state: GraphState, writer: StreamWriter) -> dict:
+        with time_node("generate_answer"):
+            return await self._generate_answer(state, writer)
+
+    async def _generate_answer(self, state: GraphState, writer: StreamWriter) -> dict:
         # If a previous node already set final_answer due to an error, pass through
         if state.get("final_answer") and not state.get("risk_analysis"):
             return state
@@ -126,12 +236,42 @@ Low Risks: {overall_report['low_risk_count']}
 """
 
         try:
-            response = await self.reasoning_llm.ainvoke(prompt)
-            return {
-                "final_answer": response.content,
+            # Stream so callers using stream_mode="custom" see tokens as they arrive.
+            # Only a failure before the first token is retried by the limiter.
+            parts: List[str] = []
+            prompt_tokens = count_tokens(prompt)
+
+            async def attempt():
+                try:
+                    with time_llm_call("answer", prompt_tokens):
+                        async for chunk in self.reasoning_llm.astream(prompt):
+                            if chunk.text:
+                                parts.append(chunk.text)
+                                writer({"type": "token", "text": chunk.text})
+                except Exception as e:
+                    if parts:
+                        # Tokens already reached the client; replaying would duplicate them
+                        raise _PartialAnswer() from e
+                    raise
+
+            try:
+                await self.limiter.run(attempt, tokens=prompt_tokens)
+                complete = True
+            except _PartialAnswer:
+                parts.append("\n\n(Answer interrupted — please retry.)")
+                complete = False
+            record_completion_tokens("answer", count_tokens("".join(parts)))
+            answer = {
+                "final_answer": "".join(parts),
                 "overall_report": overall_report
             }
+            if complete:
+                self._remember_answer(state, answer, risks)
+            return answer
         except Exception as e:
+            if is_rate_limit_error(e):
+                # Retries are exhausted; let the API layer answer with a real 429
+                raise
             return {
                 "final_answer": (
                     f"Answer generation failed: {str(e)}\n\n"
@@ -0,0 +1,71 @@
+"""
+Fixtures shared by the test modules: a fake API key, a quota error and a
+builder for fully offline LegalNodes (stub chat model, local embeddings,
+no rate limiting).
+"""
+import os
+import sys
+from typing import Optional
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.stubs import StubChatModel, unlimited_rate_limiter
+from src.utils.project_config import Config
+from src.retrieval.answer_cache import SemanticAnswerCache
+from src.retrieval.collection_registry import CollectionRegistry
+from src.retrieval.embedding_backends import HashedNgramEmbeddings
+from src.retrieval.vector_storage import VectorStoreManager
+from src.risk_engine.risk_scorer import RiskScorer
+from src.workflows.workflow_nodes import LegalNodes
+
+__all__ = [
+    "FAKE_KEY", "QuotaError", "StubChatModel", "unlimited_rate_limiter", "offline_config", "build_stub_nodes",
+]
+
+FAKE_KEY = "test-key-" + "x" * 32
+
+
+class QuotaError(Exception):
+    code = 429
+
+
+def offline_config(directory: str, **overrides):
+    """
+    Patch Config for a run without network access: fake API key, local
+    embeddings, and the vector store and tenant registry under ``directory``.
+    Returns the (unstarted) patcher.
+    """
+    settings = dict(
+        GOOGLE_API_KEY=FAKE_KEY,
+        CHROMA_PERSIST_DIRECTORY=directory,
+        EMBEDDING_BACKEND="local",
+        TENANT_REGISTRY_PATH=os.path.join(directory, "tenants.sqlite3"),
+    )
+    settings.update(overrides)
+    return mock.patch.multiple(Config, **settings)
+
+
+def build_stub_nodes(
+    llm: Optional[StubChatModel] = None,
+    answer_llm: Optional[StubChatModel] = None,
+    answer_cache: Optional[SemanticAnswerCache] = None,
+) -> LegalNodes:
+    """
+    LegalNodes over a local store, with ``llm`` scoring risks and
+    ``answer_llm`` (defaulting to ``llm``) writing answers. Call under
+    ``offline_config``.
+    """
+    vs = VectorStoreManager()
+    vs.embeddings = HashedNgramEmbeddings(dimensions=64)
+    vs.vector_store = vs._make_store()
+    llm = llm or StubChatModel(answer_words=5)
+    scorer = RiskScorer()
+    scorer.llm = llm
+    scorer.limiter = unlimited_rate_limiter()
+    nodes = LegalNodes(
+        vector_store=vs, risk_scorer=scorer, reasoning_llm=answer_llm or llm,
+        answer_cache=answer_cache, collections=CollectionRegistry(vs),
+    )
+    nodes.limiter = unlimited_rate_limiter()
+    return nodes
@@ -0,0 +1,179 @@
+import asyncio
+import tempfile
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from langchain_core.documents import Document
+
+from src.retrieval.answer_cache import SemanticAnswerCache
+from src.retrieval.lexical_index import LexicalIndex
+from src.workflows.workflow_graph import create_workflow
+from tests.helpers import QuotaError, StubChatModel, build_stub_nodes, offline_config
+
+
+class CountingChatModel(StubChatModel):
+    prompts: list = []
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.prompts.append(str(messages[-1].content))
+        async for chunk in super()._astream(messages, stop, run_manager, **kwargs):
+            yield chunk
+
+
+class InterruptedChatModel(StubChatModel):
+    """Streams ``fail_after`` words of the answer, then hits a 429."""
+
+    fail_after: int = 2
+    calls: int = 0
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        sent = 0
+        async for chunk in super()._astream(messages, stop, run_manager, **kwargs):
+            if sent == self.fail_after:
+                raise QuotaError("429 RESOURCE_EXHAUSTED")
+            sent += 1
+            yield chunk
+
+
+class TestSemanticAnswerCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = SemanticAnswerCache(threshold=0.9, max_per_scope=2, max_scopes=2)
+
+    def test_nearest_neighbour_above_threshold(self):
+        self.cache.store("nda", "v1", [1.0, 0.0], {"final_answer": "A"})
+        self.cache.store("nda", "v1", [0.0, 1.0], {"final_answer": "B"})
+        self.assertEqual(self.cache.lookup("nda", "v1", [0.2, 0.98])["final_answer"], "B")
+        self.assertIsNone(self.cache.lookup("nda", "v1", [0.7, 0.7]))
+
+    def test_fingerprint_change_invalidates_scope(self):
+        self.cache.store("nda", "v1", [1.0, 0.0], {"final_answer": "A"})
+        self.assertIsNone(self.cache.lookup("nda", "v2", [1.0, 0.0]))
+        self.assertIsNone(self.cache.lookup("nda", "v1", [1.0, 0.0]))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_bounded_entries_and_scopes(self):
+        for i, vec in enumerate(([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0])):
+            self.cache.store("nda", "v1", vec, {"final_answer": str(i)})
+        self.assertIsNone(self.cache.lookup("nda", "v1", [1.0, 0.0, 0.0]))
+        self.assertEqual(len(self.cache), 2)
+
+        self.cache.store("msa", "v1", [1.0, 0.0, 0.0], {"final_answer": "m"})
+        self.cache.store("sla", "v1", [1.0, 0.0, 0.0], {"final_answer": "s"})
+        self.assertIsNone(self.cache.lookup("nda", "v1", [0.0, 0.0, 1.0]))
+        self.assertEqual(self.cache.lookup("sla", "v1", [1.0, 0.0, 0.0])["final_answer"], "s")
+
+
+class TestCorpusFingerprint(unittest.TestCase):
+
+    def test_changes_only_with_the_documents_clause_set(self):
+        index = LexicalIndex()
+        index.add(["nda:a", "msa:b"], ["Term.", "Fees."], [{"doc_id": "nda"}, {"doc_id": "msa"}])
+        nda, everything = index.fingerprint({"nda"}), index.fingerprint()
+
+        index.add(["msa:c"], ["Audit."], [{"doc_id": "msa"}])
+        self.assertEqual(index.fingerprint({"nda"}), nda)
+        self.assertNotEqual(index.fingerprint(), everything)
+
+        index.remove(["nda:a"])
+        self.assertNotEqual(index.fingerprint({"nda"}), nda)
+
+
+class TestWorkflowAnswerCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        config = offline_config(self._tmp.name, RISK_CACHE_ENABLED=False)
+        config.start()
+        self.addCleanup(config.stop)
+        self.llm = CountingChatModel(answer_words=5, prompts=[])
+        nodes = build_stub_nodes(self.llm, answer_cache=SemanticAnswerCache(threshold=0.95))
+        self.vs = nodes.vector_store
+        self.nodes = nodes
+        self.workflow = create_workflow(nodes)
+        self.ingest("The supplier may terminate on thirty days notice.", "Fees are payable monthly.")
+
+    def tearDown(self):
+        self.vs.clear_all()
+        self._tmp.cleanup()
+
+    def ingest(self, *texts, store=None):
+        (store or self.vs).upsert_document("msa", [
+            Document(page_content=t, metadata={"clause_id": f"{i + 1}."}) for i, t in enumerate(texts)
+        ])
+
+    def ask(self, query, tenant=None):
+        return asyncio.run(self.workflow.ainvoke({
+            "query": query, "doc_id": "msa", "tenant": tenant, "documents": [], "risk_analysis": [],
+            "final_answer": "", "overall_report": {},
+        }))
+
+    def test_repeat_question_skips_llm(self):
+        first = self.ask("When can the supplier terminate?")
+        self.assertFalse(first["cache_hit"])
+        self.assertEqual(len(self.llm.prompts), 1)
+
+        second = self.ask("When can the supplier terminate?")
+        self.assertTrue(second["cache_hit"])
+        self.assertEqual(len(self.llm.prompts), 1)
+        self.assertEqual(second["final_answer"], first["final_answer"])
+        self.assertEqual(second["overall_report"], first["overall_report"])
+        self.assertEqual(len(second["risk_analysis"]), len(first["risk_analysis"]))
+
+    def test_reingest_invalidates(self):
+        self.ask("When can the supplier terminate?")
+        self.ingest("The supplier may terminate on ninety days notice.", "Fees are payable monthly.")
+        self.assertFalse(self.ask("When can the supplier terminate?")["cache_hit"])
+        self.assertEqual(len(self.llm.prompts), 2)
+
+    def test_tenants_do_not_share_answers(self):
+        self.ingest("The supplier may terminate on thirty days notice.", "Fees are payable monthly.",
+                    store=self.nodes.collections.get("acme"))
+        self.ask("When can the supplier terminate?")
+        acme = self.ask("When can the supplier terminate?", tenant="acme")
+        self.assertFalse(acme["cache_hit"])
+        self.assertEqual(len(self.llm.prompts), 2)
+        self.assertTrue(self.ask("When can the supplier terminate?", tenant="acme")["cache_hit"])
+
+    def test_query_is_embedded_once_and_clause_references_never(self):
+        # The async path delegates to embed_query, so it counts every query embedding
+        embeddings = self.vs.embeddings
+        with mock.patch.object(embeddings, "embed_query", wraps=embeddings.embed_query) as embed:
+            self.ask("When can the supplier terminate?")
+            self.assertEqual(embed.call_count, 1)
+
+            embed.reset_mock()
+            result = self.ask("What does Section 2 say?")
+            embed.assert_not_called()
+        self.assertEqual([d.page_content for d in result["documents"]], ["Fees are payable monthly."])
+
+    def test_interrupted_answer_is_neither_replayed_nor_cached(self):
+        llm = InterruptedChatModel(answer_words=5, fail_after=2)
+        self.nodes.reasoning_llm = llm
+
+        async def stream():
+            tokens = []
+            async for chunk in self.workflow.astream({
+                "query": "When can the supplier terminate?", "doc_id": "msa", "tenant": None, "documents": [],
+                "risk_analysis": [], "final_answer": "", "overall_report": {},
+            }, stream_mode="custom"):
+                if chunk.get("type") == "token":
+                    tokens.append(chunk["text"])
+            return tokens
+
+        tokens = asyncio.run(stream())
+        self.assertEqual(llm.calls, 1)
+        self.assertEqual(tokens, ["word0 ", "word1 "])
+        self.assertEqual(len(self.nodes.answer_cache), 0)
+        result = self.ask("When can the supplier terminate?")
+        self.assertFalse(result["cache_hit"])
+        self.assertTrue(result["final_answer"].startswith("word0 word1 \n\n(Answer interrupted"))
+
+
+if __name__ == '__main__':
+    unittest.main()
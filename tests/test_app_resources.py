@@ -0,0 +1,76 @@
+import sqlite3
+import tempfile
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+
+from src.utils.project_config import Config
+from src.workflows.app_resources import AppResources
+from tests.helpers import build_stub_nodes, offline_config
+import web_server
+
+
+class TestAppResources(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        config = offline_config(self._tmp.name, RISK_CACHE_PATH=os.path.join(self._tmp.name, "risk.sqlite3"))
+        config.start()
+        self.addCleanup(config.stop)
+        self.built = []
+        build = mock.patch.object(AppResources, "_build_nodes", side_effect=self.build_nodes)
+        build.start()
+        self.addCleanup(build.stop)
+
+    def build_nodes(self):
+        nodes = build_stub_nodes()
+        self.built.append(nodes)
+        return nodes
+
+    def test_startup_builds_once_and_requests_reuse_it(self):
+        with TestClient(web_server.app) as client:
+            resources = web_server.app.state.resources
+            workflow = resources.workflow
+            self.assertEqual(len(self.built), 1)
+
+            for query in ("What is the term?", "Who pays the fees?"):
+                response = client.post("/api/analyze", json={"query": query})
+                self.assertEqual(response.status_code, 200, response.text)
+            self.assertEqual(client.get("/api/documents").status_code, 200)
+            client.get("/api/documents", headers={Config.TENANT_HEADER: "acme"})
+
+            self.assertEqual(len(self.built), 1)
+            self.assertIs(resources.workflow, workflow)
+            self.assertIs(resources.nodes, self.built[0])
+            self.assertIs(resources.collections.get("acme").embeddings, resources.vector_store.embeddings)
+
+    def test_shutdown_releases_clients(self):
+        with TestClient(web_server.app):
+            resources = web_server.app.state.resources
+        nodes = self.built[0]
+        self.assertIsNone(resources._nodes)
+        self.assertIsNone(resources._workflow)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            nodes.collections.tenants()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            len(nodes.risk_scorer.cache)
+        with self.assertRaises(RuntimeError):
+            nodes.vector_store._query_executor.submit(print)
+
+    def test_failed_startup_is_retried_on_first_use(self):
+        resources = AppResources()
+        with mock.patch.object(AppResources, "_build_nodes", side_effect=[RuntimeError("no key"), self.build_nodes()]):
+            resources.startup()
+            self.assertIsNone(resources._nodes)
+            self.assertIs(resources.nodes, self.built[0])
+        resources.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import tempfile
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from langchain_core.documents import Document
+
+from src.utils.project_config import Config
+from src.ingestion.bulk_ingest import BulkIngestor, IngestManifest
+from src.retrieval.embedding_backends import HashedNgramEmbeddings
+from src.retrieval.vector_storage import VectorStoreManager
+from tests.helpers import FAKE_KEY
+
+NDA = "1.1 Confidentiality\nKeep it secret.\n1.2 Term\nTwo years."
+MSA = "1.1 Fees\nPaid monthly.\n2.1 Liability\nCapped at fees paid."
+
+
+class TestBulkIngest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self._tmp.name, "docs")
+        os.makedirs(os.path.join(self.root, "vendors"))
+        self._write("nda.txt", NDA)
+        self._write("vendors/msa.txt", MSA)
+        self._write("notes.md", "ignored")
+        with mock.patch.multiple(
+            Config,
+            GOOGLE_API_KEY=FAKE_KEY,
+            CHROMA_PERSIST_DIRECTORY=os.path.join(self._tmp.name, "chroma"),
+            EMBEDDING_BACKEND="local",
+        ):
+            self.vs = VectorStoreManager()
+        self.vs.embeddings = HashedNgramEmbeddings(dimensions=64)
+        self.vs.vector_store = self.vs._make_store()
+        self.manifest = IngestManifest(os.path.join(self._tmp.name, "manifest.sqlite3"))
+
+    def tearDown(self):
+        self.manifest.close()
+        self._tmp.cleanup()
+
+    def _write(self, relpath: str, text: str):
+        with open(os.path.join(self.root, relpath), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _run(self, **kwargs):
+        return BulkIngestor(self.vs, self.manifest, workers=2, batch_size=3, **kwargs).run(self.root)
+
+    def _stored(self, doc_id: str):
+        data = self.vs.vector_store.get(where={"doc_id": doc_id}, include=["documents"])
+        return sorted(data["documents"])
+
+    def test_ingests_tree_with_relative_doc_ids(self):
+        stats = self._run()
+        self.assertEqual((stats["files"], stats["parsed"], stats["clauses"]), (2, 2, 4))
+        self.assertEqual(self._stored("nda.txt"), ["1.1 Confidentiality\nKeep it secret.", "1.2 Term\nTwo years."])
+        self.assertEqual(len(self._stored("vendors/msa.txt")), 2)
+        self.assertEqual({e["status"] for e in self.manifest.entries().values()}, {"done"})
+
+    def test_second_run_skips_unchanged_files(self):
+        self._run()
+        stats = self._run()
+        self.assertEqual((stats["parsed"], stats["unchanged"], stats["clauses_added"]), (0, 2, 0))
+
+    def test_touched_but_identical_file_is_not_reingested(self):
+        self._run()
+        path = os.path.join(self.root, "nda.txt")
+        os.utime(path, (1, 1))
+        stats = self._run()
+        self.assertEqual((stats["parsed"], stats["unchanged"]), (0, 2))
+        self.assertEqual(self.manifest.entries()[path]["mtime"], 1)
+
+    def test_changed_file_updates_only_its_clauses(self):
+        self._run()
+        self._write("nda.txt", NDA.replace("Two years.", "Three years."))
+        stats = self._run()
+        self.assertEqual((stats["parsed"], stats["clauses_added"], stats["clauses_deleted"]), (1, 1, 1))
+        self.assertIn("1.2 Term\nThree years.", self._stored("nda.txt"))
+
+    def test_failed_files_are_recorded_and_retried_on_request(self):
+        with open(os.path.join(self.root, "broken.pdf"), "wb") as f:
+            f.write(b"not a pdf")
+        stats = self._run()
+        self.assertEqual((stats["parsed"], stats["failed"]), (2, 1))
+        entry = self.manifest.entries()[os.path.join(self.root, "broken.pdf")]
+        self.assertEqual(entry["status"], "failed")
+        self.assertTrue(entry["error"])
+        self.assertEqual(self._run()["failed"], 0)
+        self.assertEqual(self._run(retry_failed=True)["failed"], 1)
+
+
+class TestUpsertDocuments(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        with mock.patch.multiple(
+            Config,
+            GOOGLE_API_KEY=FAKE_KEY,
+            CHROMA_PERSIST_DIRECTORY=self._tmp.name,
+            EMBEDDING_BACKEND="local",
+        ):
+            self.vs = VectorStoreManager()
+        self.vs.embeddings = HashedNgramEmbeddings(dimensions=64)
+        self.vs.vector_store = self.vs._make_store()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_matches_per_document_upserts(self):
+        first = [Document(page_content="1.1 A"), Document(page_content="1.2 B")]
+        stats = self.vs.upsert_documents({"a": first, "b": [Document(page_content="1.1 C")]}, batch_size=2)
+        self.assertEqual(stats["a"], {"total": 2, "added": 2, "deleted": 0, "unchanged": 0})
+        stats = self.vs.upsert_documents({"a": [first[0], Document(page_content="1.2 D")]})
+        self.assertEqual(stats["a"], {"total": 2, "added": 1, "deleted": 1, "unchanged": 1})
+        self.assertEqual(self.vs.upsert_document("b", [Document(page_content="1.1 C")])["unchanged"], 1)
+        # The lexical index follows the store
+        self.assertEqual(len(self.vs._lexical(self.vs.vector_store)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
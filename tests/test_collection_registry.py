@@ -0,0 +1,224 @@
+import tempfile
+import threading
+import time
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from langchain_core.documents import Document
+
+from src.utils.project_config import Config
+from src.ingestion.ingestion_jobs import IngestionJobManager
+from src.retrieval import collection_registry
+from src.utils.rw_lock import ReadWriteLock
+from src.retrieval.collection_registry import CollectionRegistry
+from src.retrieval.embedding_backends import HashedNgramEmbeddings
+from src.retrieval.vector_storage import VectorStoreManager
+from tests.helpers import FAKE_KEY
+
+HOUR = 3600.0
+
+
+class TestReadWriteLock(unittest.TestCase):
+
+    def test_readers_share_and_writer_waits_for_them(self):
+        lock = ReadWriteLock()
+        events = []
+
+        def write():
+            with lock.write():
+                events.append("write")
+
+        with lock.read():
+            with lock.read():
+                writer = threading.Thread(target=write)
+                writer.start()
+                time.sleep(0.05)
+                self.assertEqual(events, [])
+        writer.join(1)
+        self.assertEqual(events, ["write"])
+
+    def test_waiting_writer_blocks_new_readers(self):
+        lock = ReadWriteLock()
+        order = []
+
+        def write():
+            with lock.write():
+                order.append("write")
+
+        def read():
+            with lock.read():
+                order.append("read")
+
+        with lock.read():
+            writer = threading.Thread(target=write)
+            writer.start()
+            time.sleep(0.05)
+            reader = threading.Thread(target=read)
+            reader.start()
+            time.sleep(0.05)
+            self.assertEqual(order, [])
+        writer.join(1)
+        reader.join(1)
+        self.assertEqual(order, ["write", "read"])
+
+    def test_writer_may_reenter_and_read(self):
+        lock = ReadWriteLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            pass
+
+
+class TestCollectionRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        with mock.patch.multiple(
+            Config,
+            GOOGLE_API_KEY=FAKE_KEY,
+            CHROMA_PERSIST_DIRECTORY=self._tmp.name,
+            EMBEDDING_BACKEND="local",
+        ):
+            self.root = VectorStoreManager()
+        self.root.embeddings = HashedNgramEmbeddings(dimensions=64)
+        self.root.vector_store = self.root._make_store()
+        self.registry = self._registry()
+
+    def tearDown(self):
+        self.registry.close()
+        self._tmp.cleanup()
+
+    def _registry(self, **kwargs):
+        return CollectionRegistry(self.root, path=os.path.join(self._tmp.name, "tenants.sqlite3"), **kwargs)
+
+    def _collections(self):
+        return {c.name for c in self.root._chroma_client.list_collections()}
+
+    def test_tenants_are_isolated(self):
+        self.registry.get("acme").upsert_document("nda", [Document(page_content="1.1 Acme term")])
+        self.registry.get("globex").upsert_document("msa", [Document(page_content="1.1 Globex fees")])
+        self.assertEqual(self.registry.get("acme").list_documents(), {"nda": 1})
+        self.assertEqual(self.registry.get("globex").list_documents(), {"msa": 1})
+        self.assertEqual(self.root.list_documents(), {})
+        self.assertIs(self.registry.get(None), self.root)
+
+        # Resetting one tenant leaves the others alone
+        self.registry.get("acme").clear_all()
+        self.assertEqual(self.registry.get("globex").list_documents(), {"msa": 1})
+
+    def test_collection_names_are_valid_and_distinct(self):
+        names = {VectorStoreManager.tenant_collection("legal_clauses", t) for t in ("a/b", "a b", "ä", "--")}
+        self.assertEqual(len(names), 4)
+        for tenant in ("a/b", "ä", "--"):
+            self.registry.get(tenant)
+
+    def test_closed_tenants_keep_their_data(self):
+        registry = self._registry(max_open=1)
+        first = registry.get("acme")
+        first.upsert_document("nda", [Document(page_content="1.1 Term")])
+        registry.get("globex")
+        reopened = registry.get("acme")
+        self.assertIsNot(reopened, first)
+        self.assertEqual(reopened.list_documents(), {"nda": 1})
+        registry.close()
+
+    def test_idle_collections_are_deleted(self):
+        registry = self._registry(idle_ttl=HOUR)
+        registry.get("stale").upsert_document("nda", [Document(page_content="1.1 Term")])
+        registry.get("fresh")
+        stale_name = registry.get("stale").collection_name
+        with registry._lock, registry._conn:
+            registry._conn.execute("UPDATE tenants SET last_used = ? WHERE tenant = 'stale'", (time.time() - 2 * HOUR,))
+
+        self.assertEqual(registry.evict_idle(), ["stale"])
+        self.assertNotIn(stale_name, self._collections())
+        self.assertEqual(registry.tenants(), ["fresh"])
+        # Coming back starts from an empty collection
+        registry._touched.clear()
+        self.assertEqual(registry.get("stale").list_documents(), {})
+        registry.close()
+
+    def test_least_recently_used_collections_beyond_limit_are_deleted(self):
+        registry = self._registry(max_collections=2)
+        now = time.time()
+        for age, tenant in enumerate(["a", "b", "c"]):
+            registry.get(tenant)
+            with registry._lock, registry._conn:
+                registry._conn.execute(
+                    "UPDATE tenants SET last_used = ? WHERE tenant = ?", (now - (age + 1) * HOUR, tenant)
+                )
+        self.assertEqual(registry.evict_idle(now), ["c"])
+        self.assertEqual(registry.tenants(), ["a", "b"])
+        registry.close()
+
+    def test_recently_used_collections_are_kept(self):
+        registry = self._registry(idle_ttl=1, max_collections=1)
+        registry.get("a")
+        registry.get("b")
+        self.assertEqual(registry.evict_idle(), [])
+        registry.close()
+
+    def test_tenant_writes_from_another_worker_are_seen(self):
+        # A second root and registry on the same store stand in for another worker process
+        with mock.patch.multiple(
+            Config,
+            GOOGLE_API_KEY=FAKE_KEY,
+            CHROMA_PERSIST_DIRECTORY=self._tmp.name,
+            EMBEDDING_BACKEND="local",
+        ):
+            other_root = VectorStoreManager()
+        other_root.embeddings = HashedNgramEmbeddings(dimensions=64)
+        other_root.vector_store = other_root._make_store()
+        other = CollectionRegistry(other_root, path=os.path.join(self._tmp.name, "tenants.sqlite3"))
+
+        self.registry.get("acme").upsert_document("nda", [Document(page_content="1.1 Term is one year.")])
+        before = other.get("acme").corpus_fingerprint("nda")
+        self.registry.get("acme").upsert_document("nda", [Document(page_content="1.1 Term is two years.")])
+        self.assertNotEqual(other.get("acme").corpus_fingerprint("nda"), before)
+        self.assertEqual(other.get("acme").search("two years", k=1)[0][0].page_content, "1.1 Term is two years.")
+        # Other tenants' versions are unaffected
+        self.assertEqual(other.get("globex").corpus_fingerprint(), self.registry.get("globex").corpus_fingerprint())
+        other.close()
+
+    def test_running_ingestion_keeps_its_tenant(self):
+        upsert = VectorStoreManager.upsert_document_stream
+
+        def slow_upsert(store, *args, **kwargs):
+            time.sleep(0.5)
+            return upsert(store, *args, **kwargs)
+
+        registry = self._registry(idle_ttl=0.01)
+        jobs = IngestionJobManager(registry.get, max_concurrent=1)
+        with mock.patch.object(collection_registry, "_TOUCH_INTERVAL", 0.05), \
+                mock.patch("src.ingestion.ingestion_jobs._TENANT_KEEPALIVE_SECONDS", 0.01), \
+                mock.patch.object(VectorStoreManager, "upsert_document_stream", slow_upsert):
+            job = jobs.submit(b"1.1 Term\nOne year.", "c.txt", "nda", tenant="acme")
+            deadline = time.time() + 5
+            while jobs.get(job.job_id).stage not in ("done", "failed") and time.time() < deadline:
+                self.assertEqual(registry.evict_idle(), [])
+                time.sleep(0.02)
+        self.assertEqual(jobs.get(job.job_id).stage, "done")
+        self.assertEqual(registry.get("acme").list_documents(), {"nda": 1})
+        jobs.shutdown()
+        registry.close()
+
+    def test_reset_waits_for_running_searches(self):
+        store = self.registry.get("acme")
+        store.upsert_document("nda", [Document(page_content="1.1 Term")])
+        cleared = threading.Event()
+        with store._rw.read():
+            threading.Thread(target=lambda: (store.clear_all(), cleared.set())).start()
+            time.sleep(0.05)
+            self.assertFalse(cleared.is_set())
+        self.assertTrue(cleared.wait(5))
+        self.assertEqual(store.list_documents(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
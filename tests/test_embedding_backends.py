@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.utils.project_config import Config
+from src.retrieval.embedding_backends import HashedNgramEmbeddings, create_embeddings
+from src.retrieval.vector_storage import VectorStoreManager
+
+
+class TestHashedNgramEmbeddings(unittest.TestCase):
+
+    def setUp(self):
+        self.embeddings = HashedNgramEmbeddings(dimensions=64, hash_buckets=2 ** 10)
+
+    def test_deterministic_and_normalised(self):
+        other = HashedNgramEmbeddings(dimensions=64, hash_buckets=2 ** 10)
+        text = "Supplier shall indemnify Customer."
+        vector = self.embeddings.embed_query(text)
+        self.assertEqual(len(vector), 64)
+        self.assertEqual(vector, other.embed_query(text))
+        self.assertAlmostEqual(float(np.linalg.norm(vector)), 1.0, places=5)
+        self.assertEqual(self.embeddings.embed_query(""), [0.0] * 64)
+
+    def test_batch_matches_single(self):
+        texts = ["Fees are fixed.", "Governing law is Delaware.", "Fees are fixed."]
+        batch = np.array(self.embeddings.embed_documents(texts))
+        single = np.array([self.embeddings.embed_query(t) for t in texts])
+        np.testing.assert_allclose(batch, single, atol=1e-6)
+
+    def test_similar_texts_are_closer(self):
+        a, b, c = self.embeddings.embed_documents([
+            "The Supplier shall indemnify the Customer against all losses.",
+            "Supplier must indemnify customer for losses.",
+            "This agreement is governed by the laws of Delaware.",
+        ])
+        self.assertGreater(np.dot(a, b), np.dot(a, c))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_embeddings("nope")
+
+
+class TestLocalBackendStore(unittest.TestCase):
+
+    def test_ingest_and_search_offline(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with mock.patch.multiple(Config, GOOGLE_API_KEY=None, CHROMA_PERSIST_DIRECTORY=tmp,
+                                     EMBEDDING_BACKEND="local", EMBEDDING_CACHE_ENABLED=True):
+                vs = VectorStoreManager()
+            self.assertEqual(vs.collection_name, "legal_clauses_local")
+            self.assertIsNone(vs.embedding_cache)
+            vs.upsert_document("msa", [
+                Document(page_content="Liability is capped at the fees paid.", metadata={"clause_id": "1"}),
+                Document(page_content="Either party may terminate on notice.", metadata={"clause_id": "2"}),
+            ])
+            results = vs.search("termination notice", k=1)
+            self.assertEqual(results[0][0].metadata["clause_id"], "2")
+            vs.clear_all()
+
+
+if __name__ == "__main__":
+    unittest.main()
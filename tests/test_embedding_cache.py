@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from langchain_core.embeddings import Embeddings
+
+from src.retrieval.embedding_cache import EmbeddingCache, CachedEmbeddings
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.embedded: list = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text):
+        self.embedded.append(text)
+        return [float(len(text)), 0.0]
+
+
+class TestEmbeddingCache(unittest.TestCase):
+
+    def setUp(self):
+        self.inner = CountingEmbeddings()
+        self.cache = EmbeddingCache(":memory:", max_entries=3)
+        self.embeddings = CachedEmbeddings(self.inner, self.cache, model_name="test-model")
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_only_misses_are_embedded(self):
+        self.embeddings.embed_documents(["alpha", "beta"])
+        vectors = self.embeddings.embed_documents(["beta", "gamma", "alpha"])
+        self.assertEqual(self.inner.embedded, ["alpha", "beta", "gamma"])
+        self.assertEqual(vectors[0], [4.0, 1.0])
+        self.assertEqual(self.cache.hits, 2)
+        self.assertEqual(self.cache.misses, 3)
+
+    def test_whitespace_is_normalized(self):
+        self.embeddings.embed_documents(["Term  of\nthe agreement"])
+        self.embeddings.embed_documents(["Term of the agreement "])
+        self.assertEqual(len(self.inner.embedded), 1)
+
+    def test_duplicates_within_batch_embedded_once(self):
+        vectors = self.embeddings.embed_documents(["same", "same"])
+        self.assertEqual(self.inner.embedded, ["same"])
+        self.assertEqual(vectors[0], vectors[1])
+
+    def test_query_and_document_keys_are_separate(self):
+        self.embeddings.embed_documents(["clause"])
+        self.embeddings.embed_query("clause")
+        self.assertEqual(len(self.inner.embedded), 2)
+        self.embeddings.embed_query("clause")
+        self.assertEqual(len(self.inner.embedded), 2)
+
+    def test_lru_eviction(self):
+        for text in ["a", "b", "c"]:
+            self.embeddings.embed_documents([text])
+        self.embeddings.embed_documents(["a"])  # refresh "a"
+        self.embeddings.embed_documents(["d"])  # evicts "b"
+        self.assertEqual(len(self.cache), 3)
+        self.inner.embedded.clear()
+        self.embeddings.embed_documents(["a", "b"])
+        self.assertEqual(self.inner.embedded, ["b"])
+
+    def test_async_path_uses_cache(self):
+        asyncio.run(self.embeddings.aembed_documents(["x", "y"]))
+        asyncio.run(self.embeddings.aembed_documents(["x"]))
+        self.assertEqual(self.inner.embedded, ["x", "y"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import threading
+import time
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.project_config import Config
+from src.ingestion.ingestion_jobs import IngestionJobManager, JobQueueFull
+
+
+class FakeVectorStore:
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.docs = {}
+
+    def upsert_document_stream(self, doc_id, documents, on_progress=None):
+        if self.gate:
+            self.gate.wait(5)
+        docs = list(documents)
+        self.docs[doc_id] = docs
+        if on_progress:
+            on_progress(len(docs))
+        return {"total": len(docs), "added": len(docs), "deleted": 0, "unchanged": 0}
+
+    def iter_document(self, doc_id, batch_size=None):
+        docs = self.docs.get(doc_id, [])
+        for start in range(0, len(docs), batch_size):
+            yield docs[start:start + batch_size]
+
+
+class FakeScorer:
+    def __init__(self):
+        self.pages = []
+
+    async def precompute(self, clauses):
+        self.pages.append([c["id"] for c in clauses])
+        return len(clauses)
+
+
+def wait_for(manager, job_id, stages=("done", "failed")):
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job.stage in stages:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+class TestIngestionJobManager(unittest.TestCase):
+
+    def test_job_completes_with_progress(self):
+        store = FakeVectorStore()
+        manager = IngestionJobManager(lambda: store, max_concurrent=1)
+        job = manager.submit(b"1.1 Term\nOne year.\n1.2 Fees\nFixed.", "c.txt", "contract")
+        done = wait_for(manager, job.job_id)
+        self.assertEqual(done.stage, "done")
+        self.assertEqual(done.clauses_processed, 2)
+        self.assertEqual(len(store.docs["contract"]), 2)
+        manager.shutdown()
+
+    def test_tenant_jobs_write_to_the_tenant_store(self):
+        stores = {None: FakeVectorStore(), "acme": FakeVectorStore()}
+        manager = IngestionJobManager(lambda tenant=None: stores[tenant], max_concurrent=1)
+        job = manager.submit(b"1.1 Term\nOne year.", "c.txt", "contract", tenant="acme")
+        self.assertEqual(wait_for(manager, job.job_id).tenant, "acme")
+        self.assertIn("contract", stores["acme"].docs)
+        self.assertEqual(stores[None].docs, {})
+
+    def test_parse_failure_is_reported(self):
+        manager = IngestionJobManager(lambda: FakeVectorStore(), max_concurrent=1)
+        job = manager.submit(b"not a pdf", "broken.pdf", "broken")
+        failed = wait_for(manager, job.job_id)
+        self.assertEqual(failed.stage, "failed")
+        self.assertIn("PDF", failed.error)
+        manager.shutdown()
+
+    def test_unsupported_format_rejected_on_submit(self):
+        manager = IngestionJobManager(lambda: FakeVectorStore())
+        with self.assertRaises(ValueError):
+            manager.submit(b"", "contract.rtf", "x")
+        manager.shutdown()
+
+    def test_queue_cap(self):
+        gate = threading.Event()
+        manager = IngestionJobManager(lambda: FakeVectorStore(gate), max_concurrent=1, max_queued=1)
+        first = manager.submit(b"a", "a.txt", "a")
+        wait_for(manager, first.job_id, stages=("indexing",))
+        manager.submit(b"b", "b.txt", "b")
+        with self.assertRaises(JobQueueFull):
+            manager.submit(b"c", "c.txt", "c")
+        gate.set()
+        manager.shutdown()
+
+
+    def test_risk_precompute_stage(self):
+        store, scorer = FakeVectorStore(), FakeScorer()
+        manager = IngestionJobManager(lambda: store, max_concurrent=1, risk_scorer=lambda: scorer)
+        text = b"1.1 Term\nOne year.\n1.2 Fees\nFixed.\n1.3 Law\nDelaware."
+        with mock.patch.multiple(Config, RISK_PRECOMPUTE_ON_INGEST=True, RISK_PRECOMPUTE_CHUNK=2):
+            job = manager.submit(text, "c.txt", "contract")
+            done = wait_for(manager, job.job_id)
+        self.assertEqual(done.stage, "done")
+        self.assertEqual(done.clauses_scored, 3)
+        self.assertEqual(done.result["risk_scored"], 3)
+        self.assertEqual(scorer.pages, [["1.1", "1.2"], ["1.3"]])
+        manager.shutdown()
+
+    def test_risk_precompute_is_optional(self):
+        scorer = FakeScorer()
+        manager = IngestionJobManager(lambda: FakeVectorStore(), max_concurrent=1, risk_scorer=lambda: scorer)
+        with mock.patch.object(Config, "RISK_PRECOMPUTE_ON_INGEST", False):
+            done = wait_for(manager, manager.submit(b"1.1 Term", "c.txt", "c").job_id)
+        self.assertEqual(done.stage, "done")
+        self.assertNotIn("risk_scored", done.result)
+        self.assertEqual(scorer.pages, [])
+        manager.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
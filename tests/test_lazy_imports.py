@@ -0,0 +1,51 @@
+import json
+import subprocess
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+BUDGET = os.path.join(ROOT, "benchmarks", "startup_budget.json")
+
+LIGHT_PATHS = {
+    "cli_help": "import runpy, sys; sys.argv = ['main.py', '--help']\n"
+                "try: runpy.run_path('main.py', run_name='__main__')\n"
+                "except SystemExit: pass",
+    "splitter": "from src.ingestion import LegalClauseSplitter; LegalClauseSplitter().split_text('1.1 A')",
+    "rule_engine": "from src.risk_engine import RiskRuleEngine; RiskRuleEngine()",
+}
+
+
+def loaded_modules(code: str) -> set:
+    out = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys, json; print(json.dumps(sorted(sys.modules)))"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return set(json.loads(out.splitlines()[-1]))
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_light_paths_skip_heavy_dependencies(self):
+        with open(BUDGET, encoding="utf-8") as f:
+            budgets = json.load(f)
+        for scenario, code in LIGHT_PATHS.items():
+            modules = loaded_modules(code)
+            for forbidden in budgets[scenario]["must_not_import"]:
+                with self.subTest(scenario=scenario, module=forbidden):
+                    self.assertFalse(any(m == forbidden or m.startswith(forbidden + ".") for m in modules))
+
+    def test_package_exports_resolve_on_access(self):
+        import src.retrieval as retrieval
+        from src.retrieval.lexical_index import LexicalIndex
+
+        self.assertIs(retrieval.LexicalIndex, LexicalIndex)
+        self.assertIn("VectorStoreManager", dir(retrieval))
+        with self.assertRaises(AttributeError):
+            retrieval.NotExported
+
+
+if __name__ == '__main__':
+    unittest.main()
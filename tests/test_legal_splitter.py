@@ -0,0 +1,107 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ingestion.legal_splitter import LegalClauseSplitter
+from src.utils.token_counter import count_tokens
+
+CONTRACT = """MASTER AGREEMENT
+ARTICLE I
+1. Definitions
+1.1 Term
+1.1.2 Renewal
+1.2 Fees
+2. Payment
+SECTION 2.1 Invoices
+ARTICLE II
+3.1 Notices"""
+
+
+class TestClauseSpans(unittest.TestCase):
+
+    def setUp(self):
+        self.splitter = LegalClauseSplitter()
+
+    def test_offsets_slice_the_source_text(self):
+        docs = self.splitter.create_documents([CONTRACT])
+        for doc in docs:
+            self.assertEqual(CONTRACT[doc.metadata["start_index"]:doc.metadata["end_index"]], doc.page_content)
+
+    def test_offsets_are_global_across_segments(self):
+        segments = [CONTRACT[i:i + 5] for i in range(0, len(CONTRACT), 5)]
+        whole = self.splitter.create_documents([CONTRACT])
+        streamed = list(self.splitter.iter_documents(segments))
+        self.assertEqual([d.metadata for d in streamed], [d.metadata for d in whole])
+
+    def test_crlf_offsets_refer_to_normalised_text(self):
+        docs = list(self.splitter.iter_documents(["1.1 Term\r\nOne year.\r\n", "1.2 Fees\r\n"]))
+        self.assertEqual(docs[0].page_content, "1.1 Term\nOne year.")
+        self.assertEqual((docs[1].metadata["start_index"], docs[1].metadata["end_index"]), (19, 27))
+
+    def test_hierarchy(self):
+        docs = self.splitter.create_documents([CONTRACT])
+        tree = {d.metadata["clause_id"]: (d.metadata["level"], d.metadata.get("parent_clause_id")) for d in docs}
+        self.assertEqual(tree, {
+            "Intro": (0, None),
+            "ARTICLE I": (0, None),
+            "1. D": (1, "ARTICLE I"),
+            "1.1": (2, "1. D"),
+            "1.1.2": (3, "1.1"),
+            "1.2": (2, "1. D"),
+            "2. P": (1, "ARTICLE I"),
+            "SECTION 2.1": (2, "2. P"),
+            "ARTICLE II": (0, None),
+            "3.1": (1, "ARTICLE II"),
+        })
+
+    def test_sibling_with_longer_number_is_not_a_child(self):
+        docs = self.splitter.create_documents(["1.1 A\n1.12 B\n1.1.1 C"])
+        parents = [d.metadata.get("parent_clause_id") for d in docs]
+        self.assertEqual(parents, [None, None, None])
+
+    def test_heading_never_spans_lines(self):
+        self.assertEqual(self.splitter.split_text("Recitals\nSECTION\n5 apples"), ["Recitals\nSECTION\n5 apples"])
+
+
+class TestOversizedClauses(unittest.TestCase):
+
+    SCHEDULE = "5.1 Schedule\n" + " ".join(
+        f"Item {i}: the supplier shall deliver batch {i} within ten days." for i in range(60)
+    )
+
+    def test_small_clauses_are_untouched(self):
+        docs = LegalClauseSplitter(max_tokens=50).create_documents(["1.1 Term\nOne year.\n1.2 Fees\nFixed."])
+        self.assertEqual([d.metadata["clause_id"] for d in docs], ["1.1", "1.2"])
+        self.assertNotIn("part", docs[0].metadata)
+
+    def test_parts_are_bounded_and_map_back(self):
+        docs = LegalClauseSplitter(max_tokens=60, overlap_tokens=0).create_documents([self.SCHEDULE])
+        self.assertGreater(len(docs), 1)
+        self.assertEqual([d.metadata["clause_id"] for d in docs], [f"5.1#{n}" for n in range(1, len(docs) + 1)])
+        for doc in docs:
+            self.assertLessEqual(count_tokens(doc.page_content), 60)
+            self.assertEqual(self.SCHEDULE[doc.metadata["start_index"]:doc.metadata["end_index"]], doc.page_content)
+            # Cut at sentence ends, never mid-sentence
+            self.assertTrue(doc.page_content.endswith("days."))
+        self.assertEqual(docs[-1].metadata["end_index"], len(self.SCHEDULE))
+
+    def test_overlap_repeats_previous_sentences(self):
+        docs = LegalClauseSplitter(max_tokens=60, overlap_tokens=20).create_documents([self.SCHEDULE])
+        for previous, current in zip(docs, docs[1:]):
+            self.assertLess(current.metadata["start_index"], previous.metadata["end_index"])
+            self.assertGreater(current.metadata["end_index"], previous.metadata["end_index"])
+
+    def test_text_without_spaces_is_still_bounded(self):
+        docs = LegalClauseSplitter(max_tokens=20).create_documents(["x" * 500])
+        self.assertTrue(all(count_tokens(d.page_content) <= 20 for d in docs))
+        self.assertEqual("".join(d.page_content for d in docs), "x" * 500)
+
+    def test_disabled_with_zero(self):
+        docs = LegalClauseSplitter(max_tokens=0).create_documents([self.SCHEDULE])
+        self.assertEqual(len(docs), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
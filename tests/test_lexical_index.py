@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.retrieval.lexical_index import (
+    LexicalIndex, clause_key, clause_references, reciprocal_rank_fusion,
+)
+
+
+class TestClauseReferences(unittest.TestCase):
+
+    def test_heading_keys(self):
+        self.assertEqual(clause_key("SECTION 5.1"), "5.1")
+        self.assertEqual(clause_key("3. T"), "3")
+        self.assertEqual(clause_key("ARTICLE IV"), "article iv")
+        self.assertIsNone(clause_key("Intro"))
+
+    def test_query_references(self):
+        self.assertEqual(clause_references("What does Section 7.2 say?"), ["7.2"])
+        self.assertEqual(clause_references("Compare clause 3 with Article IV and § 3"), ["3", "article iv"])
+        self.assertEqual(clause_references("Which clause covers civil claims?"), [])
+
+
+class TestLexicalIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = LexicalIndex()
+        self.index.add(
+            ["a", "b", "c"],
+            ["Liability is capped at fees.", "Fees are payable monthly. Fees are fixed.", "Governing law is Delaware."],
+            [{"doc_id": "msa", "clause_id": "1.1"}, {"doc_id": "msa", "clause_id": "1.2"},
+             {"doc_id": "nda", "clause_id": "1.1"}],
+        )
+
+    def test_bm25_ranking_and_doc_filter(self):
+        self.assertEqual([rid for rid, _ in self.index.search("fees", k=5)], ["b", "a"])
+        self.assertEqual(self.index.search("delaware", k=5, doc_ids={"msa"}), [])
+
+    def test_lookup_and_remove(self):
+        self.assertEqual(self.index.lookup("1.1"), ["a", "c"])
+        self.assertEqual(self.index.lookup("1.1", {"nda"}), ["c"])
+        self.index.remove(["c"])
+        self.assertEqual(self.index.lookup("1.1"), ["a"])
+        self.assertEqual(self.index.search("delaware", k=5), [])
+
+    def test_re_adding_an_id_replaces_it(self):
+        self.index.add(["a"], ["Termination on notice."], [{"doc_id": "msa", "clause_id": "9"}])
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual([rid for rid, _ in self.index.search("liability", k=5)], [])
+        self.assertEqual(self.index.lookup("9"), ["a"])
+
+    def test_reciprocal_rank_fusion(self):
+        fused = reciprocal_rank_fusion([["x", "y"], ["y", "z"]], k=60)
+        self.assertEqual([rid for rid, _ in fused], ["y", "x", "z"])
+
+
+if __name__ == "__main__":
+    unittest.main()
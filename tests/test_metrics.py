@@ -0,0 +1,73 @@
+import asyncio
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.metrics import MetricsRegistry, collect_timings, time_llm_call, time_node
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_exposition(self):
+        counter = self.registry.counter("test_calls_total", "Calls.", ["kind"])
+        counter.inc(kind="a")
+        counter.inc(2.5, kind='b"q')
+        text = self.registry.render()
+        self.assertIn("# TYPE test_calls_total counter", text)
+        self.assertIn('test_calls_total{kind="a"} 1', text)
+        self.assertIn('test_calls_total{kind="b\\"q"} 2.5', text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram("test_seconds", "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+        lines = self.registry.render().splitlines()
+        self.assertIn('test_seconds_bucket{le="0.1"} 2', lines)
+        self.assertIn('test_seconds_bucket{le="1"} 3', lines)
+        self.assertIn('test_seconds_bucket{le="+Inf"} 4', lines)
+        self.assertIn("test_seconds_count 4", lines)
+        self.assertIn("test_seconds_sum 3.65", lines)
+
+    def test_label_names_are_enforced(self):
+        counter = self.registry.counter("test_labels_total", "Calls.", ["kind"])
+        with self.assertRaises(ValueError):
+            counter.inc(other="x")
+
+    def test_registering_twice_returns_existing(self):
+        first = self.registry.counter("test_once_total", "Calls.")
+        self.assertIs(self.registry.counter("test_once_total", "Calls."), first)
+
+
+class TestRequestTimings(unittest.TestCase):
+
+    def test_breakdown_spans_tasks(self):
+        async def llm_call():
+            with time_llm_call("risk_batch", prompt_tokens=10):
+                await asyncio.sleep(0.01)
+
+        async def request():
+            with collect_timings() as timings:
+                with time_node("analyze_risk"):
+                    await asyncio.gather(llm_call(), llm_call())
+            return timings
+
+        timings = asyncio.run(request())
+        self.assertEqual(timings["nodes"]["analyze_risk"]["count"], 1)
+        self.assertEqual(timings["llm_calls"]["risk_batch"]["count"], 2)
+        self.assertGreaterEqual(timings["total_ms"], 10)
+
+    def test_no_collection_outside_request(self):
+        with time_node("retrieve"):
+            pass
+        with collect_timings() as timings:
+            pass
+        self.assertEqual(timings["nodes"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import io
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.project_config import Config
+from src.ingestion import ingestion_loader
+from src.ingestion.ingestion_loader import DocumentLoader
+
+
+def make_pdf(pages):
+    """Build a minimal text PDF with one Helvetica text block per page."""
+    n = len(pages)
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(n))
+    objs = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {n} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(pages):
+        objs.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        )
+        ops = "BT /F1 12 Tf 14 TL 72 720 Td " + " ".join(f"({line}) Tj T*" for line in text.split("\n")) + " ET"
+        objs.append(f"<< /Length {len(ops)} >>\nstream\n{ops}\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objs):
+        offsets.append(out.tell())
+        out.write(f"{i + 1} 0 obj\n{obj}\nendobj\n".encode())
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode())
+    for off in offsets:
+        out.write(f"{off:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+class TestPdfExtraction(unittest.TestCase):
+
+    PAGES = [f"{i}.1 Clause {i}\nBody of clause {i}." for i in range(1, 41)]
+
+    def test_parallel_matches_serial(self):
+        content = make_pdf(self.PAGES)
+        with mock.patch.object(Config, "PDF_EXTRACT_WORKERS", 1):
+            serial = DocumentLoader.load(content, "big.pdf")
+        with mock.patch.multiple(Config, PDF_EXTRACT_WORKERS=2, PDF_PARALLEL_MIN_PAGES=4, PDF_PAGES_PER_TASK=3):
+            parallel = DocumentLoader.load(content, "big.pdf")
+        self.assertEqual(parallel, serial)
+        self.assertIn("40.1 Clause 40", parallel)
+
+    def test_small_file_stays_serial(self):
+        content = make_pdf(self.PAGES[:2])
+        with mock.patch.multiple(Config, PDF_EXTRACT_WORKERS=2, PDF_PARALLEL_MIN_PAGES=4):
+            with mock.patch.object(DocumentLoader, "_extract_parallel") as parallel:
+                text = DocumentLoader.load(content, "small.pdf")
+        parallel.assert_not_called()
+        self.assertTrue(text.startswith("1.1 Clause 1"))
+
+    def test_crashed_worker_falls_back_to_serial_and_the_pool_is_rebuilt(self):
+        content = make_pdf(self.PAGES)
+        with mock.patch.object(Config, "PDF_EXTRACT_WORKERS", 1):
+            serial = DocumentLoader.load(content, "big.pdf")
+        with mock.patch.multiple(Config, PDF_EXTRACT_WORKERS=2, PDF_PARALLEL_MIN_PAGES=4, PDF_PAGES_PER_TASK=3):
+            broken = ingestion_loader._get_pool()
+            with self.assertRaises(Exception):
+                broken.submit(os._exit, 1).result()
+
+            self.assertEqual(DocumentLoader.load(content, "big.pdf"), serial)
+            self.assertIsNot(ingestion_loader._pool, broken)
+            self.assertEqual(DocumentLoader.load(content, "big.pdf"), serial)
+            self.assertIsNotNone(ingestion_loader._pool)
+            self.assertIsNot(ingestion_loader._pool, broken)
+
+
+if __name__ == "__main__":
+    unittest.main()
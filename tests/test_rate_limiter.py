@@ -0,0 +1,149 @@
+import asyncio
+import time
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.rate_limiter import RateLimiter, _TokenBucket, is_rate_limit_error, retry_after_seconds
+from tests.helpers import QuotaError
+
+
+class WrappedError(Exception):
+    pass
+
+
+def wrapped_quota_error(message):
+    try:
+        raise QuotaError(message)
+    except QuotaError as e:
+        try:
+            raise WrappedError("Error embedding content") from e
+        except WrappedError as wrapped:
+            return wrapped
+
+
+class TestRateLimitErrors(unittest.TestCase):
+
+    def test_detects_wrapped_quota_errors(self):
+        error = wrapped_quota_error("RESOURCE_EXHAUSTED. Please retry in 7s.")
+        self.assertTrue(is_rate_limit_error(error))
+        self.assertFalse(is_rate_limit_error(ValueError("bad request")))
+
+    def test_retry_after_from_message(self):
+        error = QuotaError("429 quota exceeded {'retryDelay': '12s'}")
+        self.assertEqual(retry_after_seconds(error), 12.0)
+        self.assertEqual(retry_after_seconds(QuotaError("Quota exceeded. Please retry in 3.5s.")), 3.5)
+        self.assertIsNone(retry_after_seconds(QuotaError("429")))
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def make_limiter(self, **kwargs):
+        options = dict(requests_per_minute=60_000, max_concurrency=4, max_retries=3,
+                       backoff_base=0.01, backoff_max=0.05)
+        options.update(kwargs)
+        return RateLimiter("test", **options)
+
+    def test_retries_rate_limited_calls(self):
+        limiter = self.make_limiter()
+        calls = []
+
+        async def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise QuotaError("429 Too Many Requests")
+            return "ok"
+
+        self.assertEqual(asyncio.run(limiter.run(flaky)), "ok")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(limiter.rate_limited_count, 2)
+        # Two halvings from 4 → 1; successes only grow the cap back slowly
+        self.assertLess(limiter.concurrency_limit, 4)
+
+    def test_gives_up_after_max_retries(self):
+        limiter = self.make_limiter(max_retries=1)
+
+        async def always_limited():
+            raise QuotaError("429")
+
+        with self.assertRaises(QuotaError):
+            asyncio.run(limiter.run(always_limited))
+        self.assertEqual(limiter.rate_limited_count, 2)
+
+    def test_other_errors_are_not_retried(self):
+        limiter = self.make_limiter()
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise ValueError("bad request")
+
+        with self.assertRaises(ValueError):
+            limiter.run_sync(broken)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(limiter.concurrency_limit, 4)
+
+    def test_errors_marked_not_retryable_are_raised(self):
+        limiter = self.make_limiter()
+        calls = []
+
+        class Interrupted(Exception):
+            retryable = False
+
+        async def streamed_then_limited():
+            calls.append(1)
+            try:
+                raise QuotaError("429")
+            except QuotaError as e:
+                raise Interrupted() from e
+
+        with self.assertRaises(Interrupted):
+            asyncio.run(limiter.run(streamed_then_limited))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(limiter.rate_limited_count, 1)
+
+    def test_concurrency_cap(self):
+        limiter = self.make_limiter(max_concurrency=2)
+        active, peak = [0], [0]
+
+        async def call():
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+
+        async def main():
+            await asyncio.gather(*(limiter.run(call) for _ in range(8)))
+
+        asyncio.run(main())
+        self.assertEqual(peak[0], 2)
+
+    def test_request_bucket_paces_calls(self):
+        # 1200 rpm = 20/s with a 0.1s burst → 2 immediate, the rest spaced 50ms apart
+        limiter = self.make_limiter(requests_per_minute=1200, burst_seconds=0.1)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.run_sync(lambda: None)
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_token_bucket_paces_large_requests(self):
+        limiter = self.make_limiter(tokens_per_minute=60_000, burst_seconds=0.1)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.run_sync(lambda: None, tokens=100)
+        # 100 tokens per call at 1000 tokens/s
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_requests_larger_than_the_burst_are_charged_in_full(self):
+        # 1000 tokens/s with a 100-token burst
+        bucket = _TokenBucket(per_minute=60_000, burst_seconds=0.1)
+        self.assertAlmostEqual(bucket.reserve(1000, bucket.updated), 0.9)
+        self.assertAlmostEqual(bucket.reserve(1000, bucket.updated), 1.9)
+        # Paying the debt off restores the budget for the next caller
+        self.assertAlmostEqual(bucket.reserve(1000, bucket.updated + 1.9), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import json
+import tempfile
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.risk_engine.risk_rules import RiskRuleEngine
+
+
+class TestRiskRuleEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = RiskRuleEngine()
+
+    def test_default_rules_load_from_config_file(self):
+        labels = [label for _kw, _mod, label in self.engine.rules]
+        self.assertIn("unlimited indemnity", labels)
+        self.assertIn("governing law defined", labels)
+
+    def test_all_keywords_required(self):
+        score, triggered = self.engine.evaluate("Supplier shall indemnify Customer without limit.")
+        self.assertEqual((score, triggered), (0, []))
+        score, triggered = self.engine.evaluate("Supplier shall INDEMNIFY Customer for unlimited losses.")
+        self.assertEqual((score, triggered), (7, ["unlimited indemnity"]))
+
+    def test_word_boundaries(self):
+        _score, triggered = self.engine.evaluate("Liability for capital expenditure is excluded.")
+        self.assertNotIn("liability cap present", triggered)
+        _score, triggered = self.engine.evaluate("Total liability is capped at fees paid.")
+        self.assertIn("liability cap present", triggered)
+
+    def test_prefix_and_phrase_keywords(self):
+        _score, triggered = self.engine.evaluate(
+            "This agreement auto-renews annually. The governing\nlaw is Delaware."
+        )
+        self.assertEqual(triggered, ["auto-renewal clause", "governing law defined"])
+        _score, triggered = self.engine.evaluate("The law governing this agreement is Delaware.")
+        self.assertNotIn("governing law defined", triggered)
+
+    def test_triggered_labels_keep_rule_order(self):
+        text = "Governing law: Delaware. Either party may terminate; termination for convenience applies."
+        self.assertEqual(
+            self.engine.evaluate(text)[1],
+            ["termination for convenience", "governing law defined"],
+        )
+
+    def test_evaluate_many(self):
+        texts = ["governing law is Delaware", "nothing relevant", "unlimited indemnify"]
+        self.assertEqual(self.engine.evaluate_many(texts), [self.engine.evaluate(t) for t in texts])
+
+    def test_custom_rules_file(self):
+        rules = {"rules": [{"label": "audit", "keywords": [["audit", "inspect*"]], "score": 1}]}
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(rules, f)
+        try:
+            engine = RiskRuleEngine(rules_path=f.name)
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(engine.evaluate("Customer may inspect records."), (1, ["audit"]))
+        self.assertNotEqual(engine.version, self.engine.version)
+
+    def test_invalid_keyword_rejected(self):
+        with self.assertRaises(ValueError):
+            RiskRuleEngine(rules=[(["a|b"], 1, "bad")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import re
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+
+from src.utils.project_config import Config
+from src.risk_engine.risk_cache import RiskResultCache
+from src.risk_engine.risk_scorer import RiskScorer, _iter_json_array
+from src.utils.rate_limiter import RateLimiter
+from tests.helpers import FAKE_KEY
+
+
+def batch_response(*ids):
+    return json.dumps([
+        {
+            "clause_id": cid,
+            "clause_type": "General",
+            "risk_level": "Low",
+            "risk_score": 3,
+            "reason": f"Reason for {cid}",
+            "recommendation": "None.",
+        }
+        for cid in ids
+    ])
+
+
+class RecordingChatModel(FakeListChatModel):
+    prompts: list = []
+
+    async def ainvoke(self, input, *args, **kwargs):
+        self.prompts.append(str(input))
+        return await super().ainvoke(input, *args, **kwargs)
+
+
+class EchoChatModel:
+    """Answers a batch prompt with one result per 'ID:' line it contains."""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, prompt, *args, **kwargs):
+        self.prompts.append(str(prompt))
+        await asyncio.sleep(0)
+        return AIMessage(content=batch_response(*re.findall(r"^ID: (.+)$", str(prompt), re.M)))
+
+
+def make_scorer(responses):
+    with mock.patch.object(Config, "GOOGLE_API_KEY", FAKE_KEY):
+        scorer = RiskScorer(cache=RiskResultCache(":memory:"))
+    scorer.llm = RecordingChatModel(responses=responses, prompts=[])
+    # Fakes have no quota; keep the free-tier pacing out of the tests
+    scorer.limiter = RateLimiter("test", requests_per_minute=1_000_000, max_concurrency=16)
+    return scorer
+
+
+class TestRiskScorerCache(unittest.TestCase):
+
+    def test_cached_clauses_skip_llm(self):
+        scorer = make_scorer([batch_response("1.1", "1.2"), batch_response("1.3")])
+        first = [{"id": "1.1", "text": "Payment terms."}, {"id": "1.2", "text": "Delivery terms."}]
+        asyncio.run(scorer.analyze_batch(first))
+
+        second = [
+            {"id": "1.3", "text": "Audit rights."},
+            {"id": "1.1", "text": "Payment terms."},
+            {"id": "1.2", "text": "Delivery terms."},
+        ]
+        results = asyncio.run(scorer.analyze_batch(second))
+
+        self.assertEqual([r.clause_id for r in results], ["1.3", "1.1", "1.2"])
+        self.assertEqual(len(scorer.llm.prompts), 2)
+        self.assertNotIn("Payment terms.", scorer.llm.prompts[1])
+        self.assertIn("Audit rights.", scorer.llm.prompts[1])
+
+    def test_fully_cached_batch_makes_no_call(self):
+        scorer = make_scorer([batch_response("2.1")])
+        clauses = [{"id": "2.1", "text": "Governing law is England."}]
+        asyncio.run(scorer.analyze_batch(clauses))
+        results = asyncio.run(scorer.analyze_batch([{"id": "9", "text": "Governing law is England."}]))
+        self.assertEqual(len(scorer.llm.prompts), 1)
+        self.assertEqual(results[0].clause_id, "9")
+
+    def test_precomputed_scores_serve_queries(self):
+        scorer = make_scorer([batch_response("4.1", "4.2")])
+        clauses = [{"id": "4.1", "text": "Term is one year."}, {"id": "4.2", "text": "Fees are fixed."}]
+        self.assertEqual(asyncio.run(scorer.precompute(clauses)), 2)
+        results = asyncio.run(scorer.analyze_batch([{"id": "4.2", "text": "Fees are fixed."}]))
+        self.assertEqual(len(scorer.llm.prompts), 1)
+        self.assertEqual(results[0].clause_id, "4.2")
+
+        scorer.cache = None
+        self.assertEqual(asyncio.run(scorer.precompute(clauses)), 0)
+
+    def test_rule_set_change_invalidates(self):
+        scorer = make_scorer([batch_response("3.1"), batch_response("3.1")])
+        clauses = [{"id": "3.1", "text": "Fees are fixed."}]
+        asyncio.run(scorer.analyze_batch(clauses))
+        scorer.rules.add_rule(["fees"], 1, "fee clause")
+        asyncio.run(scorer.analyze_batch(clauses))
+        self.assertEqual(len(scorer.llm.prompts), 2)
+
+
+class TestRiskScorerPacking(unittest.TestCase):
+
+    def test_batches_respect_token_budget_and_keep_order(self):
+        scorer = make_scorer([])
+        scorer.llm = EchoChatModel()
+        scorer.token_budget = 40
+        clauses = [{"id": str(i), "text": f"Clause {i} " + "word " * 20} for i in range(6)]
+        results = asyncio.run(scorer.analyze_batch(clauses))
+        self.assertEqual([r.clause_id for r in results], [str(i) for i in range(6)])
+        self.assertEqual(len(scorer.llm.prompts), 6)
+
+    def test_small_clauses_share_one_batch(self):
+        scorer = make_scorer([])
+        scorer.llm = EchoChatModel()
+        clauses = [{"id": str(i), "text": f"Short clause {i}."} for i in range(5)]
+        asyncio.run(scorer.analyze_batch(clauses))
+        self.assertEqual(len(scorer.llm.prompts), 1)
+
+    def test_oversized_clause_goes_alone(self):
+        scorer = make_scorer([])
+        scorer.token_budget = 50
+        batches = scorer._pack_batches([
+            {"id": "a", "text": "short"},
+            {"id": "b", "text": "long " * 200},
+            {"id": "c", "text": "short"},
+        ])
+        self.assertEqual([[c["id"] for c in b] for b in batches], [["a"], ["b"], ["c"]])
+
+
+class TestPartialBatchRecovery(unittest.TestCase):
+
+    def item(self, cid):
+        return json.loads(batch_response(cid))[0]
+
+    def test_iter_json_array_skips_bad_items_and_truncation(self):
+        text = ('```json\n[' + json.dumps(self.item("1")) + ', {"clause_id": "2", "reason": "oops"x}, '
+                + json.dumps(self.item("3")) + ', {"clause_id": "4", "reas')
+        self.assertEqual([i["clause_id"] for i in _iter_json_array(text)], ["1", "3"])
+        self.assertEqual(list(_iter_json_array("no json here")), [])
+
+    def test_only_missing_and_invalid_ids_are_re_requested(self):
+        invalid = {"clause_id": "b", "risk_score": "high"}
+        first = "[" + ", ".join([json.dumps(self.item("a")), json.dumps(invalid),
+                                 json.dumps(self.item("c")), '{"clause_id": "d", "cla'])
+        scorer = make_scorer([first, batch_response("b", "d")])
+        clauses = [{"id": cid, "text": f"Clause {cid}."} for cid in "abcd"]
+        results = asyncio.run(scorer.analyze_batch(clauses))
+
+        self.assertEqual([r.clause_id for r in results], ["a", "b", "c", "d"])
+        self.assertEqual(len(scorer.llm.prompts), 2)
+        self.assertIn("ID: b", scorer.llm.prompts[1])
+        self.assertIn("ID: d", scorer.llm.prompts[1])
+        self.assertNotIn("ID: a", scorer.llm.prompts[1])
+        self.assertNotIn("ID: c", scorer.llm.prompts[1])
+
+    def test_individual_fallback_only_after_follow_up_fails(self):
+        scorer = make_scorer([batch_response("a"), "not json", "still not json"])
+        clauses = [{"id": "a", "text": "Clause a."}, {"id": "b", "text": "Clause b."}]
+        results = asyncio.run(scorer.analyze_batch(clauses))
+
+        # batch, follow-up for "b", then one individual call for "b"
+        self.assertEqual(len(scorer.llm.prompts), 3)
+        self.assertEqual([r.clause_id for r in results], ["a", "b"])
+        self.assertIn("Analysis error", results[1].reason)
+
+    def test_repeated_ids_are_matched_in_order(self):
+        scorer = make_scorer([])
+        scorer.llm = EchoChatModel()
+        clauses = [{"id": "1", "text": "First."}, {"id": "1", "text": "Second unlimited indemnify."}]
+        results = asyncio.run(scorer.analyze_batch(clauses))
+        self.assertEqual(len(results), 2)
+        self.assertEqual(len(scorer.llm.prompts), 1)
+        self.assertIn("unlimited indemnity", results[1].reason)
+
+    def test_duplicate_and_unknown_items_add_no_clauses(self):
+        scorer = make_scorer([batch_response("a", "a", "b", "zz")])
+        clauses = [{"id": "a", "text": "Clause a."}, {"id": "b", "text": "Clause b unlimited indemnify."}]
+        results = asyncio.run(scorer.analyze_batch(clauses))
+
+        self.assertEqual(len(scorer.llm.prompts), 1)
+        self.assertEqual([r.clause_id for r in results], ["a", "b"])
+        self.assertIn("unlimited indemnity", results[1].reason)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import asyncio
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.flights = SingleFlight()
+        self.calls = 0
+
+    async def work(self, result="answer", delay=0.05, error=None):
+        self.calls += 1
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return result
+
+    def test_identical_calls_share_one_execution(self):
+        async def scenario():
+            return await asyncio.gather(*(self.flights.do("q", self.work) for _ in range(5)))
+
+        results = asyncio.run(scenario())
+        self.assertEqual(self.calls, 1)
+        self.assertEqual([r for r, _ in results], ["answer"] * 5)
+        self.assertEqual([shared for _, shared in results], [False, True, True, True, True])
+        self.assertEqual(len(self.flights), 0)
+
+    def test_different_keys_and_later_calls_run_separately(self):
+        async def scenario():
+            await asyncio.gather(self.flights.do("a", self.work), self.flights.do("b", self.work))
+            await self.flights.do("a", self.work)
+
+        asyncio.run(scenario())
+        self.assertEqual(self.calls, 3)
+
+    def test_errors_reach_every_caller(self):
+        async def scenario():
+            return await asyncio.gather(
+                *(self.flights.do("q", lambda: self.work(error=ValueError("quota"))) for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(scenario())
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(len(self.flights), 0)
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        async def scenario():
+            leader = asyncio.ensure_future(self.flights.do("q", self.work))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(self.flights.do("q", self.work))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await follower, leader.cancelled()
+
+        (result, shared), leader_cancelled = asyncio.run(scenario())
+        self.assertEqual((result, shared), ("answer", True))
+        self.assertTrue(leader_cancelled)
+        self.assertEqual(self.calls, 1)
+
+    def test_execution_is_cancelled_when_every_caller_leaves(self):
+        finished = []
+
+        async def work():
+            await asyncio.sleep(0.05)
+            finished.append(True)
+
+        async def scenario():
+            callers = [asyncio.ensure_future(self.flights.do("q", work)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            for caller in callers:
+                caller.cancel()
+            await asyncio.sleep(0.1)
+            return len(self.flights)
+
+        self.assertEqual(asyncio.run(scenario()), 0)
+        self.assertEqual(finished, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
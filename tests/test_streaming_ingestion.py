@@ -0,0 +1,89 @@
+import io
+import tempfile
+import unittest
+import sys
+import os
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import docx
+
+from src.ingestion.ingestion_loader import DocumentLoader
+from src.ingestion.legal_splitter import LegalClauseSplitter
+from tests.test_vector_storage import make_manager
+
+SAMPLES_DIR = Path(__file__).parent.parent / "samples"
+
+
+class TestStreamingSplitter(unittest.TestCase):
+
+    def test_matches_split_text_across_segment_boundaries(self):
+        splitter = LegalClauseSplitter()
+        text = (SAMPLES_DIR / "saas_contract.txt").read_text(encoding="utf-8")
+        expected = splitter.split_text(text)
+        for step in (1, 7, 64, 1000):
+            segments = [text[i:i + step] for i in range(0, len(text), step)]
+            self.assertEqual(list(splitter.iter_clauses(segments)), expected)
+
+    def test_crlf_split_between_segments(self):
+        splitter = LegalClauseSplitter()
+        segments = ["1.1 Term\r", "\nOne year.\r\n1.2 Fees\r", "\n"]
+        self.assertEqual(
+            list(splitter.iter_clauses(segments)),
+            splitter.split_text("".join(segments)),
+        )
+
+    def test_iter_documents_metadata(self):
+        splitter = LegalClauseSplitter()
+        docs = list(splitter.iter_documents(["Preamble\n", "1.1 Term\nOne year."], {"source": "a.txt"}))
+        self.assertEqual([d.metadata["clause_id"] for d in docs], ["Intro", "1.1"])
+        self.assertEqual(docs[1].metadata["source"], "a.txt")
+
+
+class TestLoaderIterText(unittest.TestCase):
+
+    def test_docx_segments_concatenate_to_load(self):
+        document = docx.Document()
+        for line in ["1.1 Term", "One year.", "1.2 Fees", "Fixed."]:
+            document.add_paragraph(line)
+        buf = io.BytesIO()
+        document.save(buf)
+        content = buf.getvalue()
+        self.assertEqual(
+            "".join(DocumentLoader.iter_text(content, "a.docx")),
+            DocumentLoader.load(content, "a.docx"),
+        )
+
+    def test_unsupported_format_raises_eagerly(self):
+        with self.assertRaises(ValueError):
+            DocumentLoader.iter_text(b"", "contract.rtf")
+
+
+class TestStreamingUpsert(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.vs = make_manager(self._tmp.name)
+
+    def tearDown(self):
+        self.vs.clear_all()
+        self._tmp.cleanup()
+
+    def test_batches_and_progress(self):
+        splitter = LegalClauseSplitter()
+        text = "\n".join(f"{i}.1 Clause {i}\nBody {i}." for i in range(1, 8))
+        progress = []
+        stats = self.vs.upsert_document_stream(
+            "doc", splitter.iter_documents([text]), batch_size=3, on_progress=progress.append
+        )
+        self.assertEqual(progress, [3, 6, 7])
+        self.assertEqual(stats["added"], 7)
+
+        shorter = "\n".join(f"{i}.1 Clause {i}\nBody {i}." for i in range(1, 5))
+        stats = self.vs.upsert_document_stream("doc", splitter.iter_documents([shorter]), batch_size=3)
+        self.assertEqual((stats["added"], stats["deleted"]), (0, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
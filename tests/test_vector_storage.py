@@ -0,0 +1,201 @@
+import asyncio
+import tempfile
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.ingestion.legal_splitter import LegalClauseSplitter
+from src.utils.project_config import Config
+from src.retrieval.vector_storage import VectorStoreManager
+from tests.helpers import FAKE_KEY
+
+
+class CountingFakeEmbedding(DeterministicFakeEmbedding):
+    embedded: list = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+def make_manager(persist_dir):
+    with mock.patch.multiple(
+        Config,
+        GOOGLE_API_KEY=FAKE_KEY,
+        CHROMA_PERSIST_DIRECTORY=persist_dir,
+        EMBEDDING_CACHE_ENABLED=False,
+    ):
+        vs = VectorStoreManager()
+    vs.embeddings = CountingFakeEmbedding(size=16, embedded=[])
+    vs.vector_store = vs._make_store()
+    return vs
+
+
+def clauses(*texts):
+    return [Document(page_content=t, metadata={"clause_id": str(i)}) for i, t in enumerate(texts)]
+
+
+class TestIncrementalIngestion(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.vs = make_manager(self._tmp.name)
+
+    def tearDown(self):
+        self.vs.clear_all()
+        self._tmp.cleanup()
+
+    def test_reingest_embeds_only_changes(self):
+        first = self.vs.upsert_document("nda", clauses("Term is one year.", "Fees are fixed."))
+        self.assertEqual(first["added"], 2)
+
+        self.vs.embeddings.embedded.clear()
+        second = self.vs.upsert_document("nda", clauses("Term is one year.", "Fees are variable."))
+        self.assertEqual(self.vs.embeddings.embedded, ["Fees are variable."])
+        self.assertEqual((second["added"], second["deleted"], second["unchanged"]), (1, 1, 1))
+        self.assertEqual(self.vs.list_documents(), {"nda": 2})
+
+    def test_documents_are_isolated(self):
+        self.vs.upsert_document("nda", clauses("Confidentiality lasts five years."))
+        self.vs.upsert_document("msa", clauses("Liability is capped at fees paid."))
+        self.assertEqual(self.vs.list_documents(), {"nda": 1, "msa": 1})
+
+        results = self.vs.search("liability", k=5, doc_id="nda")
+        self.assertEqual([d.metadata["doc_id"] for d, _ in results], ["nda"])
+
+        self.assertEqual(self.vs.delete_document("nda"), 1)
+        self.assertEqual(self.vs.list_documents(), {"msa": 1})
+
+    def test_document_counts_come_from_the_lexical_index(self):
+        self.vs.upsert_document("nda", clauses("Term is one year.", "Fees are fixed."))
+        self.assertEqual(self.vs.list_documents(), {"nda": 2})
+        self.vs.upsert_document("msa", clauses("Liability is capped at fees paid."))
+        with mock.patch.object(self.vs.vector_store, "get", wraps=self.vs.vector_store.get) as get:
+            self.assertEqual(self.vs.list_documents(), {"nda": 2, "msa": 1})
+        get.assert_not_called()
+
+    def test_async_search_matches_sync(self):
+        self.vs.upsert_document("nda", clauses("Confidentiality lasts five years.", "Fees are fixed."))
+        expected = self.vs.search("fees", k=2, doc_id="nda")
+        results = asyncio.run(self.vs.asearch("fees", k=2, doc_id="nda"))
+        self.assertEqual(
+            [(d.page_content, round(score, 6)) for d, score in results],
+            [(d.page_content, round(score, 6)) for d, score in expected],
+        )
+
+    def test_clause_reference_skips_embedding(self):
+        docs = [
+            Document(page_content="7.1 Fees are payable monthly.", metadata={"clause_id": "7.1"}),
+            Document(page_content="7.2 Late fees accrue at 2%.", metadata={"clause_id": "7.2"}),
+        ]
+        self.vs.upsert_document("msa", docs)
+        with mock.patch.object(CountingFakeEmbedding, "embed_query") as embed, \
+                mock.patch.object(CountingFakeEmbedding, "aembed_query") as aembed:
+            results = self.vs.search("What does Section 7.2 say?", doc_id="msa")
+            async_results = asyncio.run(self.vs.asearch("What does Section 7.2 say?", doc_id="msa"))
+        embed.assert_not_called()
+        aembed.assert_not_called()
+        self.assertEqual([d.metadata["clause_id"] for d, _ in results], ["7.2"])
+        self.assertEqual([d.metadata["clause_id"] for d, _ in async_results], ["7.2"])
+
+    def test_hybrid_ranks_exact_term_match_first(self):
+        self.vs.upsert_document("nda", clauses(
+            "Confidentiality lasts five years.",
+            "Each party keeps Proprietary Widgets secret.",
+            "Fees are fixed.",
+        ))
+        results = self.vs.search("proprietary widgets", k=1)
+        self.assertEqual(results[0][0].page_content, "Each party keeps Proprietary Widgets secret.")
+
+        # The index follows re-ingestion and deletion
+        self.vs.upsert_document("nda", clauses("Confidentiality lasts five years."))
+        self.assertEqual(self.vs.lexical_index.search("widgets", k=5), [])
+        self.vs.delete_document("nda")
+        self.assertEqual(len(self.vs.lexical_index), 0)
+
+    def test_writes_from_another_manager_are_seen(self):
+        # A second manager on the same store stands in for another process (CLI ingestion, a worker)
+        other = make_manager(self._tmp.name)
+        self.vs.upsert_document("nda", clauses("Term is one year.", "Fees are fixed."))
+        before = other.corpus_fingerprint("nda")
+        self.assertEqual(other.search("fees fixed", k=1)[0][0].page_content, "Fees are fixed.")
+
+        self.vs.upsert_document("nda", clauses("Term is one year.", "Proprietary Widgets stay secret."))
+        self.assertEqual(other.corpus_fingerprint("nda"), self.vs.corpus_fingerprint("nda"))
+        self.assertNotEqual(other.corpus_fingerprint("nda"), before)
+        self.assertEqual(other.search("proprietary widgets", k=1)[0][0].page_content,
+                         "Proprietary Widgets stay secret.")
+        self.assertEqual(other.lexical_index.search("fees", k=5), [])
+
+        self.vs.delete_document("nda")
+        self.assertEqual(other.search("widgets", k=5), [])
+        self.assertEqual(len(other.lexical_index), 0)
+
+    def test_own_writes_do_not_trigger_a_resync(self):
+        self.vs.upsert_document("nda", clauses("Term is one year."))
+        self.vs.search("term", k=1)
+        with mock.patch.object(self.vs, "_sync_lexical", wraps=self.vs._sync_lexical) as sync:
+            for i in range(5):
+                self.vs.upsert_documents({f"doc{i}": clauses(f"Clause {i} of many.")})
+            self.vs.delete_document("doc0")
+            found = {d.metadata["doc_id"] for d, _ in self.vs.search("clause many", k=10)}
+            self.assertEqual(found & {f"doc{i}" for i in range(5)}, {"doc1", "doc2", "doc3", "doc4"})
+            sync.assert_not_called()
+
+            make_manager(self._tmp.name).upsert_document("msa", clauses("Fees are fixed."))
+            self.assertEqual(self.vs.search("fees fixed", k=1)[0][0].page_content, "Fees are fixed.")
+            self.assertEqual(sync.call_count, 1)
+
+    def test_ingestion_alone_does_not_load_the_lexical_index(self):
+        self.vs.upsert_document("nda", clauses("Term is one year."))
+        ingester = make_manager(self._tmp.name)
+        with mock.patch.object(ingester, "_sync_lexical") as sync:
+            ingester.upsert_documents({"msa": clauses("Fees are fixed.")})
+            ingester.upsert_document("sla", clauses("Uptime is 99.9 percent."))
+            ingester.delete_document("sla")
+            sync.assert_not_called()
+        self.assertEqual(len(ingester.lexical_index), 0)
+        # The first search builds the index over everything stored
+        self.assertEqual(self.vs.search("fees fixed", k=1)[0][0].page_content, "Fees are fixed.")
+        self.assertEqual(len(self.vs.lexical_index), 2)
+
+    def test_positions_of_unchanged_clauses_follow_edits(self):
+        splitter = LegalClauseSplitter()
+        before = "1. Term is one year.\n2. Fees are fixed.\n2.1 Invoices are monthly."
+        after = "1. Term is one year, renewable for further years by notice.\n2. Fees are fixed.\n2.1 Invoices are monthly."
+        for name, upsert in (
+            ("stream", lambda docs: self.vs.upsert_document("nda", docs)),
+            ("bulk", lambda docs: self.vs.upsert_documents({"nda": docs})),
+        ):
+            with self.subTest(path=name):
+                self.vs.delete_document("nda")
+                upsert(splitter.create_documents([before]))
+                self.vs.embeddings.embedded.clear()
+                upsert(splitter.create_documents([after]))
+                self.assertEqual(len(self.vs.embeddings.embedded), 1)
+
+                stored = [doc for page in self.vs.iter_document("nda") for doc in page]
+                self.assertEqual(len(stored), 3)
+                for doc in stored:
+                    self.assertEqual(after[doc.metadata["start_index"]:doc.metadata["end_index"]], doc.page_content)
+
+    def test_iter_document_pages(self):
+        self.vs.upsert_document("nda", clauses("A.", "B.", "C."))
+        self.vs.upsert_document("msa", clauses("D."))
+        pages = list(self.vs.iter_document("nda", batch_size=2))
+        self.assertEqual([len(p) for p in pages], [2, 1])
+        self.assertEqual(sorted(d.page_content for p in pages for d in p), ["A.", "B.", "C."])
+
+    def test_duplicate_text_gets_distinct_ids(self):
+        ids = VectorStoreManager.clause_ids("doc", clauses("Same.", "Same."))
+        self.assertEqual(len(set(ids)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
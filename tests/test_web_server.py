@@ -0,0 +1,169 @@
+import json
+import tempfile
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from langchain_core.documents import Document
+
+from src.utils.metrics import REGISTRY
+from src.utils.rate_limiter import RateLimiter
+from src.retrieval.answer_cache import SemanticAnswerCache
+from src.workflows.app_resources import AppResources
+from tests.helpers import QuotaError, StubChatModel, build_stub_nodes, offline_config
+import web_server
+
+
+class QuotaExhaustedChatModel(StubChatModel):
+    """Scores risks normally but hits the quota when streaming the answer."""
+
+    message: str = "429 RESOURCE_EXHAUSTED. Please retry in 7.2s."
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        raise QuotaError(self.message)
+        yield
+
+
+def parse_events(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class WebServerTestCase(unittest.TestCase):
+    """Runs the app through its lifespan hook with stub models and a temporary store."""
+
+    answer_llm = None
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        config = offline_config(self._tmp.name, RISK_CACHE_ENABLED=False)
+        config.start()
+        self.addCleanup(config.stop)
+        build = mock.patch.object(AppResources, "_build_nodes", side_effect=self.build_nodes)
+        build.start()
+        self.addCleanup(build.stop)
+        self.client = TestClient(web_server.app)
+        self.client.__enter__()
+        self.addCleanup(self.client.__exit__, None, None, None)
+
+        self.nodes.vector_store.upsert_document("msa", [
+            Document(page_content=text, metadata={"clause_id": f"{i + 1}."})
+            for i, text in enumerate(["The supplier may terminate on thirty days notice.", "Fees are payable monthly."])
+        ])
+
+    def build_nodes(self):
+        nodes = build_stub_nodes(answer_llm=self.answer_llm, answer_cache=SemanticAnswerCache(threshold=0.95))
+        # No retries, so quota errors reach the client at once
+        nodes.limiter = RateLimiter("test", requests_per_minute=1e9, max_concurrency=64, max_retries=0)
+        self.nodes = nodes
+        return nodes
+
+    def stream(self, query: str = "When can the supplier terminate?") -> list:
+        response = self.client.post("/api/analyze/stream", json={"query": query, "doc_id": "msa"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        return parse_events(response.text)
+
+
+class TestAnalysisStream(WebServerTestCase):
+
+    def test_events_arrive_in_pipeline_order(self):
+        events = self.stream()
+        names = [name for name, _ in events]
+        self.assertEqual(names[0], "retrieved")
+        self.assertEqual(names[-1], "done")
+        tokens = names.index("token")
+        self.assertEqual(set(names[1:tokens]), {"risk"})
+        self.assertEqual(set(names[tokens:-1]), {"token"})
+
+        retrieved, done = events[0][1], events[-1][1]
+        self.assertEqual(sorted(retrieved["clause_ids"]), ["1.", "2."])
+        self.assertEqual(done["num_clauses_analyzed"], tokens - 1)
+        self.assertFalse(done["cached"])
+        self.assertEqual("".join(data["text"] for name, data in events if name == "token"), done["answer"])
+
+    def test_cache_hit_streams_the_stored_answer(self):
+        first = self.stream()
+        events = self.stream()
+        self.assertEqual([name for name, _ in events], ["token", "done"])
+        self.assertEqual(events[0][1]["text"], first[-1][1]["answer"])
+        self.assertTrue(events[1][1]["cached"])
+        self.assertEqual(events[1][1]["answer"], first[-1][1]["answer"])
+
+
+class TestAnalysisStreamQuota(WebServerTestCase):
+
+    answer_llm = QuotaExhaustedChatModel()
+
+    def test_quota_error_ends_the_stream_with_retry_after(self):
+        events = self.stream()
+        self.assertEqual(events[0][0], "retrieved")
+        self.assertNotIn("done", [name for name, _ in events])
+        name, payload = events[-1]
+        self.assertEqual(name, "error")
+        self.assertEqual(payload["status"], "error")
+        self.assertIn("quota", payload["detail"])
+        self.assertEqual(payload["retry_after"], 7.2)
+
+
+class TestAnalysisEndpoint(WebServerTestCase):
+
+    def analyze(self, query: str = "When can the supplier terminate?"):
+        return self.client.post("/api/analyze", json={"query": query, "doc_id": "msa"})
+
+    def test_quota_error_maps_to_429_with_rounded_up_retry_after(self):
+        for message, header, retry_after in (
+            ("429 RESOURCE_EXHAUSTED. Please retry in 7.2s.", "8", 7.2),
+            ("429 quota exceeded {'retryDelay': '3s'}", "3", 3.0),
+            ("429 RESOURCE_EXHAUSTED", None, None),
+        ):
+            with self.subTest(message=message):
+                self.nodes.reasoning_llm = QuotaExhaustedChatModel(message=message)
+                response = self.analyze()
+                self.assertEqual(response.status_code, 429)
+                self.assertEqual(response.headers.get("Retry-After"), header)
+                self.assertEqual(response.json()["status"], "error")
+                self.assertEqual(response.json()["retry_after"], retry_after)
+
+    def test_metrics_expose_every_family_after_an_analysis(self):
+        self.assertEqual(self.analyze().status_code, 200)
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain; version=0.0.4"))
+
+        families = {
+            line.split()[2]: line.split()[3] for line in response.text.splitlines() if line.startswith("# TYPE ")
+        }
+        self.assertEqual(families, {name: metric.kind for name, metric in REGISTRY._metrics.items()})
+        for sample in (
+            'legal_workflow_node_seconds_count{node="retrieve"}',
+            'legal_workflow_node_seconds_count{node="generate_answer"}',
+            'legal_llm_call_seconds_count{call="answer"}',
+            'legal_retrieval_seconds_count{path="hybrid"}',
+        ):
+            self.assertIn(sample, response.text)
+
+
+class TestDocumentEndpoints(WebServerTestCase):
+
+    def test_list_and_delete_documents(self):
+        response = self.client.get("/api/documents")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"documents": [{"doc_id": "msa", "num_clauses": 2}]})
+
+        response = self.client.delete("/api/documents/msa")
+        self.assertEqual(response.json(), {"status": "success", "doc_id": "msa", "num_clauses": 2})
+        self.assertEqual(self.client.get("/api/documents").json(), {"documents": []})
+        self.assertEqual(self.client.delete("/api/documents/msa").status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
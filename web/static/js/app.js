@@ -15,6 +15,7 @@ const UI = {
 };
 
 let selectedFile = null;
+let currentDocId = null;
 
 document.addEventListener('DOMContentLoaded', () => {
     setupEventListeners();
@@ -72,7 +73,7 @@ function handleFileSelection(file) {
 async function handleIngestion() {
     if (!selectedFile) return;
 
-    setLoading(true, 'Ingesting document…');
+    setLoading(true, 'Uploading document…');
 
     const formData = new FormData();
     formData.append('file', selectedFile);
@@ -81,11 +82,18 @@ async function handleIngestion() {
         const response = await fetch('/api/ingest', { method: 'POST', body: formData });
         const data = await safeJson(response);
 
-        if (response.ok && data.status === 'success') {
+        if (!response.ok || data.status !== 'accepted') {
+            showStatus(UI.uploadStatus, 'error', `❌ ${data.detail || data.error || 'Ingestion failed.'}`);
+            return;
+        }
+
+        const job = await pollIngestionJob(data.job_id);
+        if (job.stage === 'done') {
+            currentDocId = job.doc_id;
             showStatus(UI.uploadStatus, 'success',
-                `✅ Done! Processed ${data.num_clauses} clauses from "${data.filename}". Ready to analyze.`);
+                `✅ Done! Processed ${job.clauses_processed} clauses from "${job.filename}". Ready to analyze.`);
         } else {
-            showStatus(UI.uploadStatus, 'error', `❌ ${data.detail || data.error || 'Ingestion failed.'}`);
+            showStatus(UI.uploadStatus, 'error', `❌ ${job.error || 'Ingestion failed.'}`);
         }
     } catch (err) {
         showStatus(UI.uploadStatus, 'error', `❌ Network error: ${err.message}`);
@@ -94,6 +102,24 @@ async function handleIngestion() {
     }
 }
 
+async function pollIngestionJob(jobId) {
+    while (true) {
+        const response = await fetch(`/api/ingest/${jobId}`);
+        const job = await safeJson(response);
+        if (!response.ok) {
+            return { stage: 'failed', error: job.detail || job.error };
+        }
+        if (job.stage === 'done' || job.stage === 'failed') {
+            return job;
+        }
+        const progress = job.stage === 'scoring'
+            ? ` (${job.clauses_scored}/${job.clauses_processed} clauses)`
+            : (job.clauses_processed ? ` (${job.clauses_processed} clauses)` : '');
+        setLoading(true, `Ingesting document: ${job.stage}${progress}…`);
+        await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+}
+
 async function handleAnalysis() {
     const query = UI.queryInput.value.trim();
     if (!query) {
@@ -101,24 +127,42 @@ async function handleAnalysis() {
         return;
     }
 
-    setLoading(true, 'Analyzing document…');
+    setLoading(true, 'Retrieving relevant clauses…');
     UI.resultsSection.style.display = 'none';
     UI.riskSummary.style.display = 'none';
 
     try {
-        const response = await fetch('/api/analyze', {
+        const response = await fetch('/api/analyze/stream', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ query })
+            body: JSON.stringify({ query, doc_id: currentDocId })
         });
-        const data = await safeJson(response);
 
-        if (response.ok) {
-            renderResults(data);
-        } else {
+        if (!response.ok || !response.body) {
+            const data = await safeJson(response);
             UI.resultsContent.textContent = data.detail || data.error || 'Analysis failed.';
             UI.resultsSection.style.display = 'block';
+            return;
         }
+
+        let answer = '';
+        await readEventStream(response, (event, data) => {
+            if (event === 'retrieved') {
+                setLoading(true, `Scoring ${data.clause_ids.length} clauses…`);
+            } else if (event === 'token') {
+                if (!answer) {
+                    setLoading(false);
+                    UI.resultsSection.style.display = 'block';
+                }
+                answer += data.text;
+                UI.resultsContent.innerHTML = formatAnswer(answer);
+            } else if (event === 'done') {
+                renderResults(data);
+            } else if (event === 'error') {
+                UI.resultsContent.textContent = data.detail || 'Analysis failed.';
+                UI.resultsSection.style.display = 'block';
+            }
+        });
     } catch (err) {
         UI.resultsContent.textContent = `Network error: ${err.message}`;
         UI.resultsSection.style.display = 'block';
@@ -128,6 +172,31 @@ async function handleAnalysis() {
     }
 }
 
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const raw = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            let event = 'message';
+            let data = '';
+            for (const line of raw.split('\n')) {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            }
+            if (data) onEvent(event, JSON.parse(data));
+        }
+    }
+}
+
 function renderResults(data) {
     // Risk summary badges
     const report = data.overall_report || {};
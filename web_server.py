@@ -1,31 +1,79 @@
 import sys
 import os
+import json
+import asyncio
 import traceback
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Optional
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
 # Ensure project root is in path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from src.ingestion.ingestion_loader import DocumentLoader
-from src.ingestion.legal_splitter import LegalClauseSplitter
-from src.retrieval.vector_storage import VectorStoreManager
-from src.workflows.workflow_graph import create_workflow
+from src.ingestion.ingestion_jobs import IngestionJobManager, JobQueueFull
+from src.retrieval.collection_registry import CollectionRegistry
+from src.workflows.app_resources import AppResources
 from src.utils.project_config import Config
+from src.utils.rate_limiter import is_rate_limit_error, retry_after_seconds
+from src.utils.metrics import COALESCED_REQUESTS, REGISTRY, collect_timings
+from src.utils.single_flight import SingleFlight
 
-app = FastAPI(title="AI Legal Document Analyzer", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the workflow and shared clients once for the process lifetime."""
+    resources = AppResources()
+    resources.startup()
+    app.state.resources = resources
+    app.state.ingest_jobs = IngestionJobManager(
+        lambda tenant=None: resources.collections.get(tenant),
+        risk_scorer=lambda: resources.nodes.risk_scorer,
+        loop=asyncio.get_running_loop(),
+    )
+    app.state.analyses = SingleFlight()
+    sweeper = None
+    if Config.TENANT_IDLE_TTL_SECONDS or Config.TENANT_MAX_COLLECTIONS:
+        sweeper = asyncio.create_task(_sweep_tenant_collections(resources))
+    try:
+        yield
+    finally:
+        if sweeper is not None:
+            sweeper.cancel()
+        app.state.ingest_jobs.shutdown()
+        resources.shutdown()
+
+
+async def _sweep_tenant_collections(resources: AppResources):
+    """Periodically delete idle tenant collections (see CollectionRegistry.evict_idle)."""
+    while True:
+        await asyncio.sleep(Config.TENANT_SWEEP_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(resources.collections.evict_idle)
+        except Exception as e:
+            print(f"[WARN] Tenant collection sweep failed: {e}")
+
+
+app = FastAPI(title="AI Legal Document Analyzer", version="1.0.0", lifespan=lifespan)
 
 # Serve static assets (CSS, JS)
 app.mount("/static", StaticFiles(directory="web/static"), name="static")
 
 
+# Requests without the header use the shared default collection
+TenantHeader = Header(None, alias=Config.TENANT_HEADER)
+
+
 class QueryRequest(BaseModel):
     query: str
+    doc_id: Optional[str] = None
+    # Adds a per-node / per-LLM-call timing breakdown to /api/analyze responses
+    include_timings: bool = False
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -36,29 +84,35 @@ async def serve_home():
         return f.read()
 
 
-@app.post("/api/ingest")
-async def handle_ingestion(file: UploadFile = File(...)):
-    """Process and ingest a legal document (PDF, DOCX, TXT)."""
+@app.post("/api/ingest", status_code=202)
+async def handle_ingestion(
+    file: UploadFile = File(...),
+    doc_id: Optional[str] = Form(None),
+    tenant: Optional[str] = TenantHeader,
+):
+    """
+    Queue a legal document (PDF, DOCX, TXT) for background ingestion under a
+    stable doc_id. Poll GET /api/ingest/{job_id} for progress.
+    """
     try:
-        Config.validate_api_key()
+        if Config.EMBEDDING_BACKEND == "gemini":
+            Config.validate_api_key()
 
         content = await file.read()
+        doc_id = doc_id or file.filename
         try:
-            text = DocumentLoader.load(content, file.filename)
+            CollectionRegistry.check_tenant(tenant)
+            job = app.state.ingest_jobs.submit(content, file.filename, doc_id, tenant=tenant)
         except ValueError as ve:
             return JSONResponse({"status": "error", "detail": str(ve)}, status_code=400)
-
-        splitter = LegalClauseSplitter()
-        docs = splitter.create_documents([text], metadatas=[{"source": file.filename}])
-
-        vs_manager = VectorStoreManager()
-        ids = vs_manager.add_documents(docs, clear_existing=True)
+        except JobQueueFull as qf:
+            return JSONResponse({"status": "error", "detail": str(qf)}, status_code=429)
 
         return {
-            "status": "success",
-            "num_clauses": len(ids),
+            "status": "accepted",
+            "job_id": job.job_id,
+            "doc_id": doc_id,
             "filename": file.filename,
-            "message": f"Successfully processed {len(ids)} clauses from '{file.filename}'"
         }
 
     except Exception as e:
@@ -66,46 +120,193 @@ async def handle_ingestion(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/ingest/{job_id}")
+async def ingestion_status(job_id: str, tenant: Optional[str] = TenantHeader):
+    """Report stage, clauses processed and errors for an ingestion job."""
+    job = app.state.ingest_jobs.get(job_id)
+    if job is None or job.tenant != (tenant or None):
+        raise HTTPException(status_code=404, detail=f"Unknown ingestion job: {job_id}")
+    return job.model_dump()
+
+
 @app.post("/api/analyze")
-async def handle_analysis(request: QueryRequest):
+async def handle_analysis(request: QueryRequest, tenant: Optional[str] = TenantHeader):
     """Run RAG + risk analysis workflow on the ingested document."""
     try:
-        workflow = create_workflow()
+        CollectionRegistry.check_tenant(tenant)
+    except ValueError as ve:
+        return JSONResponse({"status": "error", "detail": str(ve)}, status_code=400)
+    try:
+        workflow = app.state.resources.workflow
         state = {
             "query": request.query,
+            "doc_id": request.doc_id,
+            "tenant": tenant,
             "documents": [],
             "risk_analysis": [],
             "final_answer": "",
             "overall_report": {}
         }
 
-        result = await workflow.ainvoke(state)
+        coalesced = False
+        with collect_timings() as timings:
+            # A timing breakdown has to come from the caller's own execution
+            if Config.REQUEST_COALESCING_ENABLED and not request.include_timings:
+                result, coalesced = await _coalesced_invoke(workflow, state)
+            else:
+                result = await workflow.ainvoke(state)
 
-        return {
+        response = {
             "status": "success",
             "answer": result.get("final_answer", "No answer generated."),
             "overall_report": result.get("overall_report", {}),
-            "num_clauses_analyzed": len(result.get("risk_analysis", []))
+            "num_clauses_analyzed": len(result.get("risk_analysis", [])),
+            "cached": bool(result.get("cache_hit")),
+            "coalesced": coalesced,
         }
+        if request.include_timings:
+            response["timings"] = timings
+        return response
 
     except Exception as e:
         traceback.print_exc()
         error_msg = str(e)
 
-        # Handle quota errors gracefully
-        if "429" in error_msg or "quota" in error_msg.lower():
-            return JSONResponse({
+        if is_rate_limit_error(e):
+            return _rate_limited_response(e)
+
+        return JSONResponse({"status": "error", "detail": error_msg}, status_code=500)
+
+
+def _analysis_key(state: dict) -> tuple:
+    """Requests with equal keys would produce the same answer from the same clauses."""
+    store = app.state.resources.collections.get(state["tenant"])
+    query = " ".join(state["query"].casefold().split())
+    return state["tenant"], state["doc_id"], query, store.corpus_fingerprint(state["doc_id"])
+
+
+async def _coalesced_invoke(workflow, state: dict):
+    """``workflow.ainvoke`` shared with identical requests already in flight; returns (result, coalesced)."""
+    key = await asyncio.to_thread(_analysis_key, state)
+    result, coalesced = await app.state.analyses.do(key, lambda: workflow.ainvoke(state))
+    if coalesced:
+        COALESCED_REQUESTS.inc(endpoint="analyze")
+    return result, coalesced
+
+
+def _rate_limited_response(error: Exception) -> JSONResponse:
+    """429 with the upstream Retry-After so clients can back off instead of seeing a fake answer."""
+    retry_after = retry_after_seconds(error)
+    headers = {"Retry-After": str(int(retry_after + 0.999))} if retry_after is not None else None
+    return JSONResponse(
+        {
+            "status": "error",
+            "detail": "Gemini API quota exceeded. Please wait and try again.",
+            "retry_after": retry_after,
+        },
+        status_code=429,
+        headers=headers,
+    )
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@app.post("/api/analyze/stream")
+async def handle_analysis_stream(request: QueryRequest, tenant: Optional[str] = TenantHeader):
+    """
+    Server-sent events version of /api/analyze. Emits ``retrieved`` once
+    clauses are found, one ``risk`` event per scored clause, ``token``
+    events while the answer is generated, then ``done`` with the full result.
+    """
+    try:
+        CollectionRegistry.check_tenant(tenant)
+    except ValueError as ve:
+        return JSONResponse({"status": "error", "detail": str(ve)}, status_code=400)
+    workflow = app.state.resources.workflow
+    state = {
+        "query": request.query,
+        "doc_id": request.doc_id,
+        "tenant": tenant,
+        "documents": [],
+        "risk_analysis": [],
+        "final_answer": "",
+        "overall_report": {}
+    }
+
+    async def events():
+        result = dict(state)
+        try:
+            async for mode, chunk in workflow.astream(state, stream_mode=["updates", "custom"]):
+                if mode == "custom":
+                    if chunk.get("type") == "token":
+                        yield _sse("token", {"text": chunk["text"]})
+                    continue
+
+                for node, update in chunk.items():
+                    update = update or {}
+                    result.update(update)
+                    if node == "retrieve":
+                        yield _sse("retrieved", {
+                            "clause_ids": [d.metadata.get("clause_id") for d in update.get("documents", [])]
+                        })
+                    elif node == "analyze_risk":
+                        for rc in update.get("risk_analysis", []):
+                            yield _sse("risk", rc.model_dump() if hasattr(rc, "model_dump") else rc)
+
+            yield _sse("done", {
                 "status": "success",
-                "answer": (
-                    "⚠️ **API Quota Exceeded**\n\n"
-                    "The free-tier Google Gemini API limit has been reached (typically 20 requests/day or 15 RPM).\n"
-                    "Please wait a few minutes or until the next day and try again.\n\n"
-                    "To increase limits, upgrade to a paid Google AI Studio plan."
-                ),
-                "num_clauses_analyzed": 0
+                "answer": result.get("final_answer") or "No answer generated.",
+                "overall_report": result.get("overall_report", {}),
+                "num_clauses_analyzed": len(result.get("risk_analysis", [])),
+                "cached": bool(result.get("cache_hit")),
             })
+        except Exception as e:
+            traceback.print_exc()
+            if is_rate_limit_error(e):
+                yield _sse("error", {
+                    "status": "error",
+                    "detail": "Gemini API quota exceeded. Please wait and try again.",
+                    "retry_after": retry_after_seconds(e),
+                })
+            else:
+                yield _sse("error", {"status": "error", "detail": str(e)})
 
-        return JSONResponse({"status": "error", "detail": error_msg}, status_code=500)
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _tenant_store(tenant: Optional[str]):
+    try:
+        return app.state.resources.collections.get(tenant)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+
+@app.get("/api/documents")
+def list_documents(tenant: Optional[str] = TenantHeader):
+    """List ingested documents and their clause counts."""
+    counts = _tenant_store(tenant).list_documents()
+    return {"documents": [{"doc_id": d, "num_clauses": n} for d, n in sorted(counts.items())]}
+
+
+@app.delete("/api/documents/{doc_id}")
+def delete_document(doc_id: str, tenant: Optional[str] = TenantHeader):
+    """Remove a document and all of its clauses."""
+    removed = _tenant_store(tenant).delete_document(doc_id)
+    if not removed:
+        raise HTTPException(status_code=404, detail=f"Unknown document: {doc_id}")
+    return {"status": "success", "doc_id": doc_id, "num_clauses": removed}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/api/health")